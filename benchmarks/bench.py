@@ -0,0 +1,334 @@
+"""
+Benchmark of the sortflow library. Runs every Sort subclass on several input sizes and shapes
+and measures these stages:
+- trace - running the algorithm and recording its trace (Sort.trace)
+- frames - rebuilding frame dicts from the trace (what the animation consumes)
+- artists - building the artists of the frames with the "artist" engine
+- export - rendering frames to PNG files (Sort.export)
+
+The time of `import sortflow` (which must not import matplotlib) and of importing the animation module
+after it are measured too, in fresh interpreters.
+
+For every stage the wall time, peak memory (tracemalloc), frame count and artist count are recorded.
+Results are saved as JSON and can be compared with a stored baseline.
+
+Usage (from the repository root):
+    python -m benchmarks.bench --output results.json
+    python -m benchmarks.bench --output new.json --baseline results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import List, Dict, Tuple, Callable
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import sortflow
+from sortflow.sort import Sort
+from sortflow.export import export_trace
+
+
+SHAPES = ["random", "sorted", "reversed", "few-unique", "sawtooth"]
+SIZES = [10, 100, 1000, 10000, 100000]
+STAGES = ["trace", "frames", "artists", "export"]
+
+
+def make_data(shape: str, n: int, seed: int = 0) -> List[float]:
+    """
+    Creates input data of the given shape.
+
+    Params:
+        shape - one of SHAPES
+        n - number of elements
+        seed - seed of the random generator
+
+    Returns:
+        List[float] - the data
+    """
+    rng = random.Random(seed)
+
+    if shape == "random":
+        return [rng.random() for _ in range(n)]
+    elif shape == "sorted":
+        return [float(i) for i in range(n)]
+    elif shape == "reversed":
+        return [float(n - i) for i in range(n)]
+    elif shape == "few-unique":
+        return [float(rng.randint(0, 4)) for _ in range(n)]
+    elif shape == "sawtooth":
+        tooth = max(2, n // 10)
+        return [float(i % tooth) for i in range(n)]
+    else:
+        raise ValueError("Unknown shape '{}'".format(shape))
+
+
+def sort_classes() -> List[type]:
+    """
+    Returns all non-abstract subclasses of Sort exported by sortflow.
+    """
+    classes = []
+    stack = list(Sort.__subclasses__())
+
+    while stack:
+        cls = stack.pop(0)
+        if cls.__module__.startswith("sortflow") and not getattr(cls, "__abstractmethods__", None):
+            classes.append(cls)
+        stack.extend(cls.__subclasses__())
+
+    return classes
+
+
+def estimate_frames(cls: type, shape: str, n: int) -> float:
+    """
+    Estimates the number of frames of the algorithm on n elements by extrapolating
+    the frame counts of two small runs.
+    """
+    if n <= 256:
+        return cls(make_data(shape, n)).run_stats()["frames"]
+
+    small = cls(make_data(shape, 128)).run_stats()["frames"]
+    large = cls(make_data(shape, 256)).run_stats()["frames"]
+    exponent = max(1.0, math.log2(max(large, 1) / max(small, 1)))
+
+    return large * (n / 256) ** exponent
+
+
+def measure(func: Callable[[], any], memory: bool) -> Tuple[any, float, int | None]:
+    """
+    Runs the function and measures its wall time. If memory is True, the function is run once more
+    with tracemalloc to measure its peak memory (tracing slows it down, so the time is taken from the first run).
+
+    Returns:
+        Tuple - the result of the function, the time in seconds and the peak memory in bytes (or None)
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+IMPORT_SCRIPT = """
+import sys, time
+start = time.perf_counter()
+import sortflow
+middle = time.perf_counter()
+lazy = "matplotlib" not in sys.modules
+import sortflow.animation
+print(middle - start, time.perf_counter() - middle, lazy)
+"""
+
+
+def bench_import(repeat: int = 5) -> Tuple[List[Dict[str, any]], bool]:
+    """
+    Measures the import time of sortflow and of its animation module (with matplotlib), each in a fresh
+    interpreter, and checks that `import sortflow` doesn't import matplotlib.
+
+    Returns:
+        Tuple - the results (the best of the runs) and whether matplotlib was left out of `import sortflow`
+    """
+    times = []
+    lazy = True
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=root, capture_output=True, text=True, check=True)
+        package, animation, loaded = output.stdout.split()
+        times.append((float(package), float(animation)))
+        lazy = lazy and loaded == "True"
+
+    base = {"algorithm": "sortflow", "shape": "-", "size": 0}
+    results = [{**base, "stage": "import", "time": min(t[0] for t in times)},
+               {**base, "stage": "import-animation", "time": min(t[1] for t in times)}]
+
+    return results, lazy
+
+
+def bench_case(cls: type, shape: str, n: int, args: argparse.Namespace) -> List[Dict[str, any]]:
+    """
+    Runs all stages for one algorithm, input shape and size.
+
+    Returns:
+        List[dict] - one result per stage
+    """
+    base = {"algorithm": cls.__name__, "shape": shape, "size": n}
+    results = []
+
+    def add(stage: str, **values) -> None:
+        results.append({**base, "stage": stage, **values})
+
+    estimate = estimate_frames(cls, shape, n)
+    if estimate > args.max_frames:
+        for stage in STAGES:
+            add(stage, skipped="estimated {:.0f} frames".format(estimate))
+        return results
+
+    sort = cls(make_data(shape, n))
+    sort.set_cache(None)
+
+    # trace
+    trace, elapsed, peak = measure(sort.trace, args.memory)
+    add("trace", time=elapsed, peak_memory=peak, frames=len(trace), ops=trace.ops(), trace_bytes=trace.nbytes())
+
+    # frames - přehraje se celá trace, slovníky se vytvoří pro vybrané snímky
+    sample = trace.decimate(args.frames) if len(trace) > args.frames else trace
+    indexes = range(len(sample))
+
+    def rebuild() -> int:
+        return sum(len(frame["data"]) for frame in sample.select(indexes))
+
+    _, elapsed, peak = measure(rebuild, args.memory)
+    add("frames", time=elapsed, peak_memory=peak, frames=len(sample))
+
+    if n > args.max_render_n:
+        add("artists", skipped="n > {}".format(args.max_render_n))
+        add("export", skipped="n > {}".format(args.max_render_n))
+        return results
+
+    # artists
+    animation = sortflow.Animation()
+    animation._compile_colors()
+    render = trace.decimate(args.render_frames) if len(trace) > args.render_frames else trace
+
+    def build() -> int:
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        fig_axes, bar_axes = animation._setup_figure(fig, sort.get_title(), n)
+        max_k = render.max_k()
+        return sum(len(animation._create_anim_frame(fig_axes, bar_axes, frame, max_k)) for frame in render)
+
+    artists, elapsed, peak = measure(build, args.memory)
+    add("artists", time=elapsed, peak_memory=peak, frames=len(render), artists=artists)
+
+    # export
+    export = trace.decimate(args.export_frames) if len(trace) > args.export_frames else trace
+
+    def save() -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            export_trace(export, directory, animation, sort.get_title(), 1)
+
+    _, elapsed, peak = measure(save, args.memory)
+    add("export", time=elapsed, peak_memory=peak, frames=len(export))
+
+    return results
+
+
+def compare(results: List[Dict[str, any]], baseline: List[Dict[str, any]], threshold: float,
+            min_time: float) -> List[str]:
+    """
+    Compares results with a baseline.
+
+    Params:
+        results - the new results
+        baseline - the baseline results
+        threshold - maximum allowed ratio of the new and the baseline time (and memory)
+        min_time - times shorter than this (in seconds) are not compared
+
+    Returns:
+        List[str] - descriptions of the regressions
+    """
+    def key(result: Dict[str, any]) -> Tuple:
+        return (result["algorithm"], result["shape"], result["size"], result["stage"])
+
+    old = {key(result): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        before = old.get(key(result))
+        if before is None or "time" not in result or "time" not in before:
+            continue
+
+        if result["time"] >= min_time and result["time"] > threshold * before["time"]:
+            regressions.append("{} {} n={} {}: time {:.4f}s -> {:.4f}s".format(*key(result), before["time"], result["time"]))
+
+        if result.get("peak_memory") and before.get("peak_memory") and result["peak_memory"] > threshold * before["peak_memory"]:
+            regressions.append("{} {} n={} {}: memory {} B -> {} B".format(*key(result), before["peak_memory"], result["peak_memory"]))
+
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark of the sortflow library.")
+    parser.add_argument("--algorithms", nargs="+", help="names of the Sort subclasses (default all)")
+    parser.add_argument("--shapes", nargs="+", default=SHAPES, choices=SHAPES, help="input shapes")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES, help="input sizes")
+    parser.add_argument("--max-frames", type=float, default=2e6, help="skip cases with more (estimated) frames")
+    parser.add_argument("--frames", type=int, default=1000, help="frames rebuilt in the frames stage")
+    parser.add_argument("--render-frames", type=int, default=10, help="frames built in the artists stage")
+    parser.add_argument("--export-frames", type=int, default=10, help="frames rendered in the export stage")
+    parser.add_argument("--max-render-n", type=int, default=1000, help="skip rendering stages for larger inputs")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="don't measure peak memory")
+    parser.add_argument("--output", default="bench_results.json", help="output JSON file")
+    parser.add_argument("--baseline", help="baseline JSON file to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown ratio against the baseline")
+    parser.add_argument("--min-time", type=float, default=0.005, help="shorter times are not compared")
+    args = parser.parse_args(argv)
+
+    classes = sort_classes()
+    if args.algorithms:
+        classes = [cls for cls in classes if cls.__name__ in args.algorithms]
+
+    results, lazy = bench_import()
+    for result in results:
+        print("{algorithm:>12} {stage:>27} {time:9.4f}s".format(**result))
+
+    for cls in classes:
+        for shape in args.shapes:
+            for n in args.sizes:
+                for result in bench_case(cls, shape, n, args):
+                    results.append(result)
+                    if "time" in result:
+                        print("{algorithm:>12} {shape:>10} n={size:<7} {stage:<8} {time:9.4f}s".format(**result))
+
+    output = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "matplotlib": matplotlib.__version__
+        },
+        "results": results
+    }
+
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+        regressions = compare(results, baseline, args.threshold, args.min_time)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        if regressions:
+            return 1
+
+    if not lazy:
+        print("REGRESSION import sortflow imports matplotlib")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,10 +6,39 @@ Modules:
 - sort - contains the class Sort. To create your own sorting algorithm, make a class with Sort as its parent class.
 - sort_algs - contains a few sorting algorithms.
 - animation - contains the Animation class which is used to create the vizualization animation.
+- stats - contains the StatsRecorder class which counts the operations of a sorting algorithm.
+- records - contains the functions computing the keys of records sorted by key columns and the IndexRecorder class.
+- export - contains the function used to render the animation to files, in several processes.
+- racing - contains the race function, which animates several sorting algorithms side by side in one figure.
+- player - contains the function exporting the animation as an HTML page with a JavaScript player of the trace.
+- cache - contains the TraceCache class, a cache of traces addressed by the algorithm, data and order.
+- live - contains the LiveView class, which shows a sorting algorithm while it's running.
+- batch - contains the trace_many function, which runs many sorting algorithms in a pool of processes.
+- cli - contains the command line interface, which renders animations to files (run by `python -m sortflow`).
+- profiling - contains the Profiler class, which measures the time and memory of the stages of creating an animation.
+- trace - contains the Trace class, a compact record of a sorting algorithm's run, and the recorders creating it.
+
+Matplotlib is imported only when the Animation class or the race function is first used (e.g. by Sort.animate),
+so the algorithms, traces and stats can be used without it.
 """
 
 from .sort import Sort
-from .sort_algs import BubbleSort, InsertSort, SelectSort, QuickSort, MergeSort
-from .animation import Animation
+from .sort_algs import BubbleSort, InsertSort, SelectSort, QuickSort, MergeSort, HeapSort, ShellSort, IntroSort, TimSort, RadixSort, ExternalMergeSort
+from .trace import Trace
+from .cache import TraceCache
+from .batch import trace_many, JobResult
+from .profiling import Profiler
+
+__all__: list[str] = ["Sort", "Animation", "race", "Trace", "TraceCache", "trace_many", "JobResult", "Profiler", "BubbleSort", "InsertSort", "SelectSort", "QuickSort", "MergeSort", "HeapSort",
+                       "ShellSort", "IntroSort", "TimSort", "RadixSort", "ExternalMergeSort"]
+
 
-__all__: list[str] = ["Sort", "Animation", "BubbleSort", "InsertSort", "SelectSort", "QuickSort", "MergeSort"]
\ No newline at end of file
+def __getattr__(name: str) -> any:
+    # Animation a race se načtou (i s matplotlibem) až při prvním použití
+    if name == "Animation":
+        from .animation import Animation
+        return Animation
+    elif name == "race":
+        from .racing import race
+        return race
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
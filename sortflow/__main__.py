@@ -0,0 +1,10 @@
+"""
+Runs the command line interface of the library, see the cli module.
+"""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
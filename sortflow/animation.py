@@ -2,27 +2,43 @@
 Module containing the Animation class.
 """
 
+import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.animation import ArtistAnimation
+from matplotlib.animation import ArtistAnimation, FuncAnimation
 from matplotlib.artist import Artist
 from matplotlib.lines import Line2D
 from matplotlib.text import Text
 from matplotlib.axes import Axes
 from matplotlib.patches import Rectangle
-from typing import List, Tuple, Dict
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.container import BarContainer
+from matplotlib.collections import PolyCollection
+from typing import List, Tuple, Dict, Literal, Callable, Iterator
+from .trace import Trace, IndexIntervals, INFO_KEYS
+from . import profiling
+
+
+# stavy sloupců, indexy do zkompilovaných polí barev
+UNSORTED = 0
+COMPARE = 1
+SORTED = 2
 
 
 class Animation():
     """
-    A class used to create the matplotlib's ArtistAnimation object.
+    A class used to create the matplotlib's ArtistAnimation (or FuncAnimation) object.
     This class creates a visualization of a sorting algorithm from the visualization data, as a bar graph.
+    When there are more data than pixel columns in the graph, the bars are replaced by their envelope,
+    one polygon per pixel column spanning the smallest and the largest value of the column.
 
     Attributes:
         style - a dict setting the style of the animation (bar fill and edge colors etc.)
 
     Methods:
         set_style - sets the style
-        create_anim - creates the animation as ArtistAnimation from matplotlib
+        create_anim - creates the animation as ArtistAnimation or FuncAnimation from matplotlib
+        frame_budget - computes the maximum number of frames from the frame and time limits
     """
 
 
@@ -141,48 +157,183 @@ class Animation():
                     target[keys[-1]] = val
 
 
-    def create_anim(self, frames: List[dict], title: str, speed: int|float = 0.5, repeat: bool = True, 
-                    figsize: Tuple[float, float] | None = None) -> ArtistAnimation:
+    def create_anim(self, frames: List[dict] | Trace | Callable[[], Iterator[dict]], title: str, speed: int|float = 0.5, 
+                    repeat: bool = True, figsize: Tuple[float, float] | None = None, 
+                    engine: Literal["artist", "func"] = "artist", max_k: int | None = None,
+                    frame_count: int | None = None, max_frames: int | None = None, 
+                    duration: int|float | None = None, show_buffer: bool | None = None,
+                    value_range: Tuple[float, float] | None = None) -> ArtistAnimation | FuncAnimation:
         """
         Creates the visualization animation.
         
         Params:
-            frames - list of frame data
+            frames - list of frame data, a trace of the sorting algorithm, or a generator function creating
+                     the frames on the fly (streaming, always uses the "func" engine)
             title - the title of the animation/sorting algorithm
             speed - delay between frames in seconds
             repeat - if the animation should repeat
             figsize - figure size (in inches)
+            engine - "artist" creates new artists for every frame (ArtistAnimation), "func" creates the artists
+                     once and only updates them (FuncAnimation with blitting), which uses much less memory
+            max_k - maximum iteration number, if not set it's taken from the last frame (when streaming,
+                    it's shown after the first pass through the frames)
+            frame_count - number of frames when streaming, needed for saving the animation
+            max_frames - maximum number of frames, see Trace.decimate (doesn't apply to streaming)
+            duration - maximum duration of the animation in seconds, it limits the number of frames like max_frames
+            show_buffer - if the auxiliary buffer should be shown as a second strip below the data, by default
+                          it's shown if any frame has a buffer (never for a generator function)
+            value_range - the smallest and the largest value the y axis must fit, when the first frame doesn't
+                          contain all values (only for the "func" engine, the "artist" engine fits all frames)
 
         Returns:
-            ArtistAnimation - the animation
+            ArtistAnimation | FuncAnimation - the animation
         """
-        self._check_anim_values(frames, title, speed, repeat, figsize)
+        with profiling.stage("check"):
+            self._check_anim_values(frames, title, speed, repeat, figsize, engine)
+        self._compile_colors()
+
+        budget = self.frame_budget(speed, max_frames, duration)
+        if budget is not None and not callable(frames):
+            with profiling.stage("decimate"):
+                if not isinstance(frames, Trace):
+                    frames = Trace.from_frames(frames, frames[0]["data"])
+                frames = frames.decimate(budget)
+
+        if callable(frames):
+            # první snímek je potřeba kvůli počtu dat
+            gen = frames()
+            first = next(gen)
+            gen.close()
+            engine = "func"
+        else:
+            first = frames[0]
 
-        fig = plt.figure(title, figsize)
-        fig.set_facecolor(self.style["background_color"])
-        fig.add_artist(Line2D([0.03, 0.97], [0.07, 0.07], color=self.style["line_color"], linestyle=self.style["line_style"], 
-                              linewidth=self.style["line_width"]))
-        fig.add_artist(Text(0.03, 0.03, "n = {}".format(len(frames[0]["data"])), color=self.style["text_color"]))
-        fig.add_artist(Text(0.5, 0.03, title, horizontalalignment="center", color=self.style["text_color"]))
+        if show_buffer is None:
+            if isinstance(frames, Trace):
+                show_buffer = frames.uses_buffer()
+            else:
+                show_buffer = not callable(frames) and any("buffer" in frame for frame in frames)
 
-        fig_axes = fig.add_axes((0, 0, 1, 1))
-        fig_axes.set_frame_on(False)
+        with profiling.stage("setup"):
+            # kreslení figury se měří, jen když je profilování zapnuté už při jejím vytvoření
+            fig = plt.figure(title, figsize, FigureClass=ProfiledFigure if profiling.is_active() else Figure)
+            fig_axes, bar_axes = self._setup_figure(fig, title, len(first["data"]))
+            buffer_axes = self._setup_buffer(fig, bar_axes) if show_buffer else None
 
-        bar_axes = fig.add_axes((0, 0.08, 1, 0.9))
-        bar_axes.set_frame_on(False)
-        bar_axes.set_xticks([])
-        bar_axes.set_yticks([])
+        if max_k is None and not callable(frames):
+            max_k = frames.max_k() if isinstance(frames, Trace) else frames[-1]["k"]
+
+        if engine == "func":
+            return self._create_func_anim(fig, fig_axes, bar_axes, frames, first, max_k, speed, repeat, frame_count, buffer_axes,
+                                          value_range)
 
-        max_k = frames[-1]["k"]
         artists = []
         
-        for frame in frames:
-            artists.append(self._create_anim_frame(fig_axes, bar_axes, frame, max_k))
+        for frame in profiling.timed("frames", frames):
+            with profiling.stage("artists"):
+                artists.append(self._create_anim_frame(fig_axes, bar_axes, frame, max_k, buffer_axes))
+                profiling.count(frames=1, artists=len(artists[-1]))
 
         return ArtistAnimation(fig, artists, speed * 1000, repeat=repeat, blit=False)
     
     
-    def _create_anim_frame(self, fig_axes: Axes, bar_axes: Axes, frame: dict, max_k: int) -> List[Artist]:
+    def frame_budget(self, speed: int|float, max_frames: int | None = None, duration: int|float | None = None) -> int | None:
+        """
+        Computes the maximum number of frames from the maximum number of frames and the maximum
+        duration of the animation.
+
+        Params:
+            speed - delay between frames in seconds
+            max_frames - maximum number of frames
+            duration - maximum duration of the animation in seconds
+
+        Returns:
+            int | None - the maximum number of frames, or None if there's no limit
+        """
+        budget = None
+
+        if max_frames is not None:
+            if not isinstance(max_frames, int):
+                raise TypeError("Maximum number of frames must be an integer")
+            budget = max_frames
+        
+        if duration is not None:
+            if not isinstance(duration, (int, float)):
+                raise TypeError("Duration must be a number")
+            elif duration <= 0:
+                raise ValueError("Duration must have a positive value")
+            budget = min(budget, int(duration / speed)) if budget is not None else int(duration / speed)
+
+        if budget is not None and budget < 2:
+            raise ValueError("The animation must have at least 2 frames")
+
+        return budget
+
+
+    def _setup_figure(self, fig: Figure, title: str, n: int, 
+                      rect: Tuple[float, float, float, float] = (0, 0, 1, 1)) -> Tuple[Axes, Axes]:
+        """
+        Sets up the figure's background, texts and axes.
+
+        Params:
+            fig - the figure
+            title - the title of the animation
+            n - number of the sorted data
+            rect - the part of the figure used by the animation (left, bottom, width, height in figure coordinates),
+                   e.g. when more animations share one figure
+
+        Returns:
+            Tuple[Axes, Axes] - axes covering the used part of the figure and axes where the barplot should be shown
+        """
+        left, bottom, width, height = rect
+        x = lambda pos: left + pos * width
+        y = lambda pos: bottom + pos * height
+
+        fig.set_facecolor(self.style["background_color"])
+        fig.add_artist(Line2D([x(0.03), x(0.97)], [y(0.07), y(0.07)], color=self.style["line_color"], 
+                              linestyle=self.style["line_style"], linewidth=self.style["line_width"]))
+        fig.add_artist(Text(x(0.03), y(0.03), "n = {}".format(n), color=self.style["text_color"]))
+        fig.add_artist(Text(x(0.5), y(0.03), title, horizontalalignment="center", color=self.style["text_color"]))
+
+        fig_axes = fig.add_axes(rect)
+        fig_axes.set_frame_on(False)
+        if tuple(rect) != (0, 0, 1, 1):
+            # popisky os by byly vidět u sousedních animací ve stejné figuře
+            fig_axes.set_axis_off()
+
+        bar_axes = fig.add_axes((left, y(0.08), width, 0.9 * height))
+        bar_axes.set_frame_on(False)
+        bar_axes.set_xticks([])
+        bar_axes.set_yticks([])
+
+        return fig_axes, bar_axes
+
+
+    def _setup_buffer(self, fig: Figure, bar_axes: Axes, rect: Tuple[float, float, float, float] = (0, 0, 1, 1)) -> Axes:
+        """
+        Makes space for the auxiliary buffer below the barplot and creates its axes, they share the scale
+        with the barplot.
+
+        Params:
+            fig - the figure
+            bar_axes - axes where the barplot is shown
+            rect - the part of the figure used by the animation (see `_setup_figure`)
+
+        Returns:
+            Axes - axes where the buffer should be shown
+        """
+        left, bottom, width, height = rect
+        bar_axes.set_position((left, bottom + 0.38 * height, width, 0.6 * height))
+
+        buffer_axes = fig.add_axes((left, bottom + 0.09 * height, width, 0.27 * height), sharex=bar_axes, sharey=bar_axes)
+        buffer_axes.set_frame_on(False)
+        buffer_axes.set_xticks([])
+        buffer_axes.set_yticks([])
+
+        return buffer_axes
+
+
+    def _create_anim_frame(self, fig_axes: Axes, bar_axes: Axes, frame: dict, max_k: int, buffer_axes: Axes | None = None) -> List[Artist]:
         """
         Create a list of Artists to be shown in a new frame.
 
@@ -191,27 +342,22 @@ class Animation():
             bar_axes - axes where the barplot should be shown
             frame - current frame's data
             max_k - maximum iteration number
+            buffer_axes - axes where the buffer should be shown, None if it isn't shown
         
         Returns:
             List[Artist] - list with the artists
         """
         n = len(frame["data"])
-        x = range(n)
-        y = frame["data"]
+        columns = self._pixel_columns(bar_axes, n)
 
         # nastavení správných barev sloupců
-        face_cols = [self.style["face_colors"]["unsorted"]] * n
-        edge_cols = [self.style["edge_colors"]["unsorted"]] * n
-
-        for i in range(n):
-            if "compare" in frame and i in frame["compare"]:
-                face_cols[i] = self.style["face_colors"]["compare"]
-                edge_cols[i] = self.style["edge_colors"]["compare"]
-            elif "correct" in frame and i in frame["correct"]:
-                face_cols[i] = self.style["face_colors"]["sorted"]
-                edge_cols[i] = self.style["edge_colors"]["sorted"]
-
-        bars = bar_axes.bar(x, y, facecolor=face_cols, edgecolor=edge_cols, linewidth=self.style["edge_width"], zorder=10)
+        states = self._frame_states(frame, n)
+
+        if columns is None:
+            bars = bar_axes.bar(range(n), frame["data"], facecolor=self._face_rgba[states], edgecolor=self._edge_rgba[states], 
+                                linewidth=self.style["edge_width"], zorder=10)
+        else:
+            bars = [self._create_envelope(bar_axes, np.asarray(frame["data"], dtype=float), states, columns)]
         
         output = []
         bounds = (-0.5, n-0.5)
@@ -225,6 +371,18 @@ class Animation():
         
         output += list(bars)
 
+        if buffer_axes is not None and "buffer" in frame:
+            # prázdná místa bufferu (nan) se nevykreslí
+            values = self._buffer_heights(frame)
+            if columns is None:
+                index = np.flatnonzero(~np.isnan(values))
+                states = self._buffer_states(frame, n)[index]
+                buffer_bars = buffer_axes.bar(index, values[index], facecolor=self._face_rgba[states], edgecolor=self._edge_rgba[states], 
+                                              linewidth=self.style["edge_width"], zorder=10)
+                output += list(buffer_bars)
+            else:
+                output += [self._create_envelope(buffer_axes, values, self._buffer_states(frame, n), columns)]
+
         if "pivot" in frame:
             pivot = bar_axes.add_line(Line2D([bounds[0], bounds[1]], [frame["pivot"], frame["pivot"]], color=self.style["pivot_color"], 
                                              linestyle=self.style["pivot_style"], linewidth=self.style["pivot_width"], zorder=20))
@@ -233,18 +391,365 @@ class Animation():
         text = fig_axes.text(0.97, 0.03, "k = {}/{}".format(frame["k"], max_k), horizontalalignment="right", 
                              color=self.style["text_color"], zorder=0)
         output += [text]
+
+        info = self._info_text(frame)
+        if info:
+            output += [bar_axes.text(0.01, 0.99, info, transform=bar_axes.transAxes, verticalalignment="top", 
+                                     color=self.style["text_color"], zorder=30)]
         
         return output
 
 
-    def _check_anim_values(self, frames: List[dict], title: str, speed: int|float, repeat: bool, 
-                           figsize: Tuple[float, float] | None) -> None:
+    def _create_func_anim(self, fig: Figure, fig_axes: Axes, bar_axes: Axes, frames: List[dict] | Trace | Callable[[], Iterator[dict]], 
+                          first: dict, max_k: int | None, speed: int|float, repeat: bool, frame_count: int | None,
+                          buffer_axes: Axes | None = None, value_range: Tuple[float, float] | None = None) -> FuncAnimation:
+        """
+        Creates the animation as FuncAnimation. All artists are created once and every frame only changes
+        their heights, colors and positions.
+
+        Params:
+            fig - the figure
+            fig_axes - axes covering the whole figure
+            bar_axes - axes where the barplot should be shown
+            frames - list of frame data, a trace, or a generator function
+            first - the first frame
+            max_k - maximum iteration number, None if it isn't known yet
+            speed - delay between frames in seconds
+            repeat - if the animation should repeat
+            frame_count - number of frames of the generator function
+            buffer_axes - axes where the buffer should be shown, None if it isn't shown
+            value_range - the smallest and the largest value the y axis must fit, None for the values of the first frame
+
+        Returns:
+            FuncAnimation - the animation
+        """
+        n = len(first["data"])
+
+        if isinstance(frames, Trace):
+            # FuncAnimation by si při opakování ukládalo všechny snímky iterable (itertools.tee),
+            # generátorová funkce se místo toho spustí znovu
+            frame_count = len(frames)
+            frames = frames.__iter__
+
+        if callable(frames) and max_k is None:
+            # max k se doplní, až generátor skončí
+            source = frames
+
+            def frames() -> Iterator[dict]:
+                nonlocal max_k
+                frame = None
+                for frame in source():
+                    yield frame
+                if frame is not None:
+                    max_k = frame["k"]
+
+        artists, update_scene = self._create_scene(fig_axes, bar_axes, first, buffer_axes, value_range)
+
+        def update(frame: dict) -> List[Artist]:
+            return update_scene(frame, max_k)
+
+        def init() -> List[Artist]:
+            return update(first)
+
+        return FuncAnimation(fig, update, frames, init_func=init, save_count=frame_count if callable(frames) else None, 
+                             interval=speed * 1000, repeat=repeat, blit=True, cache_frame_data=False)
+
+
+    def _create_scene(self, fig_axes: Axes, bar_axes: Axes, first: dict, 
+                      buffer_axes: Axes | None = None,
+                      value_range: Tuple[float, float] | None = None) -> Tuple[List[Artist], Callable[[dict, int | None], List[Artist]]]:
+        """
+        Creates all artists of the animation once. They are then changed by the returned update function
+        to show a given frame.
+
+        Params:
+            fig_axes - axes covering the whole figure
+            bar_axes - axes where the barplot should be shown
+            first - the first frame
+            buffer_axes - axes where the buffer should be shown, None if it isn't shown
+            value_range - the smallest and the largest value the y axis must fit, None for the values of the first frame
+
+        Returns:
+            Tuple[List[Artist], Callable] - the artists and the update function, which takes a frame and the maximum
+                                            iteration number and returns the artists
+        """
+        n = len(first["data"])
+        columns = self._pixel_columns(bar_axes, n)
+
+        if columns is None:
+            bars = bar_axes.bar(range(n), first["data"], facecolor=self._face_rgba[UNSORTED], 
+                                edgecolor=self._edge_rgba[UNSORTED], linewidth=self.style["edge_width"], zorder=10)
+        else:
+            bars = self._create_envelope(bar_axes, np.asarray(first["data"], dtype=float), np.full(n, UNSORTED, dtype=np.int8), columns)
+        if value_range is not None:
+            # první snímek ukazuje jen část dat, osa y se přizpůsobí všem hodnotám jako u sloupců
+            bar_axes.update_datalim([(0, min(value_range[0], 0)), (0, max(value_range[1], 0))], updatex=False)
+            bar_axes.autoscale_view(scalex=False)
+        ylims = bar_axes.get_ylim()
+        bar_axes.set_ylim(ylims)
+        bar_axes.set_xlim(bar_axes.get_xlim())
+
+        rect = bar_axes.add_artist(Rectangle((-0.5, ylims[0]), n, ylims[1] - ylims[0], color=self.style["bounds_color"], 
+                                             zorder=0, visible=False))
+        pivot = bar_axes.add_line(Line2D([-0.5, n-0.5], [0, 0], color=self.style["pivot_color"], linestyle=self.style["pivot_style"], 
+                                         linewidth=self.style["pivot_width"], zorder=20, visible=False))
+        text = fig_axes.text(0.97, 0.03, "", horizontalalignment="right", color=self.style["text_color"], zorder=0)
+        info = bar_axes.text(0.01, 0.99, "", transform=bar_axes.transAxes, verticalalignment="top", 
+                             color=self.style["text_color"], zorder=30)
+        
+        artists = [rect] + (list(bars) if columns is None else [bars]) + [pivot, text, info]
+
+        # výšky a stavy, které sloupce právě ukazují
+        shown = [np.asarray(first["data"], dtype=float), np.full(n, UNSORTED, dtype=np.int8)]
+
+        buffer_bars = None
+        if buffer_axes is not None and columns is not None:
+            buffer_bars = self._create_envelope(buffer_axes, np.full(n, np.nan), np.full(n, UNSORTED, dtype=np.int8), columns)
+            artists += [buffer_bars]
+        elif buffer_axes is not None:
+            buffer_bars = buffer_axes.bar(range(n), np.zeros(n), facecolor=self._face_rgba[UNSORTED], 
+                                          edgecolor=self._edge_rgba[UNSORTED], linewidth=self.style["edge_width"], zorder=10)
+            for bar in buffer_bars:
+                bar.set_visible(False)
+            artists += list(buffer_bars)
+            shown += [np.full(n, np.nan), np.full(n, UNSORTED, dtype=np.int8)]
+
+        def update(frame: dict, max_k: int | None) -> List[Artist]:
+            with profiling.stage("update"):
+                self._update_anim_frame(bars, rect, pivot, text, frame, max_k, shown, buffer_bars, info)
+                profiling.count(frames=1)
+            return artists
+
+        return artists, update
+
+
+    def _update_anim_frame(self, bars: BarContainer | PolyCollection, rect: Rectangle, pivot: Line2D, text: Text, frame: dict, 
+                           max_k: int, shown: List[np.ndarray], buffer_bars: BarContainer | PolyCollection | None = None, 
+                           info: Text | None = None) -> None:
+        """
+        Updates the artists created by `_create_scene` to show a new frame.
+
+        Params:
+            bars - the bars, or their envelope if there are more data than pixel columns
+            rect - the rectangle showing the bounds
+            pivot - the line showing the pivot
+            text - the text with the iteration number
+            frame - current frame's data
+            max_k - maximum iteration number, None if it isn't known yet
+            shown - heights and states currently shown by the bars (and the buffer bars), they're updated in place
+            buffer_bars - the bars of the buffer, None if it isn't shown
+            info - the text with the informational values of the frame (see INFO_KEYS)
+        """
+        n = len(frame["data"])
+        if isinstance(bars, PolyCollection):
+            self._update_envelope(bars, np.asarray(frame["data"], dtype=float), self._frame_states(frame, n))
+        else:
+            self._update_bars(bars, np.asarray(frame["data"], dtype=float), self._frame_states(frame, n), shown, 0)
+
+        if isinstance(buffer_bars, PolyCollection):
+            self._update_envelope(buffer_bars, self._buffer_heights(frame), self._buffer_states(frame, n))
+        elif buffer_bars is not None:
+            self._update_bars(buffer_bars, self._buffer_heights(frame), self._buffer_states(frame, n), shown, 2)
+
+        bounds = (-0.5, n-0.5)
+
+        if "bounds" in frame:
+            bounds = (frame["bounds"][0] - 0.5, frame["bounds"][1] + 0.5)
+            rect.set_x(bounds[0])
+            rect.set_width(bounds[1] - bounds[0])
+        rect.set_visible("bounds" in frame)
+
+        if "pivot" in frame:
+            pivot.set_data([bounds[0], bounds[1]], [frame["pivot"], frame["pivot"]])
+        pivot.set_visible("pivot" in frame)
+
+        text.set_text("k = {}/{}".format(frame["k"], "?" if max_k is None else max_k))
+
+        if info is not None:
+            info.set_text(self._info_text(frame))
+
+
+    def _update_bars(self, bars: BarContainer, heights: np.ndarray, states: np.ndarray, shown: List[np.ndarray], at: int) -> None:
+        """
+        Changes the heights and colors of the bars which differ from what they show now.
+
+        Params:
+            bars - the bars
+            heights - new heights of the bars, bars with nan height are hidden
+            states - new states of the bars
+            shown - heights and states currently shown, they're updated in place
+            at - index of the heights in shown, the states follow them
+        """
+        old = shown[at]
+        same = (heights == old) | (np.isnan(heights) & np.isnan(old))
+        changed = np.flatnonzero(~same | (states != shown[at+1]))
+        face_cols = self._face_rgba[states[changed]]
+        edge_cols = self._edge_rgba[states[changed]]
+
+        for i, index in enumerate(changed.tolist()):
+            bar = bars[index]
+            height = heights[index]
+            bar.set_visible(height == height)
+            if height == height:
+                bar.set_height(height)
+            bar.set_facecolor(face_cols[i])
+            bar.set_edgecolor(edge_cols[i])
+
+        shown[at] = heights
+        shown[at+1] = states
+
+
+    def _pixel_columns(self, axes: Axes, n: int) -> int | None:
+        """
+        Returns the number of pixel columns of the axes if there are more data than columns,
+        otherwise None (the data are drawn as bars).
+        """
+        columns = int(axes.bbox.width)
+        return columns if 0 < columns < n else None
+
+
+    def _envelope(self, heights: np.ndarray, states: np.ndarray, columns: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Computes the envelope of the data in pixel columns. A column is highlighted if any of its values
+        is compared and it's sorted only if all its values are sorted.
+
+        Params:
+            heights - heights of the bars, nan heights are left out
+            states - states of the bars
+            columns - number of pixel columns
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray] - vertices of the polygons and states of the columns
+        """
+        n = len(heights)
+        starts = np.arange(columns) * n // columns
+
+        # fmin a fmax přeskakují nan, sloupec jen s nan zůstane nan
+        low = np.fmin.reduceat(heights, starts)
+        high = np.fmax.reduceat(heights, starts)
+        empty = np.isnan(high)
+        low[empty] = high[empty] = 0
+
+        edges = np.arange(columns + 1) * n / columns - 0.5
+        verts = np.empty((columns, 4, 2))
+        verts[:, :2, 0] = edges[:-1, None]
+        verts[:, 2:, 0] = edges[1:, None]
+        verts[:, 0, 1] = verts[:, 3, 1] = np.minimum(low, 0)
+        verts[:, 1, 1] = verts[:, 2, 1] = np.maximum(high, 0)
+
+        compared = np.logical_or.reduceat(states == COMPARE, starts)
+        done = np.logical_and.reduceat(states == SORTED, starts)
+        col_states = np.where(compared, COMPARE, np.where(done, SORTED, UNSORTED))
+
+        return verts, col_states
+
+
+    def _create_envelope(self, axes: Axes, heights: np.ndarray, states: np.ndarray, columns: int) -> PolyCollection:
+        """
+        Creates the envelope of the data (see `_envelope`) as one collection of polygons in the axes.
+        """
+        verts, col_states = self._envelope(heights, states, columns)
+        envelope = PolyCollection(verts, facecolors=self._face_rgba[col_states], linewidths=0, zorder=10)
+
+        # osa y začíná na nule stejně jako u sloupců
+        envelope.sticky_edges.y.append(0)
+        axes.add_collection(envelope)
+
+        return envelope
+
+
+    def _update_envelope(self, envelope: PolyCollection, heights: np.ndarray, states: np.ndarray) -> None:
+        """
+        Changes the envelope created by `_create_envelope` to show new data.
+        """
+        verts, col_states = self._envelope(heights, states, len(envelope.get_paths()))
+        envelope.set_verts(verts)
+        envelope.set_facecolor(self._face_rgba[col_states])
+
+
+    def _compile_colors(self) -> None:
+        """
+        Converts the bar colors of the current style to RGBA arrays indexed by the bar state
+        (UNSORTED, COMPARE, SORTED).
+        """
+        states = ("unsorted", "compare", "sorted")
+        self._face_rgba = np.array([to_rgba(self.style["face_colors"][state]) for state in states])
+        self._edge_rgba = np.array([to_rgba(self.style["edge_colors"][state]) for state in states])
+
+
+    def _frame_states(self, frame: dict, n: int) -> np.ndarray:
+        """
+        Computes the state (UNSORTED, COMPARE, SORTED) of every bar in a frame.
+
+        Params:
+            frame - the frame's data
+            n - number of bars
+
+        Returns:
+            np.ndarray - array of the states
+        """
+        states = np.full(n, UNSORTED, dtype=np.int8)
+        correct = frame.get("correct")
+
+        if isinstance(correct, IndexIntervals):
+            # intervaly se převedou na masku pomocí kumulativního součtu
+            marks = np.zeros(n + 1, dtype=np.int32)
+            # n-tice by numpy bral jako vícerozměrný index
+            np.add.at(marks, np.asarray(correct.starts, dtype=np.intp), 1)
+            np.add.at(marks, np.asarray(correct.stops, dtype=np.intp), -1)
+            states[np.cumsum(marks[:-1]) > 0] = SORTED
+        elif correct is not None and len(correct) > 0:
+            states[np.fromiter(correct, dtype=np.intp, count=len(correct))] = SORTED
+
+        if "compare" in frame:
+            states[list(frame["compare"])] = COMPARE
+
+        return states
+
+
+    def _info_text(self, frame: dict) -> str:
+        """
+        Returns the text with the informational values of a frame (see INFO_KEYS), e.g. "gap = 4".
+        """
+        return ", ".join("{} = {}".format(key, frame[key]) for key in INFO_KEYS if key in frame)
+
+
+    def _buffer_heights(self, frame: dict) -> np.ndarray:
+        """
+        Returns the heights of the buffer bars in a frame, empty places of the buffer are nan.
+        """
+        if "buffer" not in frame:
+            return np.full(len(frame["data"]), np.nan)
+
+        # None se při převodu na float změní na nan
+        return np.array(frame["buffer"], dtype=float)
+
+
+    def _buffer_states(self, frame: dict, n: int) -> np.ndarray:
+        """
+        Computes the state of every buffer bar in a frame, the compared indexes are highlighted
+        in the buffer too.
+        """
+        states = np.full(n, UNSORTED, dtype=np.int8)
+        if "compare" in frame and "buffer" in frame:
+            states[list(frame["compare"])] = COMPARE
+
+        return states
+
+
+    def _check_anim_values(self, frames: List[dict] | Trace, title: str, speed: int|float, repeat: bool, 
+                           figsize: Tuple[float, float] | None, engine: str = "artist") -> None:
         """
         Checks whether all variables passed to `create_anim` have correct types and values.
         """    
         # frames
-        if not isinstance(frames, list):
-            raise TypeError("Frames must be a list")
+        if callable(frames):
+            pass
+        elif isinstance(frames, Trace):
+            if len(frames) == 0:
+                raise ValueError("Trace must have at least one frame")
+        elif not isinstance(frames, list):
+            raise TypeError("Frames must be a list, a Trace or a generator function")
         else:
             for frame in frames:
                 if not isinstance(frame, dict):
@@ -273,4 +778,21 @@ class Animation():
             elif not isinstance(figsize[0], (int, float)) or not isinstance(figsize[1], (int, float)):
                 raise TypeError("Figure size must be a 2-tuple of floats")
             elif figsize[0] <= 0 or figsize[1] <= 0:
-                raise ValueError("Figure size must be positive in both directions")
\ No newline at end of file
+                raise ValueError("Figure size must be positive in both directions")
+
+        # engine
+        if engine != "artist" and engine != "func":
+            raise ValueError("Engine must be either 'artist' or 'func'")
+
+
+
+class ProfiledFigure(Figure):
+    """
+    A figure measuring its drawing as the "draw" stage of the active profiler (see the profiling module).
+    It's used for figures created while a profiler is active.
+    """
+
+
+    def draw(self, renderer) -> None:
+        with profiling.stage("draw"):
+            super().draw(renderer)
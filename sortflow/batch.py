@@ -0,0 +1,130 @@
+"""
+Module containing the function for running many sorting algorithms at once, in several processes.
+Traces are sent between the processes in their compact binary format (see Trace.to_bytes),
+not as lists of frame dicts.
+"""
+
+import copy
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Iterable
+
+from .sort import Sort
+from .trace import Trace
+
+
+class JobResult():
+    """
+    The result of one job of `trace_many`.
+
+    Attributes:
+        index - index of the job in the input
+        value - the trace (or the stats dict) of the job, None if the job failed
+        error - description of the error (e.g. "ValueError: ..."), None if the job succeeded
+        traceback - the full traceback of the error, None if the job succeeded
+    """
+
+
+    def __init__(self, index: int, value: Trace | Dict[str, int|float] | None = None, error: str | None = None,
+                 traceback: str | None = None) -> None:
+        self.index = index
+        self.value = value
+        self.error = error
+        self.traceback = traceback
+
+
+    def __repr__(self) -> str:
+        if self.error is not None:
+            return "JobResult({}, error={!r})".format(self.index, self.error)
+        return "JobResult({}, {!r})".format(self.index, type(self.value).__name__)
+
+
+
+def trace_many(jobs: Iterable[Sort], workers: int | None = None, stats: bool = False) -> List[JobResult]:
+    """
+    Runs many sorting algorithms in a pool of processes and returns their traces (or stats) in the order
+    of the jobs. Traces which are already cached aren't computed again and new traces are saved to the caches
+    of their jobs. An error of one job doesn't stop the others, it's reported in the job's result.
+
+    Params:
+        jobs - instances of Sort subclasses with their data, order and options set (their classes must be
+               importable by the worker processes)
+        workers - number of processes, None for the number of CPUs, 1 runs the jobs in this process
+        stats - if True, the stats of the algorithms (see Sort.run_stats) are returned instead of traces
+
+    Returns:
+        List[JobResult] - results of the jobs, in the same order as the jobs
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int):
+        raise TypeError("Number of workers must be an integer")
+    elif workers < 1:
+        raise ValueError("Number of workers must be positive")
+
+    jobs = list(jobs)
+    for job in jobs:
+        if not isinstance(job, Sort):
+            raise TypeError("Every job must be an instance of Sort")
+
+    results: List[JobResult | None] = [None] * len(jobs)
+    pending = []
+
+    for i, job in enumerate(jobs):
+        # cache se do procesů neposílá (obsahuje zámek), hotové trace se rovnou vrátí
+        if not stats and job.cache is not None and job.data is not None and len(job.data) > 0:
+            trace = job.cache.get(job._cache_key())
+            if trace is not None:
+                results[i] = JobResult(i, trace)
+                continue
+
+        task = copy.copy(job)
+        task.cache = None
+        pending.append((i, task))
+
+    if workers == 1 or len(pending) <= 1:
+        outputs = [_run_job(task, stats) for _, task in pending]
+    else:
+        with ProcessPoolExecutor(min(workers, len(pending))) as pool:
+            futures = [pool.submit(_run_job, task, stats) for _, task in pending]
+            outputs = []
+            for future in futures:
+                try:
+                    outputs.append(future.result())
+                except Exception as e:
+                    # např. spadlý proces nebo objekt, který nejde přenést
+                    outputs.append((False, _describe(e), traceback.format_exc()))
+
+    for (i, _), (ok, value, trace_text) in zip(pending, outputs):
+        if not ok:
+            results[i] = JobResult(i, error=value, traceback=trace_text)
+            continue
+
+        if not stats:
+            value = Trace.from_bytes(value)
+            if jobs[i].cache is not None:
+                jobs[i].cache.put(jobs[i]._cache_key(), value)
+        results[i] = JobResult(i, value)
+
+    return results
+
+
+def _run_job(job: Sort, stats: bool) -> Tuple[bool, any, str | None]:
+    """
+    Runs one job. Runs in a worker process.
+
+    Returns:
+        Tuple - whether the job succeeded, the serialized trace or the stats dict (or the error description)
+                and the traceback of the error
+    """
+    try:
+        if stats:
+            return True, job.run_stats(), None
+        return True, job.trace().to_bytes(), None
+    except Exception as e:
+        return False, _describe(e), traceback.format_exc()
+
+
+def _describe(error: Exception) -> str:
+    return "".join(traceback.format_exception_only(type(error), error)).strip()
@@ -0,0 +1,332 @@
+"""
+Module containing the TraceCache class, a cache of traces of sorting algorithms.
+
+Traces are addressed by their content: the algorithm class (its name, version and a hash of its code),
+a hash of the data, the order and the options of the algorithm. A sorting algorithm therefore doesn't run again when only
+the style or the speed of the animation changes, nor when the same data are sorted by a new instance.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import types
+import weakref
+import zlib
+from collections import OrderedDict
+from typing import Dict
+
+import numpy as np
+
+from .trace import Trace
+
+
+# přípona souborů s trace v diskové vrstvě
+FILE_SUFFIX = ".trace"
+
+# počet prvků dat hashovaných najednou
+HASH_BLOCK = 2**20
+
+# otisky kódu tříd, třída předefinovaná v notebooku je nový objekt, a dostane tak nový otisk
+_fingerprints: "weakref.WeakKeyDictionary[type, str]" = weakref.WeakKeyDictionary()
+
+
+class TraceCache():
+    """
+    A two-tier cache of traces. Recently used traces are kept in memory (LRU), optionally they are also
+    saved to a directory on the disk in a compressed binary format. Both tiers are limited by size,
+    the least recently used traces are evicted first.
+
+    Attributes:
+        max_bytes - maximum memory used by the traces in the memory tier
+        directory - directory of the disk tier, None if there's no disk tier
+        max_disk_bytes - maximum size of the files in the disk tier
+        hits - number of traces found in the cache
+        misses - number of traces not found in the cache
+
+    Methods:
+        get - returns a cached trace
+        put - saves a trace to the cache
+        clear - removes all traces from the cache
+    """
+
+
+    def __init__(self, max_bytes: int = 256 * 2**20, directory: str | None = None, max_disk_bytes: int = 2**30) -> None:
+        """
+        Params:
+            max_bytes - maximum memory used by the traces in the memory tier (0 turns the memory tier off)
+            directory - directory of the disk tier, it's created if it doesn't exist (None for no disk tier)
+            max_disk_bytes - maximum size of the files in the disk tier
+        """
+        if not isinstance(max_bytes, int) or not isinstance(max_disk_bytes, int):
+            raise TypeError("Cache sizes must be integers")
+        elif max_bytes < 0 or max_disk_bytes < 0:
+            raise ValueError("Cache sizes must not be negative")
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._memory: OrderedDict[str, Trace] = OrderedDict()
+        # velikosti trace při posledním započítání, trace pak ještě může přibýt klíčové snímky
+        self._sizes: Dict[str, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+
+    def get(self, key: str) -> Trace | None:
+        """
+        Returns the trace saved under the key, or None if it isn't cached. A trace found only on the disk
+        is loaded into the memory tier.
+        """
+        with self._lock:
+            trace = self._memory.get(key)
+            if trace is not None:
+                self.hits += 1
+                self._remember(key, trace)
+                return trace
+
+        trace = self._load(key)
+
+        with self._lock:
+            if trace is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._remember(key, trace)
+
+        return trace
+
+
+    def put(self, key: str, trace: Trace) -> None:
+        """
+        Saves the trace under the key to both tiers.
+        """
+        with self._lock:
+            self._remember(key, trace)
+
+        if self.directory is not None:
+            self._save(key, trace)
+
+
+    def clear(self) -> None:
+        """
+        Removes all traces from the memory and from the disk.
+        """
+        with self._lock:
+            self._memory.clear()
+            self._sizes.clear()
+            self._size = 0
+
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(FILE_SUFFIX):
+                    os.remove(os.path.join(self.directory, name))
+
+
+    def _remember(self, key: str, trace: Trace) -> None:
+        """
+        Saves the trace to the memory tier (or marks it as recently used and counts its new keyframes)
+        and evicts the least recently used traces over the limit. Must be called with the lock held.
+        """
+        if key in self._memory:
+            del self._memory[key]
+            self._size -= self._sizes.pop(key)
+
+        size = trace.nbytes()
+        if size > self.max_bytes:
+            return
+
+        self._memory[key] = trace
+        self._sizes[key] = size
+        self._size += size
+
+        while self._size > self.max_bytes:
+            evicted, _ = self._memory.popitem(last=False)
+            self._size -= self._sizes.pop(evicted)
+
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + FILE_SUFFIX)
+
+
+    def _load(self, key: str) -> Trace | None:
+        """
+        Loads the trace from the disk tier, returns None if it isn't there (or can't be read).
+        """
+        if self.directory is None:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                trace = Trace.from_bytes(zlib.decompress(f.read()))
+        except (OSError, ValueError, zlib.error):
+            return None
+
+        # čas změny slouží jako čas posledního použití pro vyřazování
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return trace
+
+
+    def _save(self, key: str, trace: Trace) -> None:
+        """
+        Saves the trace to the disk tier and evicts the least recently used files over the limit.
+        """
+        data = zlib.compress(trace.to_bytes(), 1)
+        if len(data) > self.max_disk_bytes:
+            return
+
+        # zápis přes dočasný soubor, aby jiný proces nikdy nečetl nedopsaný soubor
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(FILE_SUFFIX):
+                try:
+                    stat = os.stat(os.path.join(self.directory, name))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+            total -= size
+
+
+
+def trace_key(cls: type, version: int, data: any, order: str, options: Dict[str, any]) -> str:
+    """
+    Creates the cache key of a trace.
+
+    Params:
+        cls - the class of the sorting algorithm (its code is a part of the key, see class_fingerprint)
+        version - the version of the algorithm (Sort.VERSION)
+        data - the data to be sorted (a list or an array of numbers)
+        order - the order of the data
+        options - other attributes of the algorithm which change the trace
+
+    Returns:
+        str - the key, a hexadecimal hash
+    """
+    h = hashlib.sha256()
+    h.update("{}.{}:{}:{}:{}:{}".format(cls.__module__, cls.__qualname__, class_fingerprint(cls), version, order,
+                                        len(data)).encode())
+    for name, value in sorted(options.items()):
+        h.update(name.encode())
+        # repr pole zkracuje, pole se proto hashuje podle obsahu
+        if isinstance(value, np.ndarray):
+            _hash_data(h, value)
+        else:
+            h.update(repr(value).encode())
+
+    # po blocích, data namapovaná ze souboru se tak nenačtou do paměti celá
+    for start in range(0, len(data), HASH_BLOCK):
+        _hash_data(h, np.asarray(data[start:start+HASH_BLOCK]))
+
+    return h.hexdigest()
+
+
+def _hash_data(h: "hashlib._Hash", values: np.ndarray) -> None:
+    """
+    Adds the dtype, the shape and the raw bytes of the array to the hash, so e.g. large int64 values
+    don't collide as they would after a cast to float64.
+    """
+    h.update("{}{}".format(values.dtype.str, values.shape).encode())
+    if values.dtype.kind == "O":
+        h.update(repr(values.tolist()).encode())
+    else:
+        h.update(np.ascontiguousarray(values).tobytes())
+
+
+def class_fingerprint(cls: type) -> str:
+    """
+    Returns a hash of the code and the constants of the class and its parents (including simple values
+    of closures, but not of global variables). A class with the same name, but a different code
+    (e.g. redefined in a notebook), therefore gets different cache keys.
+    """
+    fingerprint = _fingerprints.get(cls)
+    if fingerprint is not None:
+        return fingerprint
+
+    h = hashlib.sha256()
+    for klass in cls.__mro__[:-1]:
+        h.update("{}.{}".format(klass.__module__, klass.__qualname__).encode())
+        for name, value in sorted(vars(klass).items()):
+            if not name.startswith("__"):
+                h.update(name.encode())
+                _hash_value(h, value)
+
+    fingerprint = _fingerprints[cls] = h.hexdigest()
+    return fingerprint
+
+
+def _hash_value(h: "hashlib._Hash", value: any) -> None:
+    """
+    Adds the code of a function (or a method) or the value of a simple constant to the hash. Other values are skipped.
+    """
+    if isinstance(value, (staticmethod, classmethod)):
+        value = value.__func__
+    elif isinstance(value, property):
+        for func in (value.fget, value.fset, value.fdel):
+            _hash_value(h, func)
+        return
+
+    if isinstance(value, types.FunctionType):
+        _hash_code(h, value.__code__)
+        for cell in value.__closure__ or ():
+            try:
+                _hash_value(h, cell.cell_contents)
+            except ValueError:
+                pass
+    elif isinstance(value, (set, frozenset)):
+        # pořadí prvků množiny se mezi procesy liší
+        h.update(repr(sorted(repr(item) for item in value)).encode())
+    elif value is None or isinstance(value, (bool, int, float, str, bytes, tuple, list)):
+        h.update(repr(value).encode())
+
+
+def _hash_code(h: "hashlib._Hash", code: types.CodeType) -> None:
+    """
+    Adds the bytecode, the names and the constants of the code to the hash (not its file and line numbers).
+    """
+    h.update(code.co_code)
+    h.update(repr(code.co_names).encode())
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _hash_code(h, const)
+        else:
+            _hash_value(h, const)
+
+
+
+# výchozí cache sdílená všemi instancemi Sort
+default_cache = TraceCache()
@@ -0,0 +1,302 @@
+"""
+Module containing the command line interface of the library, run by `python -m sortflow`.
+
+Every combination of a data file, an algorithm and an order is one job, which renders the animation
+to a file on the Agg backend (no window is opened). Jobs run in a pool of processes. Outputs whose inputs
+(the data file, the algorithm, the order, the style and the rendering options) haven't changed since the last
+run are skipped, the hashes of the inputs are kept in a manifest file in the output directory.
+
+Usage:
+    python -m sortflow data.txt other.npy -a quick merge -o ascending descending --style style.json -j 4
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Tuple
+
+import matplotlib
+import matplotlib.pyplot as plt
+
+from .sort import Sort
+from .cache import TraceCache, class_fingerprint
+from .export import export_trace
+from . import sort_algs
+
+
+# soubor s hashi vstupů hotových výstupů
+MANIFEST_NAME = ".sortflow-manifest.json"
+FORMATS = ["gif", "mp4", "png"]
+# přípony souborů, jejichž formát je známý (--dtype se u nich nepoužije)
+KNOWN_SUFFIXES = (".npy", ".txt")
+ORDERS = ["ascending", "descending"]
+
+# hash zdrojového kódu knihovny, spočítá se jen jednou (viz code_hash)
+_code_hash: str | None = None
+
+
+def algorithms() -> Dict[str, type]:
+    """
+    Returns the sorting algorithms of the library by their lowercase names without "sort" (e.g. "quick").
+    """
+    classes = {}
+    for name in dir(sort_algs):
+        cls = getattr(sort_algs, name)
+        if isinstance(cls, type) and issubclass(cls, Sort) and cls is not Sort:
+            classes[name.lower().removesuffix("sort")] = cls
+
+    return classes
+
+
+def find_algorithm(name: str) -> type:
+    """
+    Returns the algorithm with the given name, e.g. "quick", "QuickSort", or "module:Class" for an algorithm
+    from another module.
+    """
+    if ":" in name:
+        module, _, attr = name.partition(":")
+        cls = getattr(__import__(module, fromlist=[attr]), attr, None)
+        if not isinstance(cls, type) or not issubclass(cls, Sort):
+            raise ValueError("'{}' is not a subclass of Sort".format(name))
+        return cls
+
+    classes = algorithms()
+    key = name.lower().removesuffix("sort")
+    if key not in classes:
+        raise ValueError("Unknown algorithm '{}', choose from: {}".format(name, ", ".join(sorted(classes))))
+
+    return classes[key]
+
+
+def file_hash(path: str) -> str:
+    """
+    Returns the sha256 hash of the file's content.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(2**20), b""):
+            h.update(block)
+
+    return h.hexdigest()
+
+
+def code_hash() -> str:
+    """
+    Returns the hash of the source code of the library, outputs rendered by other code are rebuilt.
+    """
+    global _code_hash
+    if _code_hash is None:
+        h = hashlib.sha256()
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                h.update(name.encode())
+                h.update(file_hash(os.path.join(directory, name)).encode())
+        _code_hash = h.hexdigest()
+
+    return _code_hash
+
+
+def job_hash(data_hash: str, cls: type, order: str, style: Dict[str, any] | None, options: Dict[str, any]) -> str:
+    """
+    Returns the hash of all inputs of a job (including the code of the algorithm and of the library),
+    the output is rebuilt when it changes.
+    """
+    text = json.dumps([data_hash, cls.__module__, cls.__qualname__, class_fingerprint(cls), cls.VERSION, code_hash(),
+                       order, style, options], sort_keys=True)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def render_job(path: str, cls: type, order: str, style: Dict[str, any] | None, options: Dict[str, any],
+               output: str, cache_dir: str | None) -> Tuple[bool, str | None]:
+    """
+    Renders one animation to the output file. Runs in a worker process.
+
+    Returns:
+        Tuple[bool, str | None] - whether the job succeeded and the description of the error
+    """
+    matplotlib.use("Agg")
+
+    try:
+        sort = cls(order=order, style=style)
+        sort.set_data(path, data_dtype(path, options["dtype"]))
+        if cache_dir is not None:
+            sort.set_cache(TraceCache(directory=cache_dir))
+
+        trace = sort.trace()
+        budget = sort._animation.frame_budget(options["speed"], options["max_frames"], options["duration"])
+        if budget is not None:
+            trace = trace.decimate(budget)
+
+        export_trace(trace, output, sort._animation, sort.get_title(), 1, options["speed"], options["figsize"],
+                     options["dpi"])
+        return True, None
+    except Exception as e:
+        return False, "".join(traceback.format_exception_only(type(e), e)).strip()
+    finally:
+        # figury vytvořené algoritmem nebo stylem se nesmí hromadit přes stovky úloh
+        plt.close("all")
+
+
+def data_dtype(path: str, dtype: str | None) -> str | None:
+    """
+    Returns the type of the values of a raw binary data file, None for files with a known format (.npy and text files).
+    """
+    return None if path.lower().endswith(KNOWN_SUFFIXES) else dtype
+
+
+def job_result(future: Future, job: tuple) -> Tuple[bool, str | None]:
+    """
+    Returns the result of a job run in a worker process. When a crashed process broke the pool, the job is run
+    again alone in a new process, so only the job which crashed fails.
+    """
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        pass
+    except Exception as e:
+        return False, "worker failed: {}".format("".join(traceback.format_exception_only(type(e), e)).strip())
+
+    try:
+        with ProcessPoolExecutor(1) as pool:
+            return pool.submit(render_job, *job).result()
+    except Exception as e:
+        return False, "worker failed: {}".format("".join(traceback.format_exception_only(type(e), e)).strip())
+
+
+def load_manifest(directory: str) -> Dict[str, str]:
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(directory: str, manifest: Dict[str, str]) -> None:
+    # zápis přes dočasný soubor, přerušený běh nezanechá poškozený manifest
+    path = os.path.join(directory, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def output_name(path: str, cls: type, order: str, fmt: str) -> str:
+    """
+    Returns the name of the output, e.g. "data_QuickSort_ascending.gif" (a directory for PNG frames).
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = "{}_{}_{}".format(stem, cls.__name__, order)
+
+    return name + os.sep if fmt == "png" else "{}.{}".format(name, fmt)
+
+
+def parse_args(argv: List[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="sortflow", description="Renders animations of sorting algorithms to files.")
+    parser.add_argument("data", nargs="*", help="data files (text files with numbers, .npy files, or raw binary files with --dtype)")
+    parser.add_argument("-a", "--algorithms", nargs="+", default=["bubble", "insert", "select", "quick", "merge"],
+                        help="algorithms, e.g. quick or QuickSort, or module:Class (default the five basic ones)")
+    parser.add_argument("-o", "--orders", nargs="+", default=["ascending"], choices=ORDERS, help="orders of the sorted data")
+    parser.add_argument("--style", help="JSON file with the style of the animations")
+    parser.add_argument("--dtype", help="type of the values in raw binary data files, e.g. float64 (not used for .npy and .txt files)")
+    parser.add_argument("--output-dir", default=".", help="directory of the outputs")
+    parser.add_argument("-f", "--format", default="gif", choices=FORMATS, help="output format (png for a directory of frames)")
+    parser.add_argument("--speed", type=float, default=0.5, help="delay between frames in seconds")
+    parser.add_argument("--max-frames", type=int, help="maximum number of frames")
+    parser.add_argument("--duration", type=float, help="maximum duration of an animation in seconds")
+    parser.add_argument("--figsize", type=float, nargs=2, help="figure size in inches")
+    parser.add_argument("--dpi", type=float, help="resolution of the frames")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of jobs run at once (0 for the number of CPUs)")
+    parser.add_argument("--cache-dir", help="directory of a disk cache of traces shared by the jobs")
+    parser.add_argument("--force", action="store_true", help="render all outputs, even those which are up to date")
+    parser.add_argument("--list", action="store_true", help="list the available algorithms and exit")
+
+    args = parser.parse_args(argv)
+    if not args.data and not args.list:
+        parser.error("at least one data file is needed")
+
+    return args
+
+
+def main(argv: List[str] | None = None) -> int:
+    """
+    Runs the command line interface.
+
+    Params:
+        argv - the arguments, None for sys.argv
+
+    Returns:
+        int - the exit code, 1 if any job failed
+    """
+    args = parse_args(argv)
+    if args.list:
+        print("\n".join(sorted(algorithms())))
+        return 0
+
+    matplotlib.use("Agg")
+
+    try:
+        classes = [find_algorithm(name) for name in args.algorithms]
+    except (ValueError, ImportError) as e:
+        print("sortflow: {}".format(e), file=sys.stderr)
+        return 2
+
+    style = None
+    if args.style is not None:
+        with open(args.style) as f:
+            style = json.load(f)
+
+    options = {"dtype": args.dtype, "speed": args.speed, "max_frames": args.max_frames, "duration": args.duration,
+               "figsize": tuple(args.figsize) if args.figsize else None, "dpi": args.dpi, "format": args.format}
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    manifest = load_manifest(args.output_dir)
+
+    jobs = []
+    failed = 0
+    for path in args.data:
+        try:
+            data_hash = file_hash(path)
+        except OSError as e:
+            print("failed  {}: {}".format(path, e), file=sys.stderr)
+            failed += 1
+            continue
+
+        for cls in classes:
+            for order in args.orders:
+                name = output_name(path, cls, order, args.format)
+                output = os.path.join(args.output_dir, name)
+                digest = job_hash(data_hash, cls, order, style, options)
+
+                if not args.force and manifest.get(name) == digest and os.path.exists(output):
+                    print("skipped {} (up to date)".format(name))
+                    continue
+
+                # neúspěšný nebo přerušený výstup se příště vytvoří znovu
+                manifest.pop(name, None)
+                jobs.append((name, digest, (path, cls, order, style, options, output, args.cache_dir)))
+
+    workers = args.jobs or os.cpu_count() or 1
+
+    if workers == 1 or len(jobs) <= 1:
+        results = (render_job(*job) for _, _, job in jobs)
+    else:
+        pool = ProcessPoolExecutor(min(workers, len(jobs)))
+        futures = [pool.submit(render_job, *job) for _, _, job in jobs]
+        pool.shutdown(wait=False)
+        results = (job_result(future, job) for future, (_, _, job) in zip(futures, jobs))
+
+    for (name, digest, _), (ok, error) in zip(jobs, results):
+        if ok:
+            print("built   {}".format(name))
+            manifest[name] = digest
+        else:
+            print("failed  {}: {}".format(name, error), file=sys.stderr)
+            failed += 1
+        save_manifest(args.output_dir, manifest)
+
+    return 1 if failed else 0
@@ -0,0 +1,169 @@
+"""
+Module containing the function for exporting the visualization animation to files.
+Frames can be rendered in several processes at once, each process renders a chunk of frames
+with the Agg backend.
+"""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, Future
+from typing import List, Tuple, Dict
+
+import numpy as np
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.animation import AbstractMovieWriter, writers
+from PIL import Image
+
+from .animation import Animation, ProfiledFigure
+from .trace import Trace
+from . import profiling
+
+
+FRAME_NAME = "frame_{:07d}.png"
+
+
+def export_trace(trace: Trace, path: str, animation: Animation, title: str, workers: int | None = 1, speed: int|float = 0.5,
+                 figsize: Tuple[float, float] | None = None, dpi: float | None = None,
+                 writer: str | AbstractMovieWriter | None = None, show_buffer: bool | None = None,
+                 value_range: Tuple[float, float] | None = None) -> None:
+    """
+    Renders all frames of the trace and saves them to a file. The result is the same as saving the animation
+    created with the "func" engine, pixel for pixel.
+
+    Params:
+        trace - the trace of the sorting algorithm
+        path - a directory (existing, or ending with a path separator) for a sequence of PNG images,
+               or a file name of a GIF/video
+        animation - the Animation object with the style
+        title - the title of the animation
+        workers - number of rendering processes, None for the number of CPUs
+        speed - delay between frames in seconds
+        figsize - figure size (in inches)
+        dpi - resolution of the frames, default is the figure's dpi
+        writer - matplotlib's movie writer or its name, default is "pillow" for GIFs and
+                 rcParams["animation.writer"] otherwise
+        show_buffer - if the auxiliary buffer should be shown below the data, default is if the trace uses it
+        value_range - the smallest and the largest value the y axis must fit, None for the values of the first frame
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int):
+        raise TypeError("Number of workers must be an integer")
+    elif workers < 1:
+        raise ValueError("Number of workers must be positive")
+
+    with profiling.stage("check"):
+        animation._check_anim_values(trace, title, speed, False, figsize)
+
+    if figsize is None:
+        figsize = tuple(matplotlib.rcParams["figure.figsize"])
+    if dpi is None:
+        dpi = matplotlib.rcParams["figure.dpi"]
+    if show_buffer is None:
+        show_buffer = trace.uses_buffer()
+
+    # obrázky se buď uloží přímo do cílové složky, nebo do dočasné, ze které se složí video
+    sequence = os.path.isdir(path) or path.endswith(os.sep)
+    directory = path if sequence else tempfile.mkdtemp(prefix="sortflow_")
+    os.makedirs(directory, exist_ok=True)
+
+    count = len(trace)
+    workers = min(workers, count)
+
+    # procesy pak začnou vykreslovat od nejbližšího klíčového snímku, ne od začátku trace
+    if workers > 1 and not trace._key_ops:
+        trace.build_keyframes()
+    bounds = [count * i // workers for i in range(workers + 1)]
+    rc = {key: val for key, val in matplotlib.rcParams.items() if key != "backend"}
+    args = (trace, animation.style, title, figsize, dpi, rc, directory, show_buffer, value_range)
+
+    with profiling.stage("export"):
+        try:
+            if workers == 1:
+                _render_chunk(*args, 0, count)
+                if not sequence:
+                    _write_movie(directory, path, count, bounds, [], writer, speed, dpi)
+            else:
+                # při chybě se nezačaté části zruší a na běžící se počká, než se smaže dočasná složka
+                with ProcessPoolExecutor(workers) as pool:
+                    chunks = [pool.submit(_render_chunk, *args, bounds[i], bounds[i+1]) for i in range(workers)]
+                    try:
+                        if sequence:
+                            for chunk in chunks:
+                                chunk.result()
+                        else:
+                            _write_movie(directory, path, count, bounds, chunks, writer, speed, dpi)
+                    except BaseException:
+                        for chunk in chunks:
+                            chunk.cancel()
+                        raise
+        finally:
+            if not sequence:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def _render_chunk(trace: Trace, style: Dict[str, any], title: str, figsize: Tuple[float, float], dpi: float,
+                  rc: Dict[str, any], directory: str, show_buffer: bool, value_range: Tuple[float, float] | None,
+                  start: int, stop: int) -> None:
+    """
+    Renders frames start..stop-1 of the trace into PNG files in the directory. Runs in a worker process.
+    """
+    with matplotlib.rc_context(rc):
+        animation = Animation()
+        animation.style = style
+        animation._compile_colors()
+
+        fig = ProfiledFigure(figsize=figsize) if profiling.is_active() else Figure(figsize=figsize)
+        FigureCanvasAgg(fig)
+
+        first = trace[0]
+        fig_axes, bar_axes = animation._setup_figure(fig, title, len(first["data"]))
+        buffer_axes = animation._setup_buffer(fig, bar_axes) if show_buffer else None
+        _, update = animation._create_scene(fig_axes, bar_axes, first, buffer_axes, value_range)
+        max_k = trace.max_k()
+
+        for index, frame in enumerate(profiling.timed("frames", trace.select(range(start, stop))), start):
+            update(frame, max_k)
+            with profiling.stage("save"):
+                fig.savefig(os.path.join(directory, FRAME_NAME.format(index)), format="png", dpi=dpi)
+
+
+def _write_movie(directory: str, path: str, count: int, bounds: List[int], chunks: List[Future],
+                 writer: str | AbstractMovieWriter | None, speed: int|float, dpi: float) -> None:
+    """
+    Writes the rendered frames in order through a matplotlib movie writer. Frames of a chunk are written
+    as soon as the chunk is rendered.
+    """
+    if writer is None:
+        writer = "pillow" if path.lower().endswith(".gif") else matplotlib.rcParams["animation.writer"]
+    if isinstance(writer, str):
+        writer = writers[writer](fps=1 / speed)
+
+    def read(index: int) -> np.ndarray:
+        with Image.open(os.path.join(directory, FRAME_NAME.format(index))) as image:
+            return np.asarray(image.convert("RGBA"))
+
+    if chunks:
+        chunks[0].result()
+    first = read(0)
+    height, width = first.shape[:2]
+
+    # figura, která jen ukazuje hotový snímek pixel po pixelu
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    image = fig.figimage(first)
+
+    with writer.saving(fig, path, dpi):
+        chunk = 0
+        for index in range(count):
+            if index >= bounds[chunk + 1]:
+                chunk += 1
+                if chunks:
+                    chunks[chunk].result()
+
+            with profiling.stage("write"):
+                image.set_data(read(index))
+                writer.grab_frame()
@@ -0,0 +1,214 @@
+"""
+Module containing the LiveView class, which shows the sorting algorithm while it's running.
+
+The algorithm runs in a background thread. The figure is updated by a timer of the matplotlib's backend
+at most `fps` times per second and it always shows the newest frame, the frames created in between
+are skipped. The frames are therefore never queued and the kernel of a notebook stays responsive.
+An interactive backend is needed (e.g. `%matplotlib widget` in Jupyter).
+"""
+
+import copy
+import threading
+import time
+from typing import Dict, Callable, Iterator, Tuple
+
+import matplotlib.pyplot as plt
+
+from .trace import FrameRecorder, _to_list
+
+
+class LiveView():
+    """
+    A live visualization of a running sorting algorithm.
+
+    Attributes:
+        fig - the figure
+        fps - maximum number of figure updates per second
+        step_delay - delay after every frame of the algorithm in seconds (slows the algorithm down)
+        frames - number of frames the algorithm has created so far
+        shown - number of frames shown so far
+        done - whether the algorithm has finished (or has been stopped)
+        error - the exception raised by the algorithm, None if there wasn't any
+
+    Methods:
+        start - starts the algorithm and the updates of the figure
+        stop - stops the algorithm and the updates
+        wait - waits until the algorithm finishes
+        is_running - returns whether the algorithm is running
+    """
+
+
+    def __init__(self, sort: "Sort", fps: int|float = 20, step_delay: int|float = 0.0,
+                 figsize: Tuple[float, float] | None = None, show_buffer: bool = False) -> None:
+        """
+        Params:
+            sort - the sorting algorithm with its data
+            fps - maximum number of figure updates per second
+            step_delay - delay after every frame of the algorithm in seconds
+            figsize - figure size (in inches)
+            show_buffer - if the auxiliary buffer should be shown below the data
+        """
+        if not isinstance(fps, (int, float)) or not isinstance(step_delay, (int, float)):
+            raise TypeError("Frame rate and step delay must be numbers")
+        elif fps <= 0:
+            raise ValueError("Frame rate must have a positive value")
+        elif step_delay < 0:
+            raise ValueError("Step delay must not be negative")
+
+        sort._check_data()
+        animation = sort._animation
+        animation._check_anim_values([], sort.get_title(), 1 / fps, False, figsize)
+        animation._compile_colors()
+
+        self.fps = fps
+        self.step_delay = step_delay
+        self.frames = 0
+        self.shown = 0
+        self.done = False
+        self.error = None
+
+        self._steps = _steps(sort)
+        first = next(self._steps)()
+
+        self.fig = plt.figure(sort.get_title(), figsize)
+        fig_axes, bar_axes = animation._setup_figure(self.fig, sort.get_title(), len(first["data"]))
+        buffer_axes = animation._setup_buffer(self.fig, bar_axes) if show_buffer else None
+        _, self._update = animation._create_scene(fig_axes, bar_axes, first, buffer_axes)
+        self._update(first, None)
+
+        self._stop = threading.Event()
+        self._wanted = threading.Event()
+        self._latest = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._timer = None
+
+
+    def start(self) -> "LiveView":
+        """
+        Starts the algorithm in a background thread and the updates of the figure.
+
+        Returns:
+            LiveView - this object
+        """
+        if self._thread is not None:
+            raise RuntimeError("Live view can be started only once")
+
+        self._thread = threading.Thread(target=self._produce, name="sortflow-live", daemon=True)
+        self._timer = self.fig.canvas.new_timer(interval=int(1000 / self.fps))
+        self._timer.add_callback(self._tick)
+
+        self._thread.start()
+        self._timer.start()
+
+        return self
+
+
+    def stop(self) -> None:
+        """
+        Stops the algorithm and the updates of the figure. The last shown frame stays in the figure.
+        """
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.stop()
+
+
+    def wait(self, timeout: int|float | None = None) -> bool:
+        """
+        Waits until the algorithm finishes. Interrupting the waiting (Ctrl+C) stops the algorithm.
+
+        Params:
+            timeout - maximum time to wait in seconds, None for no limit
+
+        Returns:
+            bool - whether the algorithm has finished
+        """
+        if self._thread is None:
+            raise RuntimeError("Live view hasn't been started")
+
+        try:
+            self._thread.join(timeout)
+        except KeyboardInterrupt:
+            self.stop()
+            raise
+
+        return not self._thread.is_alive()
+
+
+    def is_running(self) -> bool:
+        """
+        Returns whether the algorithm is running.
+        """
+        return self._thread is not None and self._thread.is_alive()
+
+
+    def _produce(self) -> None:
+        """
+        Runs the algorithm. Runs in the background thread, a frame is created only when the figure asks for it.
+        """
+        current = None
+        try:
+            for current in self._steps:
+                if self._stop.is_set():
+                    break
+
+                self.frames += 1
+                if self._wanted.is_set():
+                    self._wanted.clear()
+                    frame = current()
+                    with self._lock:
+                        self._latest = frame
+
+                if self.step_delay:
+                    time.sleep(self.step_delay)
+        except Exception as e:
+            self.error = e
+        finally:
+            # poslední snímek se ukáže vždy
+            frame = current() if current is not None else None
+            with self._lock:
+                self._latest = frame
+                self.done = True
+
+
+    def _tick(self) -> None:
+        """
+        Shows the newest frame. Called by the timer of the figure's canvas.
+        """
+        with self._lock:
+            frame, self._latest = self._latest, None
+            done = self.done
+
+        if frame is not None:
+            self.shown += 1
+            self._update(frame, frame["k"] if done else None)
+            self.fig.canvas.draw_idle()
+
+        # po skončení algoritmu už žádný další snímek nepřijde
+        if done:
+            self._timer.stop()
+        else:
+            self._wanted.set()
+
+
+
+def _steps(sort: "Sort") -> Iterator[Callable[[], Dict[str, any]]]:
+    """
+    Runs the sorting algorithm and after every frame yields a function creating that frame,
+    so the frames which aren't shown are never created.
+    """
+    if sort._uses_record():
+        rec = FrameRecorder(sort._shown_data())
+        yield rec.current
+
+        for k in sort._record(rec):
+            rec.frame(k)
+            yield rec.current
+    else:
+        # algoritmus mění self.data, proto běží nad kopií instance
+        job = copy.copy(sort)
+        job.data = _to_list(sort.data)
+        yield lambda: {"data": list(job.data), "k": 0}
+
+        for frame in job._sort_next():
+            yield lambda frame=frame: {**frame, "data": list(frame["data"])}
@@ -0,0 +1,311 @@
+// Přehrávač animace třídícího algoritmu v prohlížeči (viz player.py).
+// Z trace ve formátu Trace.to_bytes přehrává operace stejně jako Trace._apply v Pythonu
+// a každý snímek kreslí do canvasu stejně jako Animation (sloupce, barvy, hranice, pivot, k).
+(function (root, config) {
+    "use strict";
+
+    var OP_COMPARE = 0, OP_SWAP = 1, OP_SHIFT = 2, OP_WRITE = 3, OP_PIVOT = 4, OP_BOUNDS = 5, OP_CORRECT = 6,
+        OP_CORRECT_CLEAR = 7, OP_BUFFER_LOAD = 8, OP_BUFFER_CLEAR = 9, OP_BUFFER_WRITE = 10, OP_INFO = 11;
+    var UNSORTED = 0, COMPARE = 1, SORTED = 2;
+
+    // čtení trace: hlavička "<4sBc7Q" a za ní sloupce initial, op, a, b, v, frames, k
+    function decode(text) {
+        var raw = atob(text), bytes = new Uint8Array(raw.length);
+        for (var i = 0; i < raw.length; i++) {
+            bytes[i] = raw.charCodeAt(i);
+        }
+
+        var view = new DataView(bytes.buffer);
+        if (raw.slice(0, 4) !== "SFTR") {
+            throw new Error("Data don't contain a trace");
+        }
+        var little = raw[5] === "<";
+        var counts = [];
+        for (i = 0; i < 7; i++) {
+            counts.push(Number(view.getBigUint64(6 + 8 * i, true)));
+        }
+
+        var offset = 62;
+        function column(count, size, read) {
+            var out = [];
+            for (var j = 0; j < count; j++) {
+                out.push(read(offset + j * size));
+            }
+            offset += count * size;
+            return out;
+        }
+
+        return {
+            initial: Float64Array.from(column(counts[0], 8, function (o) { return view.getFloat64(o, little); })),
+            op: Uint8Array.from(column(counts[1], 1, function (o) { return view.getUint8(o); })),
+            a: Int32Array.from(column(counts[2], 4, function (o) { return view.getInt32(o, little); })),
+            b: Int32Array.from(column(counts[3], 4, function (o) { return view.getInt32(o, little); })),
+            v: Float64Array.from(column(counts[4], 8, function (o) { return view.getFloat64(o, little); })),
+            frames: column(counts[5], 8, function (o) { return Number(view.getBigInt64(o, little)); }),
+            k: column(counts[6], 8, function (o) { return Number(view.getBigInt64(o, little)); })
+        };
+    }
+
+    function newState(initial) {
+        var n = initial.length;
+        return {data: Float64Array.from(initial), compare: null, bounds: null, pivot: null, sorted: new Uint8Array(n),
+                buffer: new Float64Array(n), filled: new Uint8Array(n), buffered: 0, info: {}, done: 0};
+    }
+
+    function copyState(state) {
+        return {data: Float64Array.from(state.data), compare: state.compare, bounds: state.bounds, pivot: state.pivot,
+                sorted: Uint8Array.from(state.sorted), buffer: Float64Array.from(state.buffer),
+                filled: Uint8Array.from(state.filled), buffered: state.buffered, info: Object.assign({}, state.info),
+                done: state.done};
+    }
+
+    function clearBuffer(state, start, stop) {
+        for (var i = start; i < stop; i++) {
+            state.buffered -= state.filled[i];
+            state.filled[i] = 0;
+        }
+    }
+
+    // stejné jako Trace._apply
+    function apply(trace, state, stop) {
+        var data = state.data;
+        for (var i = state.done; i < stop; i++) {
+            var op = trace.op[i], a = trace.a[i], b = trace.b[i];
+
+            if (op === OP_COMPARE) {
+                state.compare = a < 0 ? null : (b >= 0 ? [a, b] : [a]);
+            } else if (op === OP_SWAP) {
+                var t = data[a]; data[a] = data[b]; data[b] = t;
+            } else if (op === OP_SHIFT) {
+                var moved = data[b]; data.copyWithin(a + 1, a, b); data[a] = moved;
+            } else if (op === OP_WRITE) {
+                data[a] = trace.v[i];
+            } else if (op === OP_PIVOT) {
+                state.pivot = a < 0 ? null : trace.v[i];
+            } else if (op === OP_BOUNDS) {
+                state.bounds = a < 0 ? null : [a, b];
+            } else if (op === OP_CORRECT) {
+                state.sorted.fill(1, a, b);
+            } else if (op === OP_CORRECT_CLEAR) {
+                state.sorted.fill(0);
+            } else if (op === OP_BUFFER_LOAD) {
+                for (var j = a; j < b; j++) {
+                    state.buffered += 1 - state.filled[j];
+                    state.filled[j] = 1;
+                    state.buffer[j] = data[j];
+                }
+            } else if (op === OP_BUFFER_CLEAR) {
+                clearBuffer(state, a < 0 ? 0 : a, a < 0 ? data.length : b);
+            } else if (op === OP_BUFFER_WRITE) {
+                state.buffered += 1 - state.filled[a];
+                state.filled[a] = 1;
+                state.buffer[a] = trace.v[i];
+            } else if (op === OP_INFO) {
+                if (b < 0) {
+                    delete state.info[config.infoKeys[a]];
+                } else {
+                    state.info[config.infoKeys[a]] = b;
+                }
+            }
+        }
+        state.done = stop;
+    }
+
+    var trace = decode(config.trace);
+    var n = trace.initial.length, count = trace.frames.length, maxK = count ? trace.k[count - 1] : 0;
+    var style = config.style, scale = config.dpi / 72;
+
+    // klíčové snímky pro přeskakování posuvníkem, stejně jako Trace.build_keyframes
+    var interval = Math.max(4096, n), keyframes = [newState(trace.initial)];
+    for (var stop = interval; stop <= trace.op.length; stop += interval) {
+        var key = copyState(keyframes[keyframes.length - 1]);
+        apply(trace, key, stop);
+        keyframes.push(key);
+    }
+
+    var canvas = root.querySelector("canvas"), ctx = canvas.getContext("2d");
+    var width = config.width, height = config.height, ratio = window.devicePixelRatio || 1;
+    canvas.width = Math.round(width * ratio);
+    canvas.height = Math.round(height * ratio);
+    canvas.style.width = width + "px";
+    canvas.style.height = height + "px";
+
+    // osy v pixelech (left, bottom, width, height od spodního okraje) a jejich rozsahy z matplotlibu
+    function axes(box) {
+        var left = box[0], top = height - box[1] - box[3];
+        return {
+            x: function (x) { return left + (x - config.xlim[0]) / (config.xlim[1] - config.xlim[0]) * box[2]; },
+            y: function (y) { return top + (config.ylim[1] - y) / (config.ylim[1] - config.ylim[0]) * box[3]; },
+            left: left, top: top, width: box[2], height: box[3]
+        };
+    }
+    var barAxes = axes(config.barAxes), bufferAxes = config.bufferAxes ? axes(config.bufferAxes) : null;
+
+    function clip(ax) {
+        ctx.save();
+        ctx.beginPath();
+        ctx.rect(ax.left, ax.top, ax.width, ax.height);
+        ctx.clip();
+    }
+
+    function drawBars(ax, heights, shown, states) {
+        clip(ax);
+        var columns = config.columns;
+
+        if (columns) {
+            // obálka: jeden obdélník na sloupec pixelů od minima po maximum (viz Animation._envelope)
+            for (var c = 0; c < columns; c++) {
+                var start = Math.floor(c * n / columns), end = Math.floor((c + 1) * n / columns);
+                var low = Infinity, high = -Infinity, compared = false, done = true, any = false;
+                for (var i = start; i < end; i++) {
+                    if (!shown[i]) { done = done && states[i] === SORTED; compared = compared || states[i] === COMPARE; continue; }
+                    any = true;
+                    low = Math.min(low, heights[i]);
+                    high = Math.max(high, heights[i]);
+                    compared = compared || states[i] === COMPARE;
+                    done = done && states[i] === SORTED;
+                }
+                if (!any) { low = high = 0; }
+                var state = compared ? COMPARE : (done ? SORTED : UNSORTED);
+                var x0 = ax.x(c * n / columns - 0.5), x1 = ax.x((c + 1) * n / columns - 0.5);
+                var y0 = ax.y(Math.min(low, 0)), y1 = ax.y(Math.max(high, 0));
+                ctx.fillStyle = style.face[state];
+                ctx.fillRect(x0, y1, x1 - x0, y0 - y1);
+            }
+        } else {
+            ctx.lineWidth = style.edgeWidth * scale;
+            ctx.lineJoin = "miter";
+            for (i = 0; i < n; i++) {
+                if (!shown[i]) {
+                    continue;
+                }
+                var left = ax.x(i - 0.4), right = ax.x(i + 0.4), base = ax.y(0), top = ax.y(heights[i]);
+                ctx.fillStyle = style.face[states[i]];
+                ctx.strokeStyle = style.edge[states[i]];
+                ctx.fillRect(left, Math.min(base, top), right - left, Math.abs(base - top));
+                if (style.edgeWidth > 0) {
+                    ctx.strokeRect(left, Math.min(base, top), right - left, Math.abs(base - top));
+                }
+            }
+        }
+        ctx.restore();
+    }
+
+    function line(x0, y0, x1, y1, color, lineWidth, dashes) {
+        ctx.beginPath();
+        ctx.strokeStyle = color;
+        ctx.lineWidth = lineWidth * scale;
+        ctx.setLineDash(dashes.map(function (d) { return d * lineWidth * scale; }));
+        ctx.moveTo(x0, y0);
+        ctx.lineTo(x1, y1);
+        ctx.stroke();
+        ctx.setLineDash([]);
+    }
+
+    function text(value, x, y, align, baseline) {
+        ctx.fillStyle = style.text;
+        ctx.font = (config.fontSize * scale) + "px sans-serif";
+        ctx.textAlign = align;
+        ctx.textBaseline = baseline;
+        ctx.fillText(value, x, y);
+    }
+
+    function draw(state, k) {
+        ctx.setTransform(ratio, 0, 0, ratio, 0, 0);
+        ctx.fillStyle = style.background;
+        ctx.fillRect(0, 0, width, height);
+
+        var bounds = [-0.5, n - 0.5];
+        if (state.bounds) {
+            bounds = [state.bounds[0] - 0.5, state.bounds[1] + 0.5];
+            clip(barAxes);
+            ctx.fillStyle = style.bounds;
+            ctx.fillRect(barAxes.x(bounds[0]), barAxes.top, barAxes.x(bounds[1]) - barAxes.x(bounds[0]), barAxes.height);
+            ctx.restore();
+        }
+
+        // stavy sloupců jako Animation._frame_states a _buffer_states
+        var states = new Uint8Array(n), bufferStates = new Uint8Array(n), shown = new Uint8Array(n).fill(1);
+        for (var i = 0; i < n; i++) {
+            states[i] = state.sorted[i] ? SORTED : UNSORTED;
+        }
+        if (state.compare) {
+            state.compare.forEach(function (index) {
+                states[index] = COMPARE;
+                if (state.buffered) {
+                    bufferStates[index] = COMPARE;
+                }
+            });
+        }
+        drawBars(barAxes, state.data, shown, states);
+
+        if (bufferAxes && state.buffered) {
+            drawBars(bufferAxes, state.buffer, state.filled, bufferStates);
+        }
+
+        if (state.pivot !== null) {
+            clip(barAxes);
+            line(barAxes.x(bounds[0]), barAxes.y(state.pivot), barAxes.x(bounds[1]), barAxes.y(state.pivot),
+                 style.pivot, style.pivotWidth, style.pivotDashes);
+            ctx.restore();
+        }
+
+        line(0.03 * width, 0.93 * height, 0.97 * width, 0.93 * height, style.line, style.lineWidth, style.lineDashes);
+        text("n = " + n, 0.03 * width, 0.97 * height, "left", "alphabetic");
+        text(config.title, 0.5 * width, 0.97 * height, "center", "alphabetic");
+        text("k = " + k + "/" + maxK, 0.97 * width, 0.97 * height, "right", "alphabetic");
+
+        var info = config.infoKeys.filter(function (key) { return key in state.info; })
+                                  .map(function (key) { return key + " = " + state.info[key]; }).join(", ");
+        if (info) {
+            text(info, barAxes.left + 0.01 * barAxes.width, barAxes.top + 0.01 * barAxes.height, "left", "top");
+        }
+    }
+
+    var current = copyState(keyframes[0]), index = 0, timer = null;
+    var slider = root.querySelector("input"), button = root.querySelector("button"), label = root.querySelector("span");
+    slider.max = Math.max(count - 1, 0);
+
+    function show(frame) {
+        var target = trace.frames[frame];
+        var key = keyframes[Math.min(Math.floor(target / interval), keyframes.length - 1)];
+        // dopředu se přehrává od aktuálního stavu, dozadu nebo daleko od nejbližšího klíčového snímku
+        if (target < current.done || key.done > current.done) {
+            current = copyState(key);
+        }
+        apply(trace, current, target);
+        index = frame;
+        slider.value = frame;
+        label.textContent = (frame + 1) + "/" + count;
+        draw(current, trace.k[frame]);
+    }
+
+    function pause() {
+        clearInterval(timer);
+        timer = null;
+        button.textContent = "▶";
+    }
+
+    function play() {
+        if (index >= count - 1) {
+            show(0);
+        }
+        button.textContent = "❚❚";
+        timer = setInterval(function () {
+            if (index < count - 1) {
+                show(index + 1);
+            } else if (config.repeat) {
+                show(0);
+            } else {
+                pause();
+            }
+        }, config.interval);
+    }
+
+    button.addEventListener("click", function () { if (timer === null) { play(); } else { pause(); } });
+    slider.addEventListener("input", function () { show(Number(slider.value)); });
+
+    if (count) {
+        show(0);
+    }
+})
@@ -0,0 +1,139 @@
+"""
+Module containing the function for exporting the visualization as a self-contained HTML page.
+
+The page doesn't contain any rendered images. It embeds the trace in its binary format (see Trace.to_bytes)
+and a small JavaScript player (player.js), which replays the operations and draws every frame into a canvas
+the same way as the Animation class. The size of the page therefore grows with the number of operations,
+not with the number of frames times the size of an image.
+"""
+
+import base64
+import json
+import os
+import uuid
+from typing import Tuple, List
+
+import matplotlib
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+
+from .animation import Animation
+from .trace import Trace, INFO_KEYS
+
+
+# vzory čárkování matplotlibu (násobky šířky čáry)
+_DASHES = {
+    "-": [], "solid": [],
+    "--": "lines.dashed_pattern", "dashed": "lines.dashed_pattern",
+    ":": "lines.dotted_pattern", "dotted": "lines.dotted_pattern",
+    "-.": "lines.dashdot_pattern", "dashdot": "lines.dashdot_pattern"
+}
+
+_TEMPLATE = """<div id="{id}" class="sortflow-player" style="display: inline-block; font-family: sans-serif;">
+<canvas></canvas>
+<div style="display: flex; align-items: center; gap: 8px;">
+<button type="button" style="width: 3em;">&#9654;</button>
+<input type="range" min="0" value="0" step="1" style="flex: 1;">
+<span></span>
+</div>
+<script>
+{script}(document.getElementById("{id}"), {config});
+</script>
+</div>"""
+
+
+def export_html(trace: Trace, animation: Animation, title: str, speed: int|float = 0.5, repeat: bool = True,
+                figsize: Tuple[float, float] | None = None, dpi: float | None = None, show_buffer: bool | None = None) -> str:
+    """
+    Creates an HTML page (a fragment which can be embedded into another page or shown in a notebook)
+    with a player of the trace. The player has a play/pause button and a slider for seeking.
+
+    Params:
+        trace - the trace of the sorting algorithm
+        animation - the Animation object with the style
+        title - the title of the animation
+        speed - delay between frames in seconds
+        repeat - if the animation should repeat
+        figsize - size of the player (in inches, like the figure size)
+        dpi - resolution of the player, default is the figure's dpi
+        show_buffer - if the auxiliary buffer should be shown below the data, default is if the trace uses it
+
+    Returns:
+        str - the HTML code
+    """
+    animation._check_anim_values(trace, title, speed, repeat, figsize)
+    animation._compile_colors()
+
+    if figsize is None:
+        figsize = tuple(matplotlib.rcParams["figure.figsize"])
+    if dpi is None:
+        dpi = matplotlib.rcParams["figure.dpi"]
+    if show_buffer is None:
+        show_buffer = trace.uses_buffer()
+
+    # rozložení a rozsahy os se zjistí ze stejné scény, jakou kreslí Animation
+    fig = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(fig)
+    first = trace[0]
+    fig_axes, bar_axes = animation._setup_figure(fig, title, len(first["data"]))
+    buffer_axes = animation._setup_buffer(fig, bar_axes) if show_buffer else None
+    animation._create_scene(fig_axes, bar_axes, first, buffer_axes)
+
+    style = animation.style
+    config = {
+        "title": title,
+        "interval": speed * 1000,
+        "repeat": repeat,
+        "width": fig.bbox.width,
+        "height": fig.bbox.height,
+        "dpi": dpi,
+        "fontSize": matplotlib.rcParams["font.size"],
+        "barAxes": list(bar_axes.bbox.bounds),
+        "bufferAxes": list(buffer_axes.bbox.bounds) if buffer_axes is not None else None,
+        "xlim": list(bar_axes.get_xlim()),
+        "ylim": list(bar_axes.get_ylim()),
+        "columns": animation._pixel_columns(bar_axes, len(first["data"])),
+        "infoKeys": list(INFO_KEYS),
+        "style": {
+            "face": [_css(color) for color in animation._face_rgba],
+            "edge": [_css(color) for color in animation._edge_rgba],
+            "edgeWidth": style["edge_width"],
+            "background": _css(style["background_color"]),
+            "bounds": _css(style["bounds_color"]),
+            "pivot": _css(style["pivot_color"]),
+            "pivotWidth": style["pivot_width"],
+            "pivotDashes": _dashes(style["pivot_style"]),
+            "line": _css(style["line_color"]),
+            "lineWidth": style["line_width"],
+            "lineDashes": _dashes(style["line_style"]),
+            "text": _css(style["text_color"])
+        },
+        "trace": base64.b64encode(trace.to_bytes()).decode("ascii")
+    }
+
+    with open(os.path.join(os.path.dirname(__file__), "player.js")) as f:
+        script = f.read().strip()
+
+    # "</" by v JSON uvnitř <script> mohlo ukončit skript
+    return _TEMPLATE.format(id="sortflow-" + uuid.uuid4().hex, script=script,
+                            config=json.dumps(config).replace("</", "<\\/"))
+
+
+def _css(color: any) -> str:
+    """
+    Converts a matplotlib color to a CSS color.
+    """
+    r, g, b, a = to_rgba(color)
+    return "rgba({}, {}, {}, {})".format(round(r * 255), round(g * 255), round(b * 255), a)
+
+
+def _dashes(line_style: str) -> List[float]:
+    """
+    Returns the dash pattern of a matplotlib line style as multiples of the line width.
+    """
+    pattern = _DASHES.get(line_style, [])
+    if isinstance(pattern, str):
+        pattern = list(matplotlib.rcParams[pattern])
+
+    return pattern
@@ -0,0 +1,248 @@
+"""
+Module containing the Profiler class, which measures the stages of creating an animation.
+
+The library marks its stages by the `stage` function (e.g. "trace" for running the algorithm, "artists"
+for creating the artists of a frame, "draw" for drawing the figure). When no profiler is active, `stage`
+returns a shared empty context manager, so the marks cost only a function call.
+
+Stages:
+- cache - looking up the trace in the cache
+- trace - running the sorting algorithm and recording its trace
+- check - checking the values of the animation
+- decimate - leaving out frames over the frame budget
+- setup - creating the figure and its axes
+- frames - rebuilding frame dicts from the trace
+- artists - creating the artists of a frame ("artist" engine)
+- update - updating the artists to show a frame ("func" engine, export)
+- draw - drawing the figure by matplotlib
+- save - saving a rendered frame to a file (export)
+- write - writing the frames through a movie writer (export)
+- export - the whole export
+
+Stages of the frames rendered in other processes (export with more workers) aren't measured. Drawing is measured
+only for figures created while a profiler is active (see animation.ProfiledFigure).
+"""
+
+import contextlib
+import threading
+import time
+import tracemalloc
+from typing import List, Dict, Callable, Iterable, Iterator
+
+
+# profiler, do kterého se právě zaznamenává (None = profilování je vypnuté)
+_active = None
+
+
+class Profiler():
+    """
+    A context manager measuring the stages of the library while it's active. For every stage it records
+    the wall time, the number of calls, the number of frames and artists created, and optionally the peak memory.
+
+        with Profiler(memory=True) as profiler:
+            anim = sort.animate()
+            anim.save("sort.gif")
+        print(profiler.report())
+
+    Attributes:
+        memory - whether the peak memory is measured (by tracemalloc, which slows everything down)
+        stages - a dict with the results of every stage, each a dict with the keys time, calls, frames,
+                 artists and peak_memory (in bytes, None if the memory isn't measured)
+        callbacks - functions called after every finished stage
+
+    Methods:
+        add_callback - adds a function called after every finished stage
+        report - returns the results as a text table
+    """
+
+
+    def __init__(self, memory: bool = False, callbacks: Iterable[Callable[[Dict[str, any]], None]] = ()) -> None:
+        """
+        Params:
+            memory - whether the peak memory of the stages should be measured
+            callbacks - functions called after every finished stage with a dict with the keys stage, time,
+                        frames, artists and peak_memory (the values of this one call), e.g. for sending metrics
+        """
+        self.memory = memory
+        self.stages: Dict[str, Dict[str, any]] = {}
+        self.callbacks = list(callbacks)
+
+        self._previous = None
+        self._open: List[_Stage] = []
+        self._started_tracing = False
+        self._lock = threading.Lock()
+
+
+    def __enter__(self) -> "Profiler":
+        global _active
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        self._previous = _active
+        _active = self
+
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        global _active
+
+        _active = self._previous
+        self._previous = None
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+    def add_callback(self, callback: Callable[[Dict[str, any]], None]) -> None:
+        """
+        Adds a function called after every finished stage (see the `callbacks` param of the constructor).
+        """
+        self.callbacks.append(callback)
+
+
+    def report(self) -> str:
+        """
+        Returns the results of the stages as a text table, the slowest stage first.
+        """
+        lines = ["{:<10} {:>8} {:>10} {:>10} {:>9} {:>9} {:>10}".format("stage", "calls", "total [s]", "mean [ms]",
+                                                                       "frames", "artists", "peak [MB]")]
+
+        for name, result in sorted(self.stages.items(), key=lambda item: -item[1]["time"]):
+            peak = "-" if result["peak_memory"] is None else "{:.1f}".format(result["peak_memory"] / 2**20)
+            lines.append("{:<10} {:>8} {:>10.4f} {:>10.3f} {:>9} {:>9} {:>10}".format(name, result["calls"], result["time"],
+                                                                                   1000 * result["time"] / result["calls"],
+                                                                                   result["frames"], result["artists"], peak))
+
+        return "\n".join(lines)
+
+
+    def _finish(self, name: str, elapsed: float, frames: int, artists: int, peak: int | None) -> None:
+        """
+        Adds one finished call of a stage to the results and calls the callbacks.
+        """
+        with self._lock:
+            result = self.stages.get(name)
+            if result is None:
+                result = self.stages[name] = {"time": 0.0, "calls": 0, "frames": 0, "artists": 0, "peak_memory": None}
+
+            result["time"] += elapsed
+            result["calls"] += 1
+            result["frames"] += frames
+            result["artists"] += artists
+            if peak is not None:
+                result["peak_memory"] = max(peak, result["peak_memory"] or 0)
+
+        event = {"stage": name, "time": elapsed, "frames": frames, "artists": artists, "peak_memory": peak}
+        for callback in self.callbacks:
+            callback(event)
+
+
+
+class _Stage():
+    """
+    One call of a stage, a context manager measuring it.
+    """
+
+
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.frames = 0
+        self.artists = 0
+        self._base = None
+        self._peak = 0
+
+
+    def __enter__(self) -> "_Stage":
+        profiler = self.profiler
+
+        if profiler.memory and tracemalloc.is_tracing():
+            # vrchol se nuluje pro každou fázi, vnější fáze si proto nejdřív převezme dosavadní vrchol
+            current, peak = tracemalloc.get_traced_memory()
+            if profiler._open:
+                outer = profiler._open[-1]
+                outer._peak = max(outer._peak, peak)
+            tracemalloc.reset_peak()
+            self._base = self._peak = current
+
+        profiler._open.append(self)
+        self._start = time.perf_counter()
+
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self._start
+        profiler = self.profiler
+
+        if profiler._open and profiler._open[-1] is self:
+            profiler._open.pop()
+
+        peak = None
+        if self._base is not None and tracemalloc.is_tracing():
+            self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+            peak = self._peak - self._base
+            if profiler._open:
+                outer = profiler._open[-1]
+                outer._peak = max(outer._peak, self._peak)
+
+        profiler._finish(self.name, elapsed, self.frames, self.artists, peak)
+
+
+
+_NO_STAGE = contextlib.nullcontext()
+
+
+def stage(name: str) -> contextlib.AbstractContextManager:
+    """
+    Returns a context manager measuring a stage of the active profiler (an empty one if no profiler is active).
+    """
+    if _active is None:
+        return _NO_STAGE
+    return _Stage(_active, name)
+
+
+def count(frames: int = 0, artists: int = 0) -> None:
+    """
+    Adds created frames and artists to the innermost running stage of the active profiler.
+    """
+    if _active is None or not _active._open:
+        return
+
+    current = _active._open[-1]
+    current.frames += frames
+    current.artists += artists
+
+
+def is_active() -> bool:
+    """
+    Returns whether a profiler is active.
+    """
+    return _active is not None
+
+
+def timed(name: str, frames: Iterable[dict]) -> Iterable[dict]:
+    """
+    Measures getting every frame from the iterable as a stage. When no profiler is active,
+    the iterable is returned unchanged.
+    """
+    if _active is None:
+        return frames
+    return _timed(name, frames)
+
+
+def _timed(name: str, frames: Iterable[dict]) -> Iterator[dict]:
+    iterator = iter(frames)
+    while True:
+        with stage(name):
+            frame = next(iterator, None)
+            if frame is not None:
+                count(frames=1)
+        if frame is None:
+            return
+        yield frame
+
@@ -0,0 +1,152 @@
+"""
+Module containing the race function, which shows several sorting algorithms side by side in one figure.
+
+All algorithms are drawn by one FuncAnimation with blitting, so there's only one figure and one timer
+no matter how many algorithms race. The algorithms advance in lockstep, either by the iteration number k
+(an algorithm which needs fewer comparisons finishes sooner) or by the frame index (an algorithm
+with fewer frames finishes sooner, regardless of how many operations its frames contain).
+"""
+
+import math
+from typing import List, Tuple, Literal, Iterator, Sequence
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from matplotlib.artist import Artist
+from matplotlib.figure import Figure
+
+from .sort import Sort
+from .trace import Trace
+from .animation import ProfiledFigure
+from . import profiling
+
+
+def race(sorts: Sequence[Sort], speed: int|float = 0.5, repeat: bool = True, figsize: Tuple[float, float] | None = None,
+         sync: Literal["k", "step"] = "k", max_frames: int | None = None, duration: int|float | None = None,
+         columns: int | None = None) -> FuncAnimation:
+    """
+    Creates one animation of several sorting algorithms, each in its own part of one figure.
+
+    Params:
+        sorts - the sorting algorithms with their data (e.g. the same data sorted by different algorithms)
+        speed - delay between frames in seconds
+        repeat - if the animation should repeat
+        figsize - figure size (in inches), by default it grows with the number of algorithms
+        sync - "k" shows in every frame the state of all algorithms after the same number of comparisons,
+               "step" shows the frames with the same frame index of all algorithms (not the same number
+               of operations, a frame can contain several), a finished algorithm stays on its last frame
+        max_frames - maximum number of frames of the animation, the frames are spread evenly over the race
+        duration - maximum duration of the animation in seconds, it limits the number of frames like max_frames
+        columns - number of algorithms in one row, by default the algorithms are laid out in a square grid
+
+    Returns:
+        FuncAnimation - the animation
+    """
+    sorts = list(sorts)
+    if not sorts:
+        raise ValueError("At least one sorting algorithm is needed")
+    for sort in sorts:
+        if not isinstance(sort, Sort):
+            raise TypeError("Every algorithm must be an instance of Sort")
+    if sync != "k" and sync != "step":
+        raise ValueError("Sync must be either 'k' or 'step'")
+    if columns is None:
+        columns = math.ceil(math.sqrt(len(sorts)))
+    elif not isinstance(columns, int):
+        raise TypeError("Number of columns must be an integer")
+    elif columns < 1:
+        raise ValueError("Number of columns must be positive")
+
+    rows = math.ceil(len(sorts) / columns)
+    if figsize is None:
+        figsize = (4.8 * min(columns, len(sorts)), 3.6 * rows)
+
+    traces = [sort.trace() for sort in sorts]
+    for sort, trace in zip(sorts, traces):
+        sort._animation._check_anim_values(trace, sort.get_title(), speed, repeat, figsize)
+        sort._animation._compile_colors()
+
+    budget = sorts[0]._animation.frame_budget(speed, max_frames, duration)
+    indexes = _lockstep(traces, sync, budget)
+
+    fig = plt.figure("Race", figsize, FigureClass=ProfiledFigure if profiling.is_active() else Figure)
+    updates = []
+    artists = []
+
+    for i, (sort, trace) in enumerate(zip(sorts, traces)):
+        width, height = 1 / min(columns, len(sorts)), 1 / rows
+        rect = ((i % columns) * width, 1 - (i // columns + 1) * height, width, height)
+
+        animation = sort._animation
+        first = trace[0]
+        fig_axes, bar_axes = animation._setup_figure(fig, sort.get_title(), len(first["data"]), rect)
+        buffer_axes = animation._setup_buffer(fig, bar_axes, rect) if trace.uses_buffer() else None
+        scene, update = animation._create_scene(fig_axes, bar_axes, first, buffer_axes)
+
+        artists += scene
+        updates.append(update)
+
+    # pozadí figury je podle stylu prvního algoritmu
+    fig.set_facecolor(sorts[0]._animation.style["background_color"])
+    max_ks = [trace.max_k() for trace in traces]
+
+    def frames() -> Iterator[List[dict]]:
+        sources = [_repeat_frames(trace, column) for trace, column in zip(traces, indexes.T)]
+        return zip(*sources)
+
+    def update(frame: List[dict]) -> List[Artist]:
+        for update_scene, single, max_k in zip(updates, frame, max_ks):
+            update_scene(single, max_k)
+        return artists
+
+    def init() -> List[Artist]:
+        return update([trace[0] for trace in traces])
+
+    return FuncAnimation(fig, update, frames, init_func=init, save_count=len(indexes), interval=speed * 1000,
+                         repeat=repeat, blit=True, cache_frame_data=False)
+
+
+def _lockstep(traces: List[Trace], sync: str, budget: int | None) -> np.ndarray:
+    """
+    Computes which frame of every trace is shown in every frame of the race.
+
+    Params:
+        traces - the traces of the algorithms
+        sync - "k" or "step" (see `race`)
+        budget - maximum number of frames, None for no limit
+
+    Returns:
+        np.ndarray - a 2D array, rows are the frames of the race and columns the frame indexes of the traces
+                     (non-decreasing in every column)
+    """
+    if sync == "k":
+        # časová osa jsou všechna čísla iterací, u kterých některý algoritmus má snímek
+        timeline = np.unique(np.concatenate([np.frombuffer(trace._k, dtype=np.int64) for trace in traces]))
+    else:
+        timeline = np.arange(max(len(trace) for trace in traces))
+
+    if budget is not None and len(timeline) > budget:
+        timeline = timeline[np.linspace(0, len(timeline) - 1, budget).round().astype(np.intp)]
+
+    columns = []
+    for trace in traces:
+        if sync == "k":
+            # poslední snímek s k nejvýše rovným času (jako Trace.find_k)
+            column = np.searchsorted(np.frombuffer(trace._k, dtype=np.int64), timeline, side="right") - 1
+        else:
+            column = timeline
+        columns.append(np.clip(column, 0, len(trace) - 1))
+
+    return np.stack(columns, axis=1)
+
+
+def _repeat_frames(trace: Trace, indexes: np.ndarray) -> Iterator[dict]:
+    """
+    Yields the frames of the trace with the given non-decreasing indexes, a frame needed again is yielded
+    again without rebuilding it.
+    """
+    unique, counts = np.unique(indexes, return_counts=True)
+    for frame, count in zip(trace.select(unique.tolist()), counts.tolist()):
+        for _ in range(count):
+            yield frame
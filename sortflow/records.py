@@ -0,0 +1,199 @@
+"""
+Module containing the functions for sorting records (e.g. rows of a CSV file or a NumPy structured array)
+by key columns, and the IndexRecorder class, which keeps the permutation made by the sorting algorithm.
+
+The keys of all records are computed at once into a contiguous numeric array, which is sorted and shown
+in the animation instead of the records (see Sort.set_records). The records themselves are never moved
+by the algorithm, only their indexes are, so the width of a record doesn't slow the sorting down.
+"""
+
+import csv
+from typing import List, Dict, Callable, Iterable, Sequence
+
+import numpy as np
+
+from .trace import Recorder
+
+
+def read_csv(path: str) -> List[Dict[str, str]]:
+    """
+    Reads a CSV file with a header as a list of rows, each a dict of the columns.
+    """
+    with open(path, "r", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def record_keys(records: any, key: str | int | Sequence[str | int],
+                key_func: Callable[[np.ndarray], any] | Sequence[Callable[[np.ndarray], any] | None] | None = None) -> np.ndarray:
+    """
+    Computes the keys of the records as one numeric array. A single numeric key column is returned as it is,
+    otherwise the records are ranked by the key columns (the first column decides, the next ones break ties),
+    equal keys get the same rank. Columns of strings which aren't numbers are compared as strings.
+
+    Params:
+        records - a NumPy structured array, a 2D NumPy array, a list of rows (dicts or sequences, e.g. from
+                  the csv module), or any other object whose columns are given by `records[column]`
+        key - a column (a name or an index) or a list of columns
+        key_func - a function applied to a whole key column (a NumPy array) and returning the keys,
+                   or a list of functions (or None) for the key columns
+
+    Returns:
+        np.ndarray - the keys, one for every record
+    """
+    columns = list(key) if isinstance(key, (list, tuple)) else [key]
+    if not columns:
+        raise ValueError("At least one key column is needed")
+
+    if key_func is None or callable(key_func):
+        funcs = [key_func] * len(columns)
+    else:
+        funcs = list(key_func)
+        if len(funcs) != len(columns):
+            raise ValueError("There must be one key function for every key column")
+
+    keys = []
+    for column, func in zip(columns, funcs):
+        values = np.asarray(_column(records, column))
+        if func is not None:
+            values = np.asarray(func(values))
+        if values.ndim != 1 or len(values) != len(records):
+            raise ValueError("Key of the column '{}' must have one value for every record".format(column))
+        keys.append(_numeric(values))
+
+    if len(keys) == 1 and keys[0].dtype.kind in "biuf":
+        return np.ascontiguousarray(keys[0])
+
+    return _ranks(keys)
+
+
+def take(records: any, index: Iterable[int]) -> any:
+    """
+    Returns the records in the order given by the indexes, a list for a list of records.
+    """
+    if isinstance(records, list):
+        return [records[i] for i in index]
+
+    # pandas vybírá indexováním sloupce, řádky podle pozice vybírá iloc
+    if hasattr(records, "iloc"):
+        return records.iloc[np.asarray(index)]
+
+    return records[np.asarray(index)]
+
+
+def _column(records: any, column: str | int) -> any:
+    """
+    Returns the values of one column of the records.
+    """
+    if isinstance(records, np.ndarray):
+        if records.dtype.names is not None:
+            return records[records.dtype.names[column] if isinstance(column, int) else column]
+        if records.ndim != 2:
+            raise ValueError("Records must be a structured or a two-dimensional array")
+        return records[:, column]
+
+    if isinstance(records, list):
+        try:
+            return [row[column] for row in records]
+        except (KeyError, IndexError):
+            raise ValueError("Column '{}' isn't in all records".format(column)) from None
+
+    return records[column]
+
+
+def _numeric(values: np.ndarray) -> np.ndarray:
+    """
+    Returns the values as numbers if it's possible (e.g. numbers read from a CSV file as strings),
+    otherwise returns the values unchanged.
+    """
+    if values.dtype.kind == "b":
+        return values.astype(np.int64)
+    if values.dtype.kind in "iuf":
+        return values
+
+    try:
+        return values.astype(np.float64)
+    except (ValueError, TypeError):
+        return values
+
+
+def _ranks(keys: List[np.ndarray]) -> np.ndarray:
+    """
+    Returns the ranks of the records ordered by the keys (the first key decides), equal keys get the same rank.
+    """
+    # lexsort třídí podle posledního klíče, proto dostane klíče obráceně
+    order = np.lexsort(keys[::-1])
+    changed = np.zeros(len(order), dtype=bool)
+    for values in keys:
+        sorted_values = values[order]
+        changed[1:] |= sorted_values[1:] != sorted_values[:-1]
+
+    ranks = np.empty(len(order), dtype=np.int64)
+    ranks[order] = np.cumsum(changed)
+
+    return ranks
+
+
+
+class IndexRecorder(Recorder):
+    """
+    A recorder which keeps the permutation made by the sorting algorithm (see Sort.argsort). The elements
+    are moved together with their original indexes. The algorithm must write only values moved from
+    the buffer (by `write_from_buffer`), otherwise the permutation isn't known.
+
+    Attributes:
+        index - the original indexes of the elements, index[i] is the original index of the element on index i
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        super().__init__(data)
+        self.index = list(range(len(self.data)))
+        self._buffer_index = None
+
+
+    def swap(self, i: int, j: int) -> None:
+        super().swap(i, j)
+        index = self.index
+        index[i], index[j] = index[j], index[i]
+
+
+    def shift(self, i: int, j: int) -> None:
+        super().shift(i, j)
+        index = self.index
+        index[i], index[i+1:j+1] = index[j], index[i:j]
+
+
+    def write(self, i: int, value: int|float) -> None:
+        raise ValueError("The algorithm writes values which aren't moved from the buffer, its permutation isn't known")
+
+
+    def write_from_buffer(self, i: int, j: int) -> None:
+        source = self._buffer_index[j] if self._buffer_index is not None else None
+        if source is None:
+            raise ValueError("The algorithm writes a value which isn't from the data, its permutation isn't known")
+
+        self.data[i] = self.buffer[j]
+        self.index[i] = source
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        super().load_buffer(start, stop)
+        if self._buffer_index is None:
+            self._buffer_index = [None] * len(self.data)
+        self._buffer_index[start:stop] = self.index[start:stop]
+
+
+    def clear_buffer(self, start: int | None = None, stop: int | None = None) -> None:
+        super().clear_buffer(start, stop)
+        if self._buffer_index is None:
+            return
+        if start is None:
+            start, stop = 0, len(self._buffer_index)
+        self._buffer_index[start:stop] = [None] * (stop - start)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        super().write_buffer(i, value)
+        if self._buffer_index is None:
+            self._buffer_index = [None] * len(self.data)
+        self._buffer_index[i] = None
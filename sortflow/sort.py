@@ -1,22 +1,30 @@
 """
 Module containing the abstract parent class Sort.
+
+Matplotlib isn't imported with this module, the animation is loaded only when it's first needed
+(animating, exporting, or setting the style), so workers which only create traces or stats start fast.
 """
 
-from abc import ABC, abstractmethod
-from typing import List, Literal, Tuple, Generator, Dict
-from matplotlib.animation import ArtistAnimation
-from .animation import Animation
+from abc import ABC
+from typing import List, Literal, Tuple, Generator, Dict, Callable, Sequence, TYPE_CHECKING
+from .trace import Trace, Recorder, TraceRecorder, FrameRecorder, record_frames, keep_frames, _to_list
+from .stats import StatsRecorder
+from .cache import TraceCache, default_cache, trace_key
+from . import profiling
+from array import array
 import copy
+import time
+import warnings
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.animation import ArtistAnimation, FuncAnimation, AbstractMovieWriter
+    from .animation import Animation
+    from .live import LiveView
 
 
-def is_documented_by(original):
-  """
-  This decorator should copy a docstring.
-  """
-  def wrapper(target):
-    target.__doc__ = original.__doc__
-    return target
-  return wrapper
+# počet prvků kontrolovaných najednou
+CHECK_BLOCK = 2**20
 
 
 class Sort(ABC):
@@ -25,58 +33,158 @@ class Sort(ABC):
     Doesn't include any sorting algorithm. This needs to be implemented in an inhereting class.
 
     Attributes:
-        data - list of numbers (int/float) to sort
+        data - list or NumPy array (possibly memory-mapped) of numbers (int/float) to sort,
+               the keys of the records when sorting records
+        records - the records sorted by their keys (see set_records), None when sorting only the data
         order - desired order of the sorted list (ascending/descending)
         style - the style of the animation (i.e. bar colors)
+        cache - the cache of traces (shared by default), None if traces aren't cached
+        VERSION - version of the algorithm, it must be increased when the algorithm's frames change
+                  (cached traces of other versions aren't used)
+        NOT_TRACED - names of the attributes which don't change the trace, all other attributes of an instance
+                     (public or private) are options of the algorithm in the cache key
     
     Methods:
         set_data - sets the data
+        set_records - sets records to be sorted by key columns
         set_order - sets the order
         set_style - sets the animation's style
+        set_cache - sets the cache of traces
         get_title - get the title of the sorting algorithm
+        trace - runs the sorting algorithm and returns its trace
+        run_stats - runs the sorting algorithm without any frames and returns operation counters
+        argsort - runs the sorting algorithm and returns the permutation of the data
+        sorted_records - returns the records in the sorted order
         animate - returns a visualisation animation of the sorting algorithm
+        live - shows the sorting algorithm while it's running
+        export - renders the visualisation to a file, possibly in several processes
+        to_html - returns the visualisation as an HTML page with a JavaScript player
+    
+    A sorting algorithm is implemented either by the `_record` method (preferred, see its documentation),
+    or by the `_sort_next` generator returning frame dicts.
     """
 
+    VERSION = 1
+    NOT_TRACED = frozenset(("data", "records", "order", "style", "cache", "_anim", "_order_int", "_key_label"))
 
-    def __init__(self, data: List[int|float] | str | None = None, order: Literal["ascending", "descending"] = "ascending", style: dict | None = None) -> None:
+
+    def __init__(self, data: List[int|float] | np.ndarray | str | None = None, order: Literal["ascending", "descending"] = "ascending", style: dict | None = None) -> None:
         """
         Params:
-            data - list of numbers to sort or a path to a file
+            data - list or array of numbers to sort or a path to a file (see set_data)
             order - desired order of the sorted list, either "ascending" or "descending" (default ascending)
             style - a dict containing the style of the animation, see the set_style method
         """
         super().__init__()
+
+        if not self._uses_record() and type(self)._sort_next is Sort._sort_next:
+            raise TypeError("Can't instantiate {}, a sorting algorithm must implement either _record or _sort_next"
+                            .format(type(self).__name__))
         
+        self.records = None
+        self._key_label = None
         if data is not None:
             self.set_data(data)
         else:
             self.data = None
         
         self.set_order(order)
+        self.cache = default_cache
 
-        self._animation = Animation()
+        self._anim = None
         if style is not None:
-            self._animation.set_style(style)
-        self.style = self._animation.style
+            self.set_style(style)
+
+
+    @property
+    def style(self) -> Dict[str, any]:
+        """
+        The style of the animation (see set_style).
+        """
+        return self._animation.style
+
+
+    @property
+    def _animation(self) -> "Animation":
+        """
+        The Animation object, it's created (and matplotlib imported) when it's first needed.
+        """
+        if self._anim is None:
+            from .animation import Animation
+            self._anim = Animation()
+
+        return self._anim
     
 
-    def set_data(self, data: List[int|float] | str) -> None:
+    def set_data(self, data: List[int|float] | np.ndarray | str, dtype: str | np.dtype | None = None) -> None:
         """
-        Sets the data to be sorted. Data can be either in form of a list of numbers, or a string with a path
-        to a file with the data. Data saved in a file should be valid float numbers divided by whitespace.
+        Sets the data to be sorted. Data can be in form of a list of numbers, a NumPy array (or any other
+        one-dimensional array-like of numbers), or a string with a path to a file with the data.
+
+        Files are read according to their type:
+        - .npy files are memory-mapped, so their values are read only when the algorithm runs
+        - if dtype is given (e.g. "float64" or "int32"), the file is memory-mapped as raw binary data of that type
+        - otherwise the file is a text file with valid float numbers divided by whitespace
+
+        Params:
+            data - the data or a path to a file
+            dtype - type of the values in a raw binary file
         """
-        if isinstance(data, list):
-            # data jsou v listu čísel
-            for i in data:
-                if not isinstance(i, (int, float)):
-                    raise TypeError("Data must be a list of numbers")
-            self.data = copy.copy(data)
-        elif isinstance(data, str):
+        if isinstance(data, str):
             # data jsou uložena v souboru
-            with open(data, "r") as f:
-                self.data = [float(x) for line in f for x in line.split()]
+            if dtype is not None:
+                values = np.memmap(data, dtype=dtype, mode="r")
+            elif data.lower().endswith(".npy"):
+                values = np.load(data, mmap_mode="r")
+            else:
+                values = _read_text(data)
+            self._check_values(values)
+            self.data = values
+        elif isinstance(data, list):
+            # seznam zůstane seznamem, jen se zkontroluje najednou
+            self._check_values(np.asarray(data))
+            self.data = copy.copy(data)
         else:
-            raise TypeError("Data must be either a string or a list of numbers")
+            values = np.asarray(data)
+            if values.ndim == 0:
+                raise TypeError("Data must be either a string or a list of numbers")
+            self._check_values(values)
+            self.data = values.copy() if isinstance(data, np.ndarray) and not isinstance(data, np.memmap) else values
+
+        self.records = None
+        self._key_label = None
+
+
+    def set_records(self, records: any, key: str | int | Sequence[str | int],
+                    key_func: Callable[[np.ndarray], any] | Sequence[Callable[[np.ndarray], any] | None] | None = None) -> None:
+        """
+        Sets records to be sorted by their keys. The keys of all records are computed at once into a numeric
+        array, which becomes the data: the algorithm sorts and the animation shows the keys. The records
+        aren't moved, their order is given by `argsort` and `sorted_records`.
+
+        A single numeric key column is used as it is. Otherwise (more columns, or strings which aren't numbers)
+        the keys are the ranks of the records ordered by the key columns, the first column decides.
+
+        Params:
+            records - a NumPy structured array, a 2D NumPy array, a list of rows (dicts or sequences, e.g. from
+                      the csv module), a path to a CSV file with a header, or any other object whose columns
+                      are given by `records[column]` (e.g. a pandas DataFrame)
+            key - a column (a name or an index) or a list of columns
+            key_func - a function applied to a whole key column (a NumPy array) and returning the keys, or a list
+                       of functions (or None) for the key columns, e.g. `np.char.lower` or `lambda c: -np.abs(c)`
+        """
+        from .records import read_csv, record_keys
+
+        if isinstance(records, str):
+            records = read_csv(records)
+        if len(records) == 0:
+            raise ValueError("Records must contain at least one record")
+
+        keys = record_keys(records, key, key_func)
+        self._check_values(keys)
+        self.data = keys
+        self.records = records
+        self._key_label = ", ".join(str(column) for column in (key if isinstance(key, (list, tuple)) else [key]))
 
 
     def set_order(self, order: Literal["ascending", "descending"]) -> None:
@@ -90,25 +198,185 @@ class Sort(ABC):
         self._order_int = (-1, 1)[self.order == "ascending"] # pro jednodušší porovnávání
     
 
-    @is_documented_by(Animation.set_style)
     def set_style(self, style: Dict[str, any]) -> None:
         """
-        If there's no docstring here, check the documentation in the Animation class.
+        Sets the style of the animation. Only correctly provided values will be changed.
+
+        Params:
+            style - a dict of style values
+        
+        This is the dict's structure:
+        {
+        face_colors: {
+            unsorted: (color),
+            compare: (color),
+            sorted: (color)
+        }, edge_colors: {
+            unsorted: (color),
+            compare: (color),
+            sorted: (color)
+        }, edge_width: (float),
+        background_color: (color),
+        bounds_color: (color),
+        pivot_color: (color),
+        pivot_width: (float),
+        pivot_style: (style),
+        line_color: (color),
+        line_width: (float),
+        line_style: (style),
+        text_color: (color)
+        }
+
+        Colors should be in a valid matplotlib color format. Style should be a valid matplotlib
+        line style, e.g. "dotted".
         """
-        # docstring by měl být stejný jako v Animation
+        # docstring by měl být stejný jako v Animation.set_style, Animation se ale kvůli rychlému importu
+        # nenačítá předem, proto ho nejde zkopírovat
         self._animation.set_style(style)
-        self.style = self._animation.style
     
 
+    def set_cache(self, cache: TraceCache | None) -> None:
+        """
+        Sets the cache of traces. Traces are cached by the algorithm, its version and options, the data
+        and the order, so changing the style or the speed of the animation doesn't run the algorithm again.
+        By default all instances share one cache kept in memory, None turns caching off.
+        """
+        if cache is not None and not isinstance(cache, TraceCache):
+            raise TypeError("Cache must be a TraceCache or None")
+        
+        self.cache = cache
+
+
     def get_title(self) -> str:
         """
         Get the title of the sorting algorithm.
         """
         name = self.__class__.__name__
+        if self._key_label is not None:
+            return f"{name[:-4]} Sort ({self.order} by {self._key_label})"
         return f"{name[:-4]} Sort ({self.order})"
 
     
-    def animate(self, speed: int|float = 0.5, repeat: bool = True, figsize: Tuple[float, float] | None = None) -> ArtistAnimation:
+    def trace(self) -> Trace:
+        """
+        Runs the sorting algorithm and returns its trace. The data of this instance are left unchanged.
+        If the same trace is in the cache, the algorithm doesn't run at all.
+
+        Returns:
+            Trace - the trace of the algorithm
+        """
+        self._check_data()
+
+        key = None
+        if self.cache is not None:
+            with profiling.stage("cache"):
+                key = self._cache_key()
+                trace = self.cache.get(key)
+            if trace is not None:
+                return trace
+
+        with profiling.stage("trace"):
+            if self._uses_record():
+                rec = TraceRecorder(self._shown_data())
+                for k in self._record(rec):
+                    rec.frame(k)
+                trace = rec.trace
+            else:
+                # algoritmus používá jen _sort_next, který mění self.data, proto se mu data podstrčí jako kopie
+                data = self.data
+                self.data = _to_list(data)
+                try:
+                    trace = Trace.from_frames(self._sort_next(), data)
+                finally:
+                    self.data = data
+            profiling.count(frames=len(trace))
+
+        if key is not None:
+            self.cache.put(key, trace)
+
+        return trace
+
+    
+    def run_stats(self) -> Dict[str, int|float]:
+        """
+        Runs the sorting algorithm without creating any frames and counts its operations. The data
+        of this instance are left unchanged.
+
+        Returns:
+            Dict[str, int|float] - a dict with these values:
+            - comparisons - number of comparisons (the same as k of the last frame)
+            - swaps - number of swaps
+            - shifts - number of shifts (an element moved to the left, the elements in between to the right)
+            - shifted - number of elements moved by the shifts
+            - writes - number of values written to the data
+            - buffer_writes - number of values written to the auxiliary buffer
+            - depth - maximum depth of nested bounds (the recursion depth of divide and conquer algorithms,
+                      the shrinking heap of heap sort is one level)
+            - frames - number of frames the animation would have
+            - time - wall time of the run in seconds
+        """
+        self._check_data()
+        rec = StatsRecorder(self._shown_data())
+        start = time.perf_counter()
+
+        if self._uses_record():
+            frames = k = 0
+            for k in self._record(rec):
+                frames += 1
+            rec.frames = frames
+            rec.k = k
+        else:
+            data = self.data
+            self.data = _to_list(data)
+            try:
+                record_frames(self._sort_next(), rec)
+            finally:
+                self.data = data
+
+        stats = rec.stats()
+        stats["time"] = time.perf_counter() - start
+
+        return stats
+
+    
+    def argsort(self) -> np.ndarray:
+        """
+        Runs the sorting algorithm without creating any frames and returns the permutation it made,
+        i.e. the indexes of the data (or of the records) in the sorted order. Only the indexes are moved
+        together with the data, the records aren't. The data of this instance are left unchanged.
+
+        Returns:
+            np.ndarray - the original indexes of the sorted elements
+        """
+        from .records import IndexRecorder
+
+        self._check_data()
+        if not self._uses_record():
+            raise TypeError("Argsort needs an algorithm implemented by the _record method")
+        
+        rec = IndexRecorder(self._shown_data())
+        for _ in self._record(rec):
+            pass
+
+        return np.array(rec.index, dtype=np.int64)
+
+
+    def sorted_records(self) -> any:
+        """
+        Returns the records (see set_records) in the order given by the sorting algorithm (see argsort),
+        a list for a list of records, otherwise the same type as the records.
+        """
+        from .records import take
+
+        if self.records is None:
+            raise ValueError("Records must be set")
+        
+        return take(self.records, self.argsort())
+
+    
+    def animate(self, speed: int|float = 0.5, repeat: bool = True, figsize: Tuple[float, float] | None = None,
+                engine: Literal["artist", "func"] = "artist", stream: bool = False, max_frames: int | None = None,
+                duration: int|float | None = None, show_buffer: bool | None = None) -> "ArtistAnimation | FuncAnimation":
         """
         Creates the visualization animation, as a bar graph.
         
@@ -116,25 +384,266 @@ class Sort(ABC):
             speed - delay between frames in seconds
             repeat - if the animation should repeat
             figsize - figure size (in inches)
+            engine - "artist" for ArtistAnimation, "func" for FuncAnimation which updates one set of artists
+                     (much less memory for large data)
+            stream - if True, frames are created only when the animation needs them, so the first frame is shown
+                     right away and the memory use doesn't grow with the number of frames (always uses the "func" engine)
+            max_frames - maximum number of frames, less important frames are left out (see Trace.decimate)
+            duration - maximum duration of the animation in seconds, limits the number of frames like max_frames
+            show_buffer - if the auxiliary buffer should be shown below the data, by default it's shown
+                          if the algorithm uses it
         
         Returns:
-            ArtistAnimation - the animation
+            ArtistAnimation | FuncAnimation - the animation
+        """
+        title = self.get_title()
+
+        if stream:
+            self._check_data()
+            budget = self._animation.frame_budget(speed, max_frames, duration)
+
+            # vybrané snímky a max k se zjistí levným průchodem bez ukládání snímků,
+            # u algoritmů implementovaných jen přes _sort_next se max k doplní po prvním přehrání
+            if self._uses_record():
+                keep, max_k, buffered = self._count_frames(budget)
+                frame_count = len(keep)
+            elif budget is not None:
+                raise ValueError("Max frames and duration of a streamed animation need an algorithm implemented by _record")
+            else:
+                keep, max_k, buffered, frame_count = None, None, False, None
+            frames = lambda: self._stream(keep)
+            if show_buffer is None:
+                show_buffer = buffered
+
+            return self._animation.create_anim(frames, title, speed, repeat, figsize, "func", max_k, frame_count, 
+                                               show_buffer=show_buffer, value_range=self._value_range())
+
+        trace = self.trace()
+
+        return self._animation.create_anim(trace, title, speed, repeat, figsize, engine, max_frames=max_frames, duration=duration,
+                                           show_buffer=show_buffer, value_range=self._value_range())
+
+
+    def live(self, fps: int|float = 20, step_delay: int|float = 0.0, figsize: Tuple[float, float] | None = None,
+             show_buffer: bool = False) -> "LiveView":
+        """
+        Shows the sorting algorithm while it's running. The algorithm runs in a background thread and the figure
+        shows its newest frame at most `fps` times per second (the frames in between are skipped), so the first
+        frames are shown right away and the kernel of a notebook stays responsive. Needs an interactive
+        matplotlib backend (e.g. `%matplotlib widget` in Jupyter).
+
+        Params:
+            fps - maximum number of figure updates per second
+            step_delay - delay after every frame of the algorithm in seconds, for watching fast algorithms
+            figsize - figure size (in inches)
+            show_buffer - if the auxiliary buffer should be shown below the data
+
+        Returns:
+            LiveView - the running view, it can be stopped by its `stop` method
+        """
+        from .live import LiveView
+        return LiveView(self, fps, step_delay, figsize, show_buffer).start()
+
+
+    def export(self, path: str, workers: int | None = 1, speed: int|float = 0.5, figsize: Tuple[float, float] | None = None, 
+               dpi: float | None = None, writer: "str | AbstractMovieWriter | None" = None, show_buffer: bool | None = None) -> None:
+        """
+        Renders the visualization to a file. The frames are split into chunks and every chunk is rendered
+        in its own process. The result is the same as saving the animation with the "func" engine.
+
+        Params:
+            path - a directory (existing, or ending with a path separator) for a sequence of PNG images,
+                   or a file name of a GIF/video
+            workers - number of rendering processes, None for the number of CPUs
+            speed - delay between frames in seconds
+            figsize - figure size (in inches)
+            dpi - resolution of the frames
+            writer - matplotlib's movie writer or its name (default "pillow" for GIFs, otherwise rcParams["animation.writer"])
+            show_buffer - if the auxiliary buffer should be shown below the data (default if the algorithm uses it)
+        """
+        from .export import export_trace
+        export_trace(self.trace(), path, self._animation, self.get_title(), workers, speed, figsize, dpi, writer, show_buffer,
+                     self._value_range())
+
+
+    def to_html(self, path: str | None = None, speed: int|float = 0.5, repeat: bool = True, 
+                figsize: Tuple[float, float] | None = None, dpi: float | None = None, max_frames: int | None = None,
+                duration: int|float | None = None, show_buffer: bool | None = None) -> str:
+        """
+        Creates the visualisation as an HTML page with a small JavaScript player, which draws the frames
+        in the browser from the embedded trace. Unlike `to_jshtml` of the animation, no images are embedded,
+        so the page is small and it's created quickly. In a notebook it can be shown by `IPython.display.HTML`.
+
+        Params:
+            path - a file the page should be saved to, None if it shouldn't be saved
+            speed - delay between frames in seconds
+            repeat - if the animation should repeat
+            figsize - size of the player (in inches, like the figure size)
+            dpi - resolution of the player
+            max_frames - maximum number of frames, less important frames are left out (see Trace.decimate)
+            duration - maximum duration of the animation in seconds, limits the number of frames like max_frames
+            show_buffer - if the auxiliary buffer should be shown below the data (default if the algorithm uses it)
+
+        Returns:
+            str - the HTML code of the page
+        """
+        from .player import export_html
+
+        trace = self.trace()
+        budget = self._animation.frame_budget(speed, max_frames, duration)
+        if budget is not None:
+            trace = trace.decimate(budget)
+
+        page = export_html(trace, self._animation, self.get_title(), speed, repeat, figsize, dpi, show_buffer)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(page)
+
+        return page
+
+
+    def _check_data(self) -> None:
+        """
+        Checks whether the data are set and not empty.
         """
         if self.data is None:
             raise ValueError("Sorting data must be set")
         elif len(self.data) == 0:
             raise ValueError("Sorting data must have at least one number")
+
+
+    def _check_values(self, values: np.ndarray) -> None:
+        """
+        Checks whether the array is one-dimensional and contains only finite numbers.
+        """
+        if values.dtype.kind not in "biuf":
+            raise TypeError("Data must be a list of numbers")
+        elif values.ndim != 1:
+            raise ValueError("Data must be one-dimensional")
+        elif values.dtype.kind == "f":
+            # po blocích, data namapovaná ze souboru se tak nenačtou do paměti celá
+            for start in range(0, len(values), CHECK_BLOCK):
+                if not np.isfinite(values[start:start+CHECK_BLOCK]).all():
+                    raise ValueError("Data must be finite numbers")
+
+
+    def _cache_key(self) -> str:
+        """
+        Returns the key of this algorithm's trace in the cache. Attributes of the instance other than those
+        in NOT_TRACED are taken as options of the algorithm (e.g. MergeSort.buffered).
+        """
+        options = {name: value for name, value in vars(self).items() if name not in self.NOT_TRACED}
         
-        frames = [copy.deepcopy(frame) for frame in self._sort_next()]
-        title = self.get_title()
+        return trace_key(type(self), self.VERSION, self.data, self.order, options)
+
+
+    def _count_frames(self, budget: int | None = None) -> Tuple[List[int], int, bool]:
+        """
+        Runs the algorithm without creating any frames and chooses the frames of a streamed animation,
+        the same ones as Trace.decimate would keep.
+
+        Params:
+            budget - the maximum number of frames, None for all frames
+
+        Returns:
+            Tuple[List[int], int, bool] - the indexes of the kept frames, the iteration number of the last frame
+                                          and whether the algorithm used the buffer
+        """
+        rec = FrameRecorder(self._shown_data())
+        structural = bytearray()
+        ks = array("q")
+
+        for k in self._record(rec):
+            rec.frame(k)
+            structural.append(rec.structural)
+            ks.append(k)
+            rec.structural = False
+        
+        keep = keep_frames(structural, ks, budget) if budget is not None else range(rec.frames)
+        return keep, rec.k, rec.buffer is not None
+
+
+    def _stream(self, keep: Sequence[int] | None = None) -> Generator[Dict[str, any], None, None]:
+        """
+        A generator creating frames on the fly, while the algorithm is running.
+
+        Params:
+            keep - increasing indexes of the frames which should be created (see _count_frames), None for all frames
+                   (only for algorithms implemented by `_record`)
+        """
+        if self._uses_record():
+            rec = FrameRecorder(self._shown_data())
+            wanted = iter(keep if keep is not None else ())
+            next_frame = next(wanted, None) if keep is not None else None
+
+            for k in self._record(rec):
+                rec.frame(k)
+                if keep is None or rec.frames - 1 == next_frame:
+                    yield rec.current()
+                    if keep is not None:
+                        next_frame = next(wanted, None)
+                        if next_frame is None:
+                            return
+        else:
+            data = self.data
+            self.data = _to_list(data)
+            try:
+                yield from self._sort_next()
+            finally:
+                self.data = data
+
+
+    def _shown_data(self) -> List[int|float] | np.ndarray:
+        """
+        Returns the data the recorder of the algorithm starts with, i.e. the data shown in the animation.
+        It's the data to be sorted, algorithms which don't show every element (e.g. ExternalMergeSort) return
+        only the shown values.
+        """
+        return self.data
 
-        return self._animation.create_anim(frames, title, speed, repeat, figsize)
+
+    def _value_range(self) -> Tuple[float, float] | None:
+        """
+        Returns the smallest and the largest value the animation has to fit, None if the shown data (see _shown_data)
+        contain all values.
+        """
+        return None
+
+
+    def _uses_record(self) -> bool:
+        """
+        Returns whether the algorithm is implemented by the `_record` method.
+        """
+        return type(self)._record is not Sort._record
+
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        """
+        A generator function implementing the sorting algorithm on `rec.data`. Every change of the data and
+        of the shown values is made through the recorder `rec`:
+        - rec.compare(i, j) - sets the currently compared indexes (no arguments clear them)
+        - rec.swap(i, j), rec.shift(i, j), rec.write(i, value) - change the data
+        - rec.write_from_buffer(i, j) - writes buffer[j] to data[i] (values moved from the buffer should be written
+          by it, so that the permutation of the data is known, see argsort)
+        - rec.pivot(value) - sets the pivot (no arguments clear it)
+        - rec.bounds(left, right) - sets the bounds of currently processed data (no arguments clear them)
+        - rec.correct(start, stop) - marks the indexes [start, stop) as correctly sorted
+        - rec.load_buffer(start, stop), rec.write_buffer(i, value), rec.clear_buffer(start, stop) - change
+          the auxiliary buffer `rec.buffer`, which is shown below the data (e.g. for merging)
+        - rec.info(key, value) - sets an informational value shown with the frame (heap, gap, runs, digit, bucket)
+
+        `rec.data` is a copy of the data returned by `_shown_data` (by default all the data).
+        
+        The generator yields the iteration number k (how many comparisons have been made) every time
+        a new frame should be shown. The values set through the recorder stay the same until they're changed.
+        """
+        raise NotImplementedError("Sorting algorithm must implement either _record or _sort_next")
 
     
-    @abstractmethod
     def _sort_next(self) -> Generator[Dict[str, any], None, None]:
         """
         A generator function returning a dict of values to be shown in each frame of the algorithm's animation.
+        Algorithms implemented by `_record` get these frames as a view over their trace.
         
         These are the possible values:
         - data* - a (partially) sorted list of data
@@ -143,7 +652,31 @@ class Sort(ABC):
         - correct - a list of indexes of correctly sorted elements
         - bounds - a 2-tuple with the left and right bounds of currently processed data
         - pivot - a number, exclusively for quicksort
+        - buffer - a list with the values of an auxiliary buffer (None for empty places), the same length as data
+        - heap, gap, runs, digit, bucket - non-negative integers shown as text (the end of the heap, the current gap,
+          the number of runs waiting for merging, the current digit and the bucket of the current element)
         
         *these are required, the other are optional
         """
-        pass
\ No newline at end of file
+        # bez _record by trace() volal zpět tuto metodu
+        if not self._uses_record():
+            raise NotImplementedError("Sorting algorithm must implement either _record or _sort_next")
+        
+        yield from self.trace()
+
+
+
+def _read_text(path: str) -> np.ndarray:
+    """
+    Reads numbers divided by whitespace from a text file at once (without a list of strings per number).
+    """
+    with open(path, "r") as f:
+        text = f.read()
+
+    # starší NumPy při nečíselném textu jen varuje a vrátí čísla přečtená do té doby
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        try:
+            return np.fromstring(text, dtype=np.float64, sep=" ")
+        except (ValueError, DeprecationWarning):
+            raise ValueError("File '{}' must contain only numbers divided by whitespace".format(path)) from None
@@ -8,10 +8,25 @@ Classes:
 - SelectSort
 - QuickSort
 - MergeSort
+- HeapSort
+- ShellSort
+- IntroSort
+- TimSort
+- RadixSort
+- ExternalMergeSort
 """
 
-from .sort import Sort
-from typing import Generator, List
+from .sort import Sort, CHECK_BLOCK
+from .trace import Recorder
+from typing import List, Tuple, Literal, Generator, BinaryIO
+from array import array
+import contextlib
+import heapq
+import itertools
+import math
+import os
+import tempfile
+import numpy as np
 
 
 class BubbleSort(Sort):
@@ -19,10 +34,11 @@ class BubbleSort(Sort):
     This class implements an optimised bubble sort algorithm.
     """
 
-    def _sort_next(self):
-        yield {"data": self.data, "k": 0}
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        yield 0
         
-        n = len(self.data)
+        n = len(data)
         right = n
         k = 0
         
@@ -31,15 +47,18 @@ class BubbleSort(Sort):
 
             for i in range(right-1):
                 k += 1
-                yield {"data": self.data, "compare": (i, i+1), "correct": list(range(right, n)), "k": k}
+                rec.compare(i, i+1)
+                yield k
 
-                if self._order_int * (self.data[i] - self.data[i+1]) > 0:
-                    self.data[i], self.data[i+1] = self.data[i+1], self.data[i]
+                if self._order_int * (data[i] - data[i+1]) > 0:
+                    rec.swap(i, i+1)
                     last_change = i
-                    yield {"data": self.data, "compare": (i, i+1), "correct": list(range(right, n)), "k": k}
+                    yield k
             
             right = 0 if (last_change == 0) else (last_change + 1)
-            yield {"data": self.data, "correct": list(range(right, n)), "k": k}
+            rec.compare()
+            rec.correct(right, n)
+            yield k
 
 
 
@@ -48,26 +67,31 @@ class InsertSort(Sort):
     This class implements a linear insertion sort algorithm.
     """
 
-    def _sort_next(self):
-        n = len(self.data)
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        n = len(data)
         k = 0
 
         for i in range(1, n):
-            yield {"data": self.data, "k": k, "correct": list(range(i))}
-            moved = 0
+            rec.compare()
+            rec.correct(0, i)
+            yield k
 
             for j in range(i, 0, -1):
                 k += 1
-                yield {"data": self.data, "k": k, "compare": (j-1, j), "correct": list(range(i + moved))}
+                rec.compare(j-1, j)
+                yield k
 
-                if self._order_int * (self.data[j-1] - self.data[j]) > 0:
-                    self.data[j], self.data[j-1] = self.data[j-1], self.data[j]
-                    moved = 1
-                    yield {"data": self.data, "k": k, "compare": (j-1, j), "correct": list(range(i + moved))}
+                if self._order_int * (data[j-1] - data[j]) > 0:
+                    rec.swap(j, j-1)
+                    rec.correct(0, i+1)
+                    yield k
                 else:
                     break
         
-        yield {"data": self.data, "k": k, "correct": list(range(n))}
+        rec.compare()
+        rec.correct(0, n)
+        yield k
 
 
 
@@ -76,10 +100,11 @@ class SelectSort(Sort):
     This class implements a selection sort algorithm.
     """
 
-    def _sort_next(self):
-        yield {"data": self.data, "k": 0}
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        yield 0
 
-        n = len(self.data)
+        n = len(data)
         k = 0
 
         for i in range(n-1):
@@ -87,16 +112,20 @@ class SelectSort(Sort):
             
             for j in range(i+1, n):
                 k += 1
-                yield {"data": self.data, "k": k, "compare": (index, j), "correct": list(range(i))}
+                rec.compare(index, j)
+                yield k
 
-                if self._order_int * (self.data[index] - self.data[j]) > 0:
+                if self._order_int * (data[index] - data[j]) > 0:
                     index = j
             
             if index != i:
-                self.data[i], self.data[index] = self.data[index], self.data[i]
-                yield {"data": self.data, "k": k, "compare": (index, i), "correct": list(range(i))}
+                rec.swap(i, index)
+                rec.compare(index, i)
+                yield k
             
-            yield {"data": self.data, "k": k, "correct": list(range(i+1 if i != n-2 else n))}
+            rec.compare()
+            rec.correct(0, i+1 if i != n-2 else n)
+            yield k
 
 
 
@@ -106,81 +135,965 @@ class QuickSort(Sort):
     as the average of the first and the last element.
     """
 
-    def _sort_next(self, left: int = 0, right: int|None = None, k: int = 0, correct: List[int] = []):
-        if right is None:
-            right = len(self.data) - 1
-        elif left == right:
-            correct.append(left)
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        if len(data) == 1:
+            rec.correct(0)
+            yield 0
             return
 
-        pivot = (self.data[left] + self.data[right]) / 2
-        l, r = left, right
-        
-        yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct}
-        yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct, "pivot": pivot}
+        k = 0
+        # zásobník úseků (left, right, done), done značí úsek, jehož obě poloviny už jsou seřazené
+        stack = [(0, len(data) - 1, False)]
 
-        while l < r:
-            k += 1
-            yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct, "pivot": pivot, "compare": (l, r)}
-            
-            if self._order_int * (self.data[l] - pivot) > 0 and self._order_int * (pivot - self.data[r]) > 0:
-                self.data[l], self.data[r] = self.data[r], self.data[l]
-                yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct, "pivot": pivot, "compare": (l, r)}
+        while stack:
+            left, right, done = stack.pop()
+
+            if done:
+                rec.compare()
+                rec.pivot()
+                rec.bounds(left, right)
+                yield k
+                continue
+
+            if left == right:
+                rec.correct(left)
+                continue
+
+            pivot = (data[left] + data[right]) / 2
+            l, r = left, right
             
-            if self._order_int * (self.data[l] - pivot) <= 0:
-                l += 1
-            if self._order_int * (pivot - self.data[r]) <= 0:
-                r -= 1
-
-        m = r - int(r >= l and self._order_int * (self.data[l] - pivot) > 0)
-
-        for frame in self._sort_next(left, m, k, correct):
-            k = frame["k"]
-            yield frame
-        for frame in self._sort_next(m+1, right, k, correct):
-            k = frame["k"]
-            yield frame
-        
-        yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct}
+            rec.compare()
+            rec.pivot()
+            rec.bounds(left, right)
+            yield k
+            rec.pivot(pivot)
+            yield k
+
+            while l < r:
+                k += 1
+                rec.compare(l, r)
+                yield k
+                
+                if self._order_int * (data[l] - pivot) > 0 and self._order_int * (pivot - data[r]) > 0:
+                    rec.swap(l, r)
+                    yield k
+                
+                if self._order_int * (data[l] - pivot) <= 0:
+                    l += 1
+                if self._order_int * (pivot - data[r]) <= 0:
+                    r -= 1
+
+            m = r - int(r >= l and self._order_int * (data[l] - pivot) > 0)
+
+            # levá polovina se zpracuje první, proto jde na zásobník poslední
+            stack.append((left, right, True))
+            stack.append((m+1, right, False))
+            stack.append((left, m, False))
 
 
 
 class MergeSort(Sort):
     """
-    This class implements a recursive merge sort algorithm.
+    This class implements a merge sort algorithm (top-down, with an explicit stack instead of recursion).
+    Halves are merged either in place (shifting the elements, O(n^2) in the worst case), or through
+    an auxiliary buffer, from which the values are written back to the data (O(n log n)).
+
+    Attributes:
+        buffered - whether the halves are merged through the auxiliary buffer
     """
 
-    def _sort_next(self, left: int = 0, right: int|None = None, k: int = 0, correct: List[int] = []):
-        if right is None:
-            right = len(self.data) - 1
-        elif left == right:
-            correct.append(left)
+    def __init__(self, data: List[int|float] | str | None = None, order: Literal["ascending", "descending"] = "ascending", 
+                 style: dict | None = None, buffered: bool = False) -> None:
+        """
+        Params:
+            data - list or array of numbers to sort or a path to a file (see set_data)
+            order - desired order of the sorted list, either "ascending" or "descending" (default ascending)
+            style - a dict containing the style of the animation, see the set_style method
+            buffered - if True, the halves are merged through an auxiliary buffer instead of in place
+        """
+        super().__init__(data, order, style)
+
+        if not isinstance(buffered, bool):
+            raise TypeError("Buffered must be a boolean")
+        self.buffered = buffered
+
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        if len(data) == 1:
+            rec.correct(0)
+            yield 0
             return
-        
-        yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct}
 
-        m = (left + right) // 2
+        k = 0
+        # zásobník úseků (left, right, done), done značí úsek, jehož obě poloviny už jsou seřazené
+        stack = [(0, len(data) - 1, False)]
+
+        while stack:
+            left, right, done = stack.pop()
+            m = (left + right) // 2
+
+            if not done:
+                if left == right:
+                    rec.correct(left)
+                    continue
 
-        for frame in self._sort_next(left, m, k):
-            k = frame["k"]
-            yield frame
-        for frame in self._sort_next(m+1, right, k):
-            k = frame["k"]
-            yield frame
+                rec.compare()
+                rec.bounds(left, right)
+                yield k
 
+                stack.append((left, right, True))
+                stack.append((m+1, right, False))
+                stack.append((left, m, False))
+                continue
+
+            rec.bounds(left, right)
+            if self.buffered:
+                k = yield from _merge_buffered(rec, self._order_int, left, m, right, k)
+            else:
+                k = yield from self._merge_in_place(rec, left, m, right, k)
+            
+            rec.compare()
+            yield k
+
+
+    def _merge_in_place(self, rec: Recorder, left: int, m: int, right: int, k: int) -> Generator[int, None, int]:
+        """
+        Merges the sorted halves left..m and m+1..right by shifting the elements, returns the new iteration number.
+        """
+        data = rec.data
         i, j = left, m+1
 
-        # in place merge
         while i <= m and j <= right:
             k += 1
-            yield {"data": self.data, "k": k, "bounds": (left, right), "compare": (i, j), "correct": correct}
+            rec.compare(i, j)
+            yield k
 
-            if self._order_int * (self.data[i] - self.data[j]) > 0:
-                self.data[i], self.data[i+1:j+1] = self.data[j], self.data[i:j]
-                yield {"data": self.data, "k": k, "bounds": (left, right), "compare": (i, j), "correct": correct}
+            if self._order_int * (data[i] - data[j]) > 0:
+                rec.shift(i, j)
+                yield k
                 m += 1
                 j += 1
             
             i += 1
+
+        return k
+
+
+
+
+class HeapSort(Sort):
+    """
+    This class implements a heap sort algorithm. The heap is shown as the bounds and its end
+    as the "heap" value of the frames.
+    """
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        yield 0
+
+        k = yield from _heap_sort(rec, self._order_int, 0, len(rec.data) - 1, 0)
+        
+        rec.bounds()
+        yield k
+
+
+
+class ShellSort(Sort):
+    """
+    This class implements a shell sort algorithm, an insertion sort of elements with a decreasing gap.
+    The current gap is shown as the "gap" value of the frames.
+
+    Attributes:
+        gaps - the gap sequence, "ciura" (default), "knuth" (1, 4, 13, 40, ...) or "shell" (n/2, n/4, ..., 1)
+    """
+
+    # Ciurova posloupnost, dál se prodlužuje násobením 2.25
+    CIURA_GAPS = [1, 4, 10, 23, 57, 132, 301, 701, 1750]
+
+    def __init__(self, data: List[int|float] | str | None = None, order: Literal["ascending", "descending"] = "ascending", 
+                 style: dict | None = None, gaps: Literal["ciura", "knuth", "shell"] = "ciura") -> None:
+        """
+        Params:
+            data - list or array of numbers to sort or a path to a file (see set_data)
+            order - desired order of the sorted list, either "ascending" or "descending" (default ascending)
+            style - a dict containing the style of the animation, see the set_style method
+            gaps - the gap sequence, either "ciura", "knuth" or "shell"
+        """
+        super().__init__(data, order, style)
+
+        if gaps not in ("ciura", "knuth", "shell"):
+            raise ValueError("Gaps must be either 'ciura', 'knuth' or 'shell'")
+        self.gaps = gaps
+
+
+    def _gap_sequence(self, n: int) -> List[int]:
+        """
+        Returns the decreasing gaps used for n elements, the last one is 1.
+        """
+        if self.gaps == "shell":
+            gaps = []
+            gap = n // 2
+            while gap > 1:
+                gaps.append(gap)
+                gap //= 2
+            return gaps + [1]
+
+        if self.gaps == "knuth":
+            gaps = [1]
+            while gaps[-1] < n // 3:
+                gaps.append(3 * gaps[-1] + 1)
+        else:
+            gaps = list(self.CIURA_GAPS)
+            while gaps[-1] < n:
+                gaps.append(int(gaps[-1] * 2.25))
+
+        return [gap for gap in reversed(gaps) if gap < n] or [1]
+
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        n = len(rec.data)
+        k = 0
+        yield k
+
+        for gap in self._gap_sequence(n):
+            rec.info("gap", gap)
+            k = yield from _gap_insertion(rec, self._order_int, 0, n-1, gap, k)
+        
+        rec.info("gap")
+        rec.correct(0, n)
+        yield k
+
+
+
+class IntroSort(Sort):
+    """
+    This class implements an introsort algorithm: a quicksort with the median of three as the pivot,
+    which switches to heap sort when the partitioning goes too deep and to insertion sort for small ranges.
+    """
+
+    # úseky s nejvýše tolika prvky se třídí vkládáním
+    SMALL = 16
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        n = len(data)
+        order = self._order_int
+        k = 0
+        yield k
+
+        # zásobník úseků (left, right, depth), depth je zbývající hloubka dělení
+        stack = [(0, n-1, 2 * int(math.log2(n)))]
+
+        while stack:
+            left, right, depth = stack.pop()
+            if left > right:
+                continue
+            
+            rec.pivot()
+
+            if right - left < self.SMALL:
+                rec.bounds(left, right)
+                k = yield from _gap_insertion(rec, order, left, right, 1, k)
+                rec.correct(left, right+1)
+                yield k
+                continue
+
+            if depth == 0:
+                k = yield from _heap_sort(rec, order, left, right, k)
+                continue
+
+            rec.bounds(left, right)
+            k = yield from self._median_of_three(rec, left, right, k)
+            
+            # Lomutovo dělení s pivotem na konci úseku
+            pivot = data[right]
+            rec.pivot(pivot)
+            i = left
+
+            for j in range(left, right):
+                k += 1
+                rec.compare(j, right)
+                yield k
+
+                if order * (data[j] - pivot) < 0:
+                    if i != j:
+                        rec.swap(i, j)
+                        yield k
+                    i += 1
+            
+            rec.compare()
+            if i != right:
+                rec.swap(i, right)
+            rec.correct(i)
+            yield k
+
+            stack.append((i+1, right, depth-1))
+            stack.append((left, i-1, depth-1))
+        
+        rec.pivot()
+        rec.bounds()
+        yield k
+
+
+    def _median_of_three(self, rec: Recorder, left: int, right: int, k: int) -> Generator[int, None, int]:
+        """
+        Moves the median of the first, the middle and the last element to the end of the range,
+        returns the new iteration number.
+        """
+        data = rec.data
+        mid = (left + right) // 2
+
+        for i, j in ((left, mid), (mid, right), (left, mid)):
+            k += 1
+            rec.compare(i, j)
+            yield k
+
+            if self._order_int * (data[i] - data[j]) > 0:
+                rec.swap(i, j)
+                yield k
+        
+        rec.swap(mid, right)
+        yield k
+
+        return k
+
+
+
+class TimSort(Sort):
+    """
+    This class implements a simplified tim sort algorithm. It finds natural runs (descending runs are reversed),
+    extends short runs by insertion sort and merges them through a buffer, keeping the tim sort invariants
+    of the run stack. It doesn't use galloping. The number of runs waiting for merging is shown as
+    the "runs" value of the frames.
+    """
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        n = len(data)
+        order = self._order_int
+        minrun = self._minrun(n)
+        k = 0
+        yield k
+
+        # zásobník běhů (start, délka)
+        runs = []
+        i = 0
+
+        while i < n:
+            start = i
+            end = i + 1
+
+            if end < n:
+                k += 1
+                rec.compare(i, end)
+                yield k
+                descending = order * (data[i] - data[end]) > 0
+                end += 1
+
+                while end < n:
+                    k += 1
+                    rec.compare(end-1, end)
+                    yield k
+
+                    # klesající běh musí být ostře klesající, aby otočení zachovalo stabilitu
+                    if (order * (data[end-1] - data[end]) > 0) != descending:
+                        break
+                    end += 1
+                
+                rec.compare()
+                if descending:
+                    a, b = start, end - 1
+                    while a < b:
+                        rec.swap(a, b)
+                        yield k
+                        a += 1
+                        b -= 1
+
+            # krátký běh se prodlouží vkládáním
+            if end - start < minrun and end < n:
+                stop = min(start + minrun, n)
+                rec.bounds(start, stop - 1)
+                k = yield from _gap_insertion(rec, order, start, stop - 1, 1, k, end)
+                end = stop
+
+            runs.append((start, end - start))
+            rec.bounds(start, end - 1)
+            rec.info("runs", len(runs))
+            yield k
+            i = end
+
+            k = yield from self._merge_collapse(rec, runs, k, False)
+        
+        k = yield from self._merge_collapse(rec, runs, k, True)
+
+        rec.info("runs")
+        rec.bounds()
+        rec.correct(0, n)
+        yield k
+
+
+    def _minrun(self, n: int) -> int:
+        """
+        Returns the minimum length of a run, between 16 and 32, so that n / minrun is close to a power of two.
+        """
+        r = 0
+        while n >= 32:
+            r |= n & 1
+            n >>= 1
+        
+        return n + r
+
+
+    def _merge_collapse(self, rec: Recorder, runs: List[Tuple[int, int]], k: int, force: bool) -> Generator[int, None, int]:
+        """
+        Merges runs on the top of the stack until the invariants of the stack hold (or until only one run is left,
+        if force is True), returns the new iteration number.
+        """
+        while len(runs) > 1:
+            i = len(runs) - 2
+
+            if force:
+                if i > 0 and runs[i-1][1] < runs[i+1][1]:
+                    i -= 1
+            elif (i > 0 and runs[i-1][1] <= runs[i][1] + runs[i+1][1]) or (i > 1 and runs[i-2][1] <= runs[i-1][1] + runs[i][1]):
+                if runs[i-1][1] < runs[i+1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i+1][1]:
+                break
+
+            (start, length), (_, length2) = runs[i], runs[i+1]
+            runs[i:i+2] = [(start, length + length2)]
+            right = start + length + length2 - 1
+
+            rec.bounds(start, right)
+            k = yield from _merge_buffered(rec, self._order_int, start, start + length - 1, right, k)
+            rec.info("runs", len(runs))
+            yield k
+
+        return k
+
+
+
+class RadixSort(Sort):
+    """
+    This class implements an LSD radix sort algorithm. Every pass is a stable counting sort by one digit:
+    the digits are counted first, then the data are copied to the buffer and written back by their buckets.
+    The current digit and the bucket of the current element are shown as the "digit" and "bucket" values
+    of the frames. There are no comparisons, k counts the digits read (in both phases).
+
+    Integer data are sorted by their difference from the minimum, other numbers by their bits
+    transformed so that their order is preserved. Passes where all elements have the same digit are skipped.
+
+    Attributes:
+        bits - the number of bits of one digit (the number of buckets is 2^bits)
+    """
+
+    def __init__(self, data: List[int|float] | str | None = None, order: Literal["ascending", "descending"] = "ascending", 
+                 style: dict | None = None, bits: int = 8) -> None:
+        """
+        Params:
+            data - list or array of numbers to sort or a path to a file (see set_data)
+            order - desired order of the sorted list, either "ascending" or "descending" (default ascending)
+            style - a dict containing the style of the animation, see the set_style method
+            bits - the number of bits of one digit, from 1 to 16
+        """
+        super().__init__(data, order, style)
+
+        if not isinstance(bits, int):
+            raise TypeError("Bits must be an integer")
+        elif bits < 1 or bits > 16:
+            raise ValueError("Bits must be between 1 and 16")
+        self.bits = bits
+
+
+    def _keys(self, data: List[int|float]) -> List[int]:
+        """
+        Returns non-negative integer keys of the data in the same order as the data should be sorted.
+        """
+        if all(float(x).is_integer() for x in data):
+            if self.order == "ascending":
+                low = min(data)
+                return [int(x - low) for x in data]
+            high = max(data)
+            return [int(high - x) for x in data]
+
+        # bity floatu: u záporných čísel se otočí všechny, u kladných jen znaménko
+        bits = array("Q")
+        bits.frombytes(array("d", data).tobytes())
+        sign = 1 << 63
+        full = (1 << 64) - 1
+        flip = full if self.order == "descending" else 0
+
+        return [(x ^ full if x & sign else x | sign) ^ flip for x in bits]
+
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        data = rec.data
+        n = len(data)
+        k = 0
+        yield k
+
+        keys = self._keys(data)
+        mask = (1 << self.bits) - 1
+        passes = max(1, -(-max(keys).bit_length() // self.bits))
+
+        for p in range(passes):
+            digits = [(key >> (p * self.bits)) & mask for key in keys]
+            if min(digits) == max(digits):
+                continue
+            rec.info("digit", p)
+
+            # počítání číslic
+            counts = [0] * (mask + 1)
+            for i in range(n):
+                k += 1
+                counts[digits[i]] += 1
+                rec.compare(i)
+                rec.info("bucket", digits[i])
+                yield k
+
+            positions = [0] * (mask + 1)
+            for d in range(1, mask + 1):
+                positions[d] = positions[d-1] + counts[d-1]
+            
+            # přepsání dat z bufferu po přihrádkách
+            rec.load_buffer(0, n)
+            new_keys = [0] * n
+
+            for i in range(n):
+                k += 1
+                d = digits[i]
+                j = positions[d]
+                positions[d] += 1
+
+                rec.compare(i, j)
+                rec.info("bucket", d)
+                rec.write_from_buffer(j, i)
+                rec.clear_buffer(i, i+1)
+                new_keys[j] = keys[i]
+                yield k
+
+            keys = new_keys
+            rec.compare()
+            rec.info("bucket")
+        
+        rec.info("digit")
+        rec.correct(0, n)
+        yield k
+
+
+
+class ExternalMergeSort(Sort):
+    """
+    This class implements an external merge sort for data larger than the memory (e.g. a memory-mapped file,
+    see set_data). The data are split into chunks of `chunk_size` elements, every chunk is sorted in memory
+    and written to a temporary file as a sorted run. Then groups of at most `fan_in` runs are merged by a k-way
+    merge until one run is left. The sorted data can be saved to a file by the `sort_to` method.
+
+    The animation doesn't show every element, but a profile of at most `profile_size` bars, each showing
+    the element in the middle of its part of the data. A frame is created only when a shown element changes,
+    so both the sort and the animation need memory only for a few chunks and the profile. The chunk or the runs
+    being merged are shown as the bounds, the runs being merged are in the buffer (emptied as they are read)
+    and the number of runs waiting for merging is shown as the "runs" value of the frames. There are
+    no comparisons of single elements, k counts the elements written (to the runs and by merging).
+
+    Attributes:
+        chunk_size - the number of elements sorted in memory at once, merging uses about the same memory
+        fan_in - the maximum number of runs merged at once
+        profile_size - the maximum number of bars of the animation
+
+    Methods:
+        sort_to - sorts the data to a file
+    """
+
+    NOT_TRACED = Sort.NOT_TRACED | {"_temp_dir"}
+
+    def __init__(self, data: List[int|float] | str | None = None, order: Literal["ascending", "descending"] = "ascending", 
+                 style: dict | None = None, chunk_size: int = 2**20, fan_in: int = 64, profile_size: int = 256,
+                 temp_dir: str | None = None) -> None:
+        """
+        Params:
+            data - list or array of numbers to sort or a path to a file (see set_data)
+            order - desired order of the sorted list, either "ascending" or "descending" (default ascending)
+            style - a dict containing the style of the animation, see the set_style method
+            chunk_size - the number of elements sorted in memory at once
+            fan_in - the maximum number of runs merged at once, at least 2
+            profile_size - the maximum number of bars of the animation
+            temp_dir - a directory for the temporary files of the runs (default the system's temporary directory)
+        """
+        super().__init__(data, order, style)
+
+        if not isinstance(chunk_size, int) or not isinstance(fan_in, int) or not isinstance(profile_size, int):
+            raise TypeError("Chunk size, fan in and profile size must be integers")
+        elif chunk_size < 1 or profile_size < 1:
+            raise ValueError("Chunk size and profile size must be positive")
+        elif fan_in < 2:
+            raise ValueError("Fan in must be at least 2")
+        elif temp_dir is not None and not isinstance(temp_dir, str):
+            raise TypeError("Temporary directory must be a string or None")
+        
+        self.chunk_size = chunk_size
+        self.fan_in = fan_in
+        self.profile_size = profile_size
+        # adresář nemění trace, proto není součástí klíče v cache (viz NOT_TRACED)
+        self._temp_dir = temp_dir
+
+
+    def get_title(self) -> str:
+        return f"External Merge Sort ({self.order})"
+
+
+    def sort_to(self, path: str) -> None:
+        """
+        Sorts the data to a file without creating any frames. The data of this instance are left unchanged.
+
+        Params:
+            path - the file, either a .npy file, or a raw binary file with the same type of values as the data
+        """
+        self._check_data()
+        rec = Recorder(self._shown_data())
+
+        for _ in self._external_sort(rec, path):
+            pass
+
+
+    def argsort(self) -> np.ndarray:
+        # algoritmus přesouvá v paměti jen profil, permutace všech dat se nikde nevytvoří
+        raise TypeError("External Merge Sort doesn't support argsort, it sorts the data to a file (see sort_to)")
+
+
+    def sorted_records(self) -> any:
+        raise TypeError("External Merge Sort doesn't support sorting records, it sorts the data to a file (see sort_to)")
+
+
+    def _positions(self) -> np.ndarray:
+        """
+        Returns the indexes of the elements shown in the profile, the middles of its bars.
+        """
+        n = len(self.data)
+        count = min(self.profile_size, n)
+
+        return (2 * np.arange(count, dtype=np.int64) + 1) * n // (2 * count)
+
+
+    def _shown_data(self) -> List[int|float] | np.ndarray:
+        positions = self._positions()
+        if isinstance(self.data, np.ndarray):
+            return self.data[positions]
+        
+        return [self.data[i] for i in positions]
+
+
+    def _value_range(self) -> Tuple[float, float]:
+        # profil neseřazených dat nemusí obsahovat nejmenší a největší hodnotu, data se projdou po blocích
+        data = self.data
+        low, high = np.inf, -np.inf
+        for start in range(0, len(data), CHECK_BLOCK):
+            block = np.asarray(data[start:start+CHECK_BLOCK])
+            low, high = min(low, block.min()), max(high, block.max())
+
+        return float(low), float(high)
+
+
+    def _record(self, rec: Recorder) -> Generator[int, None, None]:
+        yield from self._external_sort(rec, None)
+
+
+    def _external_sort(self, rec: Recorder, output: str | None) -> Generator[int, None, None]:
+        """
+        Sorts the data to the output file (None for a temporary file), the profile of the data is `rec.data`.
+        """
+        data = self.data
+        n = len(data)
+        order = self._order_int
+        dtype = data.dtype if isinstance(data, np.ndarray) else np.asarray(data).dtype
+        positions = self._positions()
+        names = itertools.count()
+        k = 0
+        yield k
+
+        with tempfile.TemporaryDirectory(dir=self._temp_dir) as directory:
+            if output is None:
+                output = os.path.join(directory, "sorted")
+            chunks = -(-n // self.chunk_size)
+
+            # seřazené běhy, jediný běh je rovnou výsledkem
+            runs = []
+            for start in range(0, n, self.chunk_size):
+                stop = min(start + self.chunk_size, n)
+                path = output if chunks == 1 else os.path.join(directory, "run{}".format(next(names)))
+
+                run = np.sort(np.asarray(data[start:stop], dtype=dtype))
+                if order < 0:
+                    run = run[::-1]
+                with _create_run(path, stop - start, dtype) as f:
+                    run.tofile(f)
+                
+                runs.append((path, start, stop - start))
+                k += stop - start
+                rec.info("runs", len(runs))
+
+                first, last = np.searchsorted(positions, (start, stop))
+                if first < last:
+                    rec.bounds(first, last - 1)
+                    for i in range(first, last):
+                        rec.write(i, run[positions[i] - start].item())
+                    yield k
+                del run
+
+            # slévání skupin běhů, dokud nezbude jediný
+            while len(runs) > 1:
+                merged = []
+                final = len(runs) <= self.fan_in
+
+                for g in range(0, len(runs), self.fan_in):
+                    group = runs[g:g+self.fan_in]
+                    if len(group) == 1:
+                        merged.append(group[0])
+                        continue
+
+                    path = output if final else os.path.join(directory, "run{}".format(next(names)))
+                    k = yield from self._merge(rec, group, path, dtype, positions, k)
+                    for run_path, _, _ in group:
+                        os.remove(run_path)
+                    
+                    merged.append((path, group[0][1], sum(length for _, _, length in group)))
+                    rec.compare()
+                    rec.info("runs", len(merged) + len(runs) - g - len(group))
+                    yield k
+                
+                runs = merged
+        
+            rec.bounds()
+            rec.info("runs")
+            rec.correct(0, len(positions))
+            yield k
+
+
+    def _merge(self, rec: Recorder, group: List[Tuple[str, int, int]], path: str, dtype: np.dtype, positions: np.ndarray,
+               k: int) -> Generator[int, None, int]:
+        """
+        Merges the runs (path, start, length) of the group to the file, returns the new iteration number.
+        The runs are read by blocks. A heap of the runs ordered by the last values of their blocks gives the value
+        up to which all read values can be written, because the values which haven't been read yet can't be before it.
+        """
+        order = self._order_int
+        start = group[0][1]
+        length = sum(run_length for _, _, run_length in group)
+        first, last = (int(i) for i in np.searchsorted(positions, (start, start + length)))
+        block = max(1, self.chunk_size // (len(group) + 1))
+
+        rec.compare()
+        if first < last:
+            rec.bounds(first, last - 1)
+        rec.load_buffer(first, last)
+        yield k
+
+        with contextlib.ExitStack() as stack:
+            files = [stack.enter_context(open(run_path, "rb")) for run_path, _, _ in group]
+            out = stack.enter_context(_create_run(path, length, dtype))
+
+            blocks = [np.fromfile(f, dtype, block) for f in files]
+            heap = [(order * b[-1].item(), r) for r, b in enumerate(blocks) if len(b)]
+            heapq.heapify(heap)
+
+            # počet přečtených prvků a první sloupec v bufferu, který se ještě nevyprázdnil, pro každý běh
+            consumed = [0] * len(group)
+            cleared = [int(np.searchsorted(positions, run_start)) for _, run_start, _ in group]
+            written = start
+
+            while heap:
+                cutoff = blocks[heap[0][1]][-1]
+                parts = []
+                for r, b in enumerate(blocks):
+                    count = _count_to(b, cutoff, order)
+                    if count:
+                        parts.append(b[:count])
+                        blocks[r] = b[count:]
+                        consumed[r] += count
+                
+                values = np.sort(np.concatenate(parts))
+                if order < 0:
+                    values = values[::-1]
+                values.tofile(out)
+
+                # prázdné bloky se doplní z jejich běhů
+                while heap and len(blocks[heap[0][1]]) == 0:
+                    r = heapq.heappop(heap)[1]
+                    blocks[r] = np.fromfile(files[r], dtype, block)
+                    if len(blocks[r]):
+                        heapq.heappush(heap, (order * blocks[r][-1].item(), r))
+
+                a, b = (int(i) for i in np.searchsorted(positions, (written, written + len(values))))
+                for i in range(a, b):
+                    rec.write(i, values[positions[i] - written].item())
+                changed = a < b
+
+                for r, (_, run_start, _) in enumerate(group):
+                    end = int(np.searchsorted(positions, run_start + consumed[r]))
+                    if end > cleared[r]:
+                        rec.clear_buffer(cleared[r], end)
+                        cleared[r] = end
+                        changed = True
+                
+                written += len(values)
+                k += len(values)
+                if changed:
+                    if a < b:
+                        rec.compare(b - 1)
+                    yield k
+        
+        return k
+
+
+
+def _sift_down(rec: Recorder, order: int, root: int, end: int, offset: int, k: int) -> Generator[int, None, int]:
+    """
+    Moves the element on the heap index root down the heap with `end` elements, which starts on the index
+    offset of the data. Returns the new iteration number.
+    """
+    data = rec.data
+
+    while 2 * root + 1 < end:
+        child = 2 * root + 1
+
+        if child + 1 < end:
+            k += 1
+            rec.compare(offset + child, offset + child + 1)
+            yield k
+
+            if order * (data[offset + child + 1] - data[offset + child]) > 0:
+                child += 1
         
-        yield {"data": self.data, "k": k, "bounds": (left, right), "correct": correct}
\ No newline at end of file
+        k += 1
+        rec.compare(offset + root, offset + child)
+        yield k
+
+        if order * (data[offset + child] - data[offset + root]) > 0:
+            rec.swap(offset + root, offset + child)
+            yield k
+            root = child
+        else:
+            break
+
+    return k
+
+
+def _heap_sort(rec: Recorder, order: int, left: int, right: int, k: int) -> Generator[int, None, int]:
+    """
+    Sorts the data between left and right (inclusive) by heap sort, returns the new iteration number.
+    The sorted elements are marked as correct, the end of the heap is shown as the "heap" value.
+    """
+    n = right - left + 1
+    rec.bounds(left, right)
+    rec.info("heap", right)
+
+    for root in range(n // 2 - 1, -1, -1):
+        k = yield from _sift_down(rec, order, root, n, left, k)
+    
+    for end in range(n - 1, 0, -1):
+        rec.compare()
+        rec.swap(left, left + end)
+        rec.correct(left + end)
+        rec.bounds(left, left + end - 1)
+        rec.info("heap", left + end - 1)
+        yield k
+
+        k = yield from _sift_down(rec, order, 0, end, left, k)
+    
+    rec.compare()
+    rec.correct(left)
+    rec.info("heap")
+    yield k
+
+    return k
+
+
+def _gap_insertion(rec: Recorder, order: int, left: int, right: int, gap: int, k: int, 
+                   start: int | None = None) -> Generator[int, None, int]:
+    """
+    Insertion sort of the elements between left and right (inclusive) with the given gap, returns
+    the new iteration number. Elements before the index start are expected to be sorted already.
+    """
+    data = rec.data
+    if start is None:
+        start = left + gap
+
+    for i in range(start, right + 1):
+        j = i
+
+        while j - gap >= left:
+            k += 1
+            rec.compare(j - gap, j)
+            yield k
+
+            if order * (data[j - gap] - data[j]) > 0:
+                rec.swap(j - gap, j)
+                yield k
+                j -= gap
+            else:
+                break
+    
+    rec.compare()
+
+    return k
+
+
+def _merge_buffered(rec: Recorder, order: int, left: int, m: int, right: int, k: int) -> Generator[int, None, int]:
+    """
+    Merges the sorted parts left..m and m+1..right through the buffer, returns the new iteration number.
+    Indexes i and j point to the buffer, index w to the data.
+    """
+    rec.load_buffer(left, right + 1)
+    buffer = rec.buffer
+    i, j, w = left, m+1, left
+
+    while i <= m and j <= right:
+        k += 1
+        rec.compare(i, j)
+        yield k
+
+        if order * (buffer[i] - buffer[j]) > 0:
+            rec.write_from_buffer(w, j)
+            j += 1
+        else:
+            rec.write_from_buffer(w, i)
+            i += 1
+        w += 1
+        yield k
+
+    # zbytek pravé části už na svém místě je, zbytek levé se dopíše
+    rec.compare()
+    while i <= m:
+        rec.write_from_buffer(w, i)
+        i += 1
+        w += 1
+        yield k
+
+    rec.clear_buffer(left, right + 1)
+
+    return k
+
+
+
+def _create_run(path: str, length: int, dtype: np.dtype) -> BinaryIO:
+    """
+    Opens a new file for a run of the given length, a .npy file gets the header of the array.
+    """
+    f = open(path, "wb")
+    if path.lower().endswith(".npy"):
+        header = {"descr": np.lib.format.dtype_to_descr(dtype), "fortran_order": False, "shape": (length,)}
+        np.lib.format.write_array_header_1_0(f, header)
+
+    return f
+
+
+def _count_to(block: np.ndarray, value: int|float, order: int) -> int:
+    """
+    Returns the number of elements at the start of the sorted block which aren't after the value in the order.
+    """
+    if order > 0:
+        return int(np.searchsorted(block, value, side="right"))
+    
+    return len(block) - int(np.searchsorted(block[::-1], value, side="left"))
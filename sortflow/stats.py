@@ -0,0 +1,98 @@
+"""
+Module containing the StatsRecorder class, which counts the operations of a sorting algorithm
+without creating any frames (see Sort.run_stats).
+"""
+
+from typing import List, Tuple, Dict, Iterable
+from .trace import Recorder
+
+
+class StatsRecorder(Recorder):
+    """
+    A recorder which only counts the operations made by the sorting algorithm.
+
+    Attributes:
+        swaps - number of swaps
+        shifts - number of shifts
+        shifted - number of elements moved by the shifts
+        writes - number of values written to the data
+        buffer_writes - number of values written to the auxiliary buffer
+        depth - maximum depth of nested bounds (the recursion depth of divide and conquer algorithms), bounds
+                changed while the "heap" info is set only mark the shrinking heap, so a heap sort adds one level
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        super().__init__(data)
+        self.swaps = 0
+        self.shifts = 0
+        self.shifted = 0
+        self.writes = 0
+        self.buffer_writes = 0
+        self.depth = 0
+        self._bounds: List[Tuple[int, int]] = []
+        self._heap = False
+
+
+    def swap(self, i: int, j: int) -> None:
+        self.swaps += 1
+        data = self.data
+        data[i], data[j] = data[j], data[i]
+
+
+    def shift(self, i: int, j: int) -> None:
+        self.shifts += 1
+        self.shifted += j - i + 1
+        data = self.data
+        data[i], data[i+1:j+1] = data[j], data[i:j]
+
+
+    def write(self, i: int, value: int|float) -> None:
+        self.writes += 1
+        self.data[i] = value
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        self.buffer_writes += stop - start
+        super().load_buffer(start, stop)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        self.buffer_writes += 1
+        super().write_buffer(i, value)
+
+
+    def bounds(self, left: int|None = None, right: int|None = None) -> None:
+        if left is None or self._heap:
+            return
+
+        # zásobník vnořených hranic, hloubka je jeho maximální velikost
+        stack = self._bounds
+        while stack and not (stack[-1][0] <= left and right <= stack[-1][1]):
+            stack.pop()
+        
+        if not stack or stack[-1] != (left, right):
+            stack.append((left, right))
+            self.depth = max(self.depth, len(stack))
+
+
+    def info(self, key: str, value: int | None = None) -> None:
+        if key == "heap":
+            self._heap = value is not None
+
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the counters as a dict with keys comparisons (the iteration number of the last frame),
+        swaps, shifts, shifted, writes, buffer_writes, depth and frames.
+        """
+        return {
+            "comparisons": self.k,
+            "swaps": self.swaps,
+            "shifts": self.shifts,
+            "shifted": self.shifted,
+            "writes": self.writes,
+            "buffer_writes": self.buffer_writes,
+            "depth": self.depth,
+            "frames": self.frames
+        }
@@ -0,0 +1,1148 @@
+"""
+Module containing the Trace class and the recorders used to create it.
+
+A trace stores the initial data only once, followed by a compact record of every operation
+the sorting algorithm made (comparisons, swaps, shifts, bounds etc.). The frames of the animation
+are rebuilt from these records only when they are needed.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+import struct
+import sys
+from typing import List, Tuple, Dict, Iterable, Iterator, Sequence
+
+
+# kódy operací, které se ukládají do trace
+OP_COMPARE = 0          # a, b - porovnávané indexy (a = -1 porovnání ruší)
+OP_SWAP = 1             # prohození prvků a, b
+OP_SHIFT = 2            # prvek b se přesune na index a, prvky a..b-1 se posunou doprava
+OP_WRITE = 3            # data[a] = v
+OP_PIVOT = 4            # pivot = v (a = -1 pivot ruší)
+OP_BOUNDS = 5           # hranice a, b (a = -1 hranice ruší)
+OP_CORRECT = 6          # prvky [a, b) jsou správně seřazené
+OP_CORRECT_CLEAR = 7    # žádný prvek není seřazený
+OP_BUFFER_LOAD = 8      # buffer[a:b] = data[a:b]
+OP_BUFFER_CLEAR = 9     # prvky buffer[a:b] se vyprázdní (a = -1 celý buffer)
+OP_BUFFER_WRITE = 10    # buffer[a] = v
+OP_INFO = 11            # informační klíč INFO_KEYS[a] = b (b = -1 klíč ruší)
+
+# operace, které mění strukturu zobrazení (snímky s nimi se při decimaci vždy zachovají)
+STRUCTURAL_OPS = (OP_PIVOT, OP_BOUNDS, OP_CORRECT, OP_CORRECT_CLEAR)
+
+# hlavička binárního formátu trace: značka, verze formátu, pořadí bajtů, délky sloupců
+TRACE_MAGIC = b"SFTR"
+TRACE_FORMAT = 1
+_HEADER = struct.Struct("<4sBc7Q")
+
+# největší celé číslo, které se do trace (do floatů) uloží přesně
+MAX_EXACT_INT = 2**53
+
+# nejmenší počet operací mezi dvěma klíčovými snímky (skutečný interval je alespoň počet dat)
+KEYFRAME_INTERVAL = 4096
+
+# informační klíče snímků s nezápornými celočíselnými hodnotami, zobrazují se jako text
+INFO_KEYS = (
+    "heap",     # konec haldy (heap sort)
+    "gap",      # aktuální mezera (shell sort)
+    "runs",     # počet běhů čekajících na slití (tim sort)
+    "digit",    # pořadí aktuální číslice (radix sort)
+    "bucket"    # přihrádka aktuálního prvku (radix sort)
+)
+
+
+class IndexIntervals():
+    """
+    An immutable sorted set of indexes stored as half-open intervals [start, stop).
+    It's used as the `correct` value of frames rebuilt from a trace. It supports `in`,
+    `len`, indexing and iteration, so it can be used as a list of indexes.
+
+    Attributes:
+        starts - tuple of the intervals' starts
+        stops - tuple of the intervals' ends (exclusive)
+    """
+
+    __slots__ = ("starts", "stops", "_ends")
+
+
+    def __init__(self, starts: Iterable[int] = (), stops: Iterable[int] = ()) -> None:
+        """
+        Params:
+            starts - sorted starts of disjoint intervals
+            stops - ends (exclusive) of the intervals
+        """
+        self.starts = tuple(starts)
+        self.stops = tuple(stops)
+
+        # kumulativní délky pro indexování
+        ends = []
+        total = 0
+        for start, stop in zip(self.starts, self.stops):
+            total += stop - start
+            ends.append(total)
+        self._ends = ends
+
+
+    def __len__(self) -> int:
+        return self._ends[-1] if self._ends else 0
+
+
+    def __contains__(self, index: int) -> bool:
+        i = bisect_right(self.starts, index) - 1
+        return i >= 0 and index < self.stops[i]
+
+
+    def __iter__(self) -> Iterator[int]:
+        for start, stop in zip(self.starts, self.stops):
+            yield from range(start, stop)
+
+
+    def __getitem__(self, i: int) -> int:
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("Index out of range")
+
+        j = bisect_right(self._ends, i)
+        return self.starts[j] + i - (self._ends[j-1] if j > 0 else 0)
+
+
+    def __repr__(self) -> str:
+        return "IndexIntervals({})".format(list(zip(self.starts, self.stops)))
+
+
+
+class _TraceState():
+    """
+    The state of the visualization at some point of the trace. Operations of the trace are applied
+    to it one after another and frames are created from it.
+    """
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        self.data = _to_list(data)
+        self.k = 0
+        self.compare = None
+        self.bounds = None
+        self.pivot = None
+        self.starts = []
+        self.stops = []
+        self.buffer = None
+        self.buffered = 0
+        self.info = {}
+
+
+    def has_correct(self, start: int, stop: int) -> bool:
+        """
+        Returns whether all indexes [start, stop) are already marked as correctly sorted.
+        """
+        i = bisect_right(self.starts, start) - 1
+        return i >= 0 and stop <= self.stops[i]
+
+
+    def add_correct(self, start: int, stop: int) -> None:
+        """
+        Marks indexes [start, stop) as correctly sorted, merging the touching intervals.
+        """
+        i = bisect_left(self.stops, start)
+        j = bisect_right(self.starts, stop)
+
+        if i < j:
+            start = min(start, self.starts[i])
+            stop = max(stop, self.stops[j-1])
+
+        self.starts[i:j] = [start]
+        self.stops[i:j] = [stop]
+
+
+    def clear_correct(self) -> None:
+        self.starts = []
+        self.stops = []
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        """
+        Copies data[start:stop] to the same indexes of the buffer.
+        """
+        if self.buffer is None:
+            self.buffer = [None] * len(self.data)
+
+        self.buffered += self.buffer[start:stop].count(None)
+        self.buffer[start:stop] = self.data[start:stop]
+
+
+    def clear_buffer(self, start: int | None = None, stop: int | None = None) -> None:
+        """
+        Empties indexes [start, stop) of the buffer, or the whole buffer.
+        """
+        if self.buffer is None:
+            return
+        if start is None:
+            start, stop = 0, len(self.buffer)
+
+        self.buffered -= (stop - start) - self.buffer[start:stop].count(None)
+        self.buffer[start:stop] = [None] * (stop - start)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        """
+        Writes the value to index i of the buffer.
+        """
+        if self.buffer is None:
+            self.buffer = [None] * len(self.data)
+        if self.buffer[i] is None:
+            self.buffered += 1
+
+        self.buffer[i] = value
+
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory (in bytes) used by the lists of the state, one pointer per item.
+        """
+        return 8 * (len(self.data) + len(self.starts) + len(self.stops) + len(self.buffer or ()))
+
+
+    def copy(self) -> "_TraceState":
+        """
+        Returns a copy of the state which doesn't share any mutable values with this state.
+        """
+        state = _TraceState(())
+        state.data = list(self.data)
+        state.k = self.k
+        state.compare = self.compare
+        state.bounds = self.bounds
+        state.pivot = self.pivot
+        state.starts = list(self.starts)
+        state.stops = list(self.stops)
+        state.buffer = None if self.buffer is None else list(self.buffer)
+        state.buffered = self.buffered
+        state.info = dict(self.info)
+
+        return state
+
+
+    def frame(self) -> Dict[str, any]:
+        """
+        Creates a frame dict (see Sort._sort_next) from the current state. The frame doesn't share
+        any mutable values with the state.
+        """
+        frame = {"data": list(self.data), "k": self.k}
+
+        if self.compare is not None:
+            frame["compare"] = self.compare
+        if self.starts:
+            frame["correct"] = IndexIntervals(self.starts, self.stops)
+        if self.bounds is not None:
+            frame["bounds"] = self.bounds
+        if self.pivot is not None:
+            frame["pivot"] = self.pivot
+        if self.buffered:
+            frame["buffer"] = list(self.buffer)
+        if self.info:
+            frame.update(self.info)
+
+        return frame
+
+
+
+class Trace():
+    """
+    A compact record of one run of a sorting algorithm. The initial data are stored once, then every
+    operation is stored as one record in array-backed columns. Frames are rebuilt lazily from these records,
+    either by iterating over the trace or by indexing it.
+
+    For random access the trace keeps keyframes, snapshots of the whole state every N operations (N is at least
+    the number of data). They're created by the first indexing of the trace (or by `build_keyframes`), after that
+    any frame is rebuilt from the nearest keyframe in O(N + n) instead of replaying all operations before it.
+
+    Attributes:
+        initial - the initial data as an array of floats (integers must therefore be at most MAX_EXACT_INT
+                  in absolute value, larger ones are rejected as they would change by the conversion)
+
+    Methods:
+        from_frames - creates a trace from frame dicts
+        select - iterates over chosen frames
+        find_k - returns the index of the frame with a given iteration number
+        build_keyframes - creates the keyframes for fast random access
+        decimate - returns a trace with at most a given number of frames
+        max_k - the iteration number of the last frame
+        uses_buffer - whether the algorithm used the auxiliary buffer
+        ops - the number of stored operations
+        nbytes - the approximate memory used by the trace
+        to_bytes - serializes the trace to a compact binary format
+        from_bytes - creates a trace from its binary format
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        """
+        Params:
+            data - the initial data
+        """
+        if not isinstance(data, list):
+            data = _to_list(data)
+        _check_exact(data)
+        self.initial = array("d", data)
+
+        # sloupce operací
+        self._op = array("B")
+        self._a = array("i")
+        self._b = array("i")
+        self._v = array("d")
+
+        # pro každý snímek počet operací, které mu předcházejí, a číslo iterace
+        self._frames = array("q")
+        self._k = array("q")
+
+        # klíčové snímky: počty operací před nimi a stavy po jejich provedení
+        self._key_ops = array("q")
+        self._key_states: List[_TraceState] = []
+
+
+    @classmethod
+    def from_frames(cls, frames: Iterable[Dict[str, any]], data: Iterable[int|float]) -> "Trace":
+        """
+        Creates a trace from frame dicts (see Sort._sort_next). Every frame is compared to the previous one
+        and only the differences are stored, so the frames can share the same (mutated) data list.
+
+        Params:
+            frames - an iterable of frame dicts
+            data - the initial data
+
+        Returns:
+            Trace - the trace
+        """
+        rec = TraceRecorder(data)
+        record_frames(frames, rec)
+
+        return rec.trace
+
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+    def __iter__(self) -> Iterator[Dict[str, any]]:
+        state = _TraceState(self.initial)
+        done = 0
+
+        for f, stop in enumerate(self._frames):
+            self._apply(state, done, stop)
+            done = stop
+            state.k = self._k[f]
+            yield state.frame()
+
+
+    def __getitem__(self, index: int) -> Dict[str, any]:
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError("Frame index out of range")
+
+        stop = self._frames[index]
+        if not self._key_ops and stop > self._keyframe_interval():
+            self.build_keyframes()
+
+        state, done = self._restore(stop)
+        self._apply(state, done, stop)
+        state.k = self._k[index]
+
+        return state.frame()
+
+
+    def select(self, indexes: Iterable[int]) -> Iterator[Dict[str, any]]:
+        """
+        Iterates over the frames with the given indexes. The operations are replayed only once,
+        and frame dicts are created only for the chosen frames. Long runs of operations between the chosen
+        frames are skipped by the keyframes, if they're already created.
+
+        Params:
+            indexes - increasing frame indexes
+
+        Returns:
+            Iterator[dict] - the chosen frames
+        """
+        state = None
+        done = 0
+        last = -1
+
+        for index in indexes:
+            if index <= last or index >= len(self):
+                raise IndexError("Frame indexes must be increasing and in range")
+
+            stop = self._frames[index]
+            state, done = self._restore(stop, state, done)
+            self._apply(state, done, stop)
+            done = stop
+            last = index
+            state.k = self._k[index]
+            yield state.frame()
+
+
+    def find_k(self, k: int) -> int:
+        """
+        Returns the index of the last frame whose iteration number is at most k (the first frame
+        if all of them have a larger one). Together with indexing it seeks to a given k.
+
+        Params:
+            k - the iteration number
+
+        Returns:
+            int - the frame index
+        """
+        if not len(self):
+            raise IndexError("Trace has no frames")
+
+        return max(bisect_right(self._k, k) - 1, 0)
+
+
+    def build_keyframes(self, interval: int | None = None) -> None:
+        """
+        Replays the trace once and saves a snapshot of the state every `interval` operations. Traces created
+        by `decimate` share the operations and the keyframes existing at that time with this trace.
+
+        Params:
+            interval - the number of operations between the keyframes, None for the default (the larger
+                       of KEYFRAME_INTERVAL and the number of data, so the keyframes take at most about
+                       as much memory as the operations)
+        """
+        if interval is None:
+            interval = self._keyframe_interval()
+        elif not isinstance(interval, int):
+            raise TypeError("Keyframe interval must be an integer")
+        elif interval < 1:
+            raise ValueError("Keyframe interval must be positive")
+
+        state = _TraceState(self.initial)
+        key_ops = array("q")
+        key_states = []
+
+        for stop in range(interval, len(self._op) + 1, interval):
+            self._apply(state, stop - interval, stop)
+            key_ops.append(stop)
+            key_states.append(state.copy())
+
+        self._key_ops, self._key_states = key_ops, key_states
+
+
+    def decimate(self, budget: int) -> "Trace":
+        """
+        Returns a trace with at most `budget` frames (the operations are shared with this trace).
+        A frame followed by a frame with the same iteration number is merged into it (e.g. a comparison
+        followed by a swap). The first and the last frame and the structurally important frames (new bounds,
+        pivot changes, newly sorted elements) are always kept, if there's enough of the budget, and every
+        N-th of the other frames fills the rest.
+
+        Params:
+            budget - the maximum number of frames
+
+        Returns:
+            Trace - the decimated trace, or this trace if it already fits the budget
+        """
+        if not isinstance(budget, int):
+            raise TypeError("Frame budget must be an integer")
+        elif budget < 2:
+            raise ValueError("Frame budget must be at least 2")
+
+        count = len(self)
+        if count <= budget:
+            return self
+
+        # strukturní snímky se najdou podle operací, které jim předcházejí
+        table = bytearray(256)
+        for op in STRUCTURAL_OPS:
+            table[op] = 1
+        flags = self._op.tobytes().translate(table)
+
+        structural = bytearray(count)
+        done = 0
+        for f in range(count):
+            stop = self._frames[f]
+            structural[f] = 1 in flags[done:stop]
+            done = stop
+        
+        return self._subset(keep_frames(structural, self._k, budget))
+
+
+    def _subset(self, indexes: List[int]) -> "Trace":
+        """
+        Returns a trace containing only the frames with the given (increasing) indexes.
+        The arrays of operations and the keyframes are shared.
+        """
+        trace = Trace(())
+        trace.initial = self.initial
+        trace._op, trace._a, trace._b, trace._v = self._op, self._a, self._b, self._v
+        trace._frames = array("q", (self._frames[i] for i in indexes))
+        trace._k = array("q", (self._k[i] for i in indexes))
+        trace._key_ops, trace._key_states = self._key_ops, self._key_states
+
+        return trace
+
+
+    def _keyframe_interval(self) -> int:
+        return max(KEYFRAME_INTERVAL, len(self.initial))
+
+
+    def _restore(self, stop: int, state: _TraceState | None = None, done: int = 0) -> Tuple[_TraceState, int]:
+        """
+        Returns a state from which the operations up to `stop` should be replayed: a copy of the nearest keyframe
+        if it's after the current state (`done` operations applied), otherwise the current state.
+
+        Returns:
+            Tuple[_TraceState, int] - the state and the number of operations applied to it
+        """
+        i = bisect_right(self._key_ops, stop) - 1
+        if i >= 0 and (state is None or self._key_ops[i] > done):
+            return self._key_states[i].copy(), self._key_ops[i]
+
+        if state is None:
+            state = _TraceState(self.initial)
+            done = 0
+
+        return state, done
+
+
+    def max_k(self) -> int:
+        """
+        Returns the iteration number of the last frame.
+        """
+        return self._k[-1] if len(self._k) else 0
+
+
+    def uses_buffer(self) -> bool:
+        """
+        Returns whether any values were written to the auxiliary buffer.
+        """
+        ops = self._op.tobytes()
+        return bytes([OP_BUFFER_LOAD]) in ops or bytes([OP_BUFFER_WRITE]) in ops
+
+
+    def ops(self) -> int:
+        """
+        Returns the number of stored operations.
+        """
+        return len(self._op)
+
+
+    def nbytes(self) -> int:
+        """
+        Returns the approximate memory (in bytes) used by the trace's arrays, including the keyframes
+        built so far.
+        """
+        columns = (self.initial, self._op, self._a, self._b, self._v, self._frames, self._k, self._key_ops)
+        return sum(len(col) * col.itemsize for col in columns) + sum(state.nbytes() for state in self._key_states)
+
+
+    def to_bytes(self) -> bytes:
+        """
+        Serializes the trace to a compact binary format: a short header followed by the raw arrays
+        of the initial data, the operations and the frames.
+
+        Returns:
+            bytes - the serialized trace
+        """
+        columns = (self.initial, self._op, self._a, self._b, self._v, self._frames, self._k)
+        byteorder = b"<" if sys.byteorder == "little" else b">"
+        header = _HEADER.pack(TRACE_MAGIC, TRACE_FORMAT, byteorder, *(len(col) for col in columns))
+
+        return header + b"".join(col.tobytes() for col in columns)
+
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Trace":
+        """
+        Creates a trace from the binary format created by `to_bytes`.
+
+        Params:
+            data - the serialized trace
+
+        Returns:
+            Trace - the trace
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Data are too short to contain a trace")
+
+        magic, version, byteorder, *counts = _HEADER.unpack_from(data)
+        if magic != TRACE_MAGIC:
+            raise ValueError("Data don't contain a trace")
+        elif version != TRACE_FORMAT:
+            raise ValueError("Unsupported trace format version {}".format(version))
+
+        trace = cls(())
+        columns = [array("d"), array("B"), array("i"), array("i"), array("d"), array("q"), array("q")]
+        view = memoryview(data)
+        offset = _HEADER.size
+
+        for col, count in zip(columns, counts):
+            size = count * col.itemsize
+            if offset + size > len(data):
+                raise ValueError("Trace data are truncated")
+            col.frombytes(view[offset:offset+size])
+            offset += size
+            
+            # data uložená na stroji s jiným pořadím bajtů
+            if byteorder != (b"<" if sys.byteorder == "little" else b">"):
+                col.byteswap()
+
+        trace.initial, trace._op, trace._a, trace._b, trace._v, trace._frames, trace._k = columns
+
+        return trace
+
+
+    def _add(self, op: int, a: int = -1, b: int = -1, v: float = 0.0) -> None:
+        """
+        Appends one operation record.
+        """
+        self._op.append(op)
+        self._a.append(a)
+        self._b.append(b)
+        self._v.append(v)
+
+
+    def _apply(self, state: _TraceState, start: int, stop: int) -> None:
+        """
+        Applies operations with indexes start..stop-1 to the state.
+        """
+        ops, a_col, b_col, v_col = self._op, self._a, self._b, self._v
+        data = state.data
+
+        for i in range(start, stop):
+            op = ops[i]
+            a = a_col[i]
+
+            if op == OP_COMPARE:
+                state.compare = None if a < 0 else ((a, b_col[i]) if b_col[i] >= 0 else (a,))
+            elif op == OP_SWAP:
+                b = b_col[i]
+                data[a], data[b] = data[b], data[a]
+            elif op == OP_SHIFT:
+                b = b_col[i]
+                data[a], data[a+1:b+1] = data[b], data[a:b]
+            elif op == OP_WRITE:
+                data[a] = v_col[i]
+            elif op == OP_PIVOT:
+                state.pivot = None if a < 0 else v_col[i]
+            elif op == OP_BOUNDS:
+                state.bounds = None if a < 0 else (a, b_col[i])
+            elif op == OP_CORRECT:
+                state.add_correct(a, b_col[i])
+            elif op == OP_CORRECT_CLEAR:
+                state.clear_correct()
+            elif op == OP_BUFFER_LOAD:
+                state.load_buffer(a, b_col[i])
+            elif op == OP_BUFFER_CLEAR:
+                if a < 0:
+                    state.clear_buffer()
+                else:
+                    state.clear_buffer(a, b_col[i])
+            elif op == OP_BUFFER_WRITE:
+                state.write_buffer(a, v_col[i])
+            elif op == OP_INFO:
+                if b_col[i] < 0:
+                    state.info.pop(INFO_KEYS[a], None)
+                else:
+                    state.info[INFO_KEYS[a]] = b_col[i]
+
+
+
+class Recorder():
+    """
+    The object sorting algorithms use to change the data and to describe what should be shown
+    in their next frame (see Sort._record). This base class only changes the data, its subclasses
+    also record the operations.
+
+    Attributes:
+        data - the data being sorted (a copy of the original data)
+        buffer - an auxiliary buffer with the same indexes as the data (None for empty places),
+                 None until the algorithm uses it
+        frames - the number of frames
+        k - the iteration number of the last frame
+
+    Methods:
+        compare - sets the compared indexes
+        swap - swaps two elements
+        shift - moves an element to the left, shifting the elements in between to the right
+        write - writes a value to an index
+        write_from_buffer - writes a value from the buffer to an index
+        pivot - sets the pivot
+        bounds - sets the bounds of currently processed data
+        correct - marks an interval of indexes as correctly sorted
+        clear_correct - marks all indexes as not sorted
+        load_buffer - copies an interval of the data to the buffer
+        clear_buffer - empties an interval of the buffer
+        write_buffer - writes a value to the buffer
+        info - sets an informational value of the frame (see INFO_KEYS)
+        frame - ends a frame
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        """
+        Params:
+            data - the data to be sorted, they are copied
+        """
+        self.data = _to_list(data)
+        self.buffer = None
+        self.frames = 0
+        self.k = 0
+
+
+    def compare(self, i: int|None = None, j: int|None = None) -> None:
+        """
+        Sets the compared indexes. Without arguments no elements are compared.
+        """
+        pass
+
+
+    def swap(self, i: int, j: int) -> None:
+        """
+        Swaps the elements on indexes i and j.
+        """
+        data = self.data
+        data[i], data[j] = data[j], data[i]
+
+
+    def shift(self, i: int, j: int) -> None:
+        """
+        Moves the element on index j to index i (i < j), the elements i..j-1 are shifted to the right.
+        """
+        data = self.data
+        data[i], data[i+1:j+1] = data[j], data[i:j]
+
+
+    def write(self, i: int, value: int|float) -> None:
+        """
+        Writes the value to index i.
+        """
+        self.data[i] = value
+
+
+    def write_from_buffer(self, i: int, j: int) -> None:
+        """
+        Writes the value on index j of the buffer to index i of the data. It's the same as `write(i, buffer[j])`,
+        but it tells where the value comes from (see records.IndexRecorder).
+        """
+        self.write(i, self.buffer[j])
+
+
+    def pivot(self, value: int|float|None = None) -> None:
+        """
+        Sets the pivot value. Without arguments no pivot is shown.
+        """
+        pass
+
+
+    def bounds(self, left: int|None = None, right: int|None = None) -> None:
+        """
+        Sets the bounds (inclusive) of currently processed data. Without arguments no bounds are shown.
+        """
+        pass
+
+
+    def correct(self, start: int, stop: int|None = None) -> None:
+        """
+        Marks indexes [start, stop) as correctly sorted. If stop isn't set, only the index start is marked.
+        """
+        pass
+
+
+    def clear_correct(self) -> None:
+        """
+        Marks all indexes as not sorted.
+        """
+        pass
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        """
+        Copies data[start:stop] to the same indexes of the buffer (the buffer is created on the first use).
+        """
+        if self.buffer is None:
+            self.buffer = [None] * len(self.data)
+        self.buffer[start:stop] = self.data[start:stop]
+
+
+    def clear_buffer(self, start: int | None = None, stop: int | None = None) -> None:
+        """
+        Empties indexes [start, stop) of the buffer. Without arguments the whole buffer is emptied.
+        """
+        if self.buffer is None:
+            return
+        if start is None:
+            start, stop = 0, len(self.buffer)
+        self.buffer[start:stop] = [None] * (stop - start)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        """
+        Writes the value to index i of the buffer.
+        """
+        if self.buffer is None:
+            self.buffer = [None] * len(self.data)
+        self.buffer[i] = value
+
+
+    def info(self, key: str, value: int | None = None) -> None:
+        """
+        Sets an informational value shown with the frame, e.g. the current gap of shell sort. Without
+        the value the key isn't shown.
+
+        Params:
+            key - one of INFO_KEYS
+            value - a non-negative integer
+        """
+        pass
+
+
+    def frame(self, k: int) -> None:
+        """
+        Ends the current frame.
+
+        Params:
+            k - the iteration number (how many comparisons have been made)
+        """
+        self.frames += 1
+        self.k = k
+
+
+
+class TraceRecorder(Recorder):
+    """
+    A recorder which stores all operations in a Trace.
+
+    Attributes:
+        trace - the recorded trace
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        super().__init__(data)
+        self.trace = Trace(self.data)
+        self._compare = ()
+        self._bounds = ()
+        self._pivot = None
+        self._correct = _TraceState(())
+        self._info = {}
+
+
+    def compare(self, i: int|None = None, j: int|None = None) -> None:
+        indexes = tuple(x for x in (i, j) if x is not None)
+        if indexes != self._compare:
+            self._compare = indexes
+            self.trace._add(OP_COMPARE, *indexes)
+
+
+    def swap(self, i: int, j: int) -> None:
+        super().swap(i, j)
+        self.trace._add(OP_SWAP, i, j)
+
+
+    def shift(self, i: int, j: int) -> None:
+        super().shift(i, j)
+        self.trace._add(OP_SHIFT, i, j)
+
+
+    def write(self, i: int, value: int|float) -> None:
+        super().write(i, value)
+        self.trace._add(OP_WRITE, i, v=value)
+
+
+    def pivot(self, value: int|float|None = None) -> None:
+        if value != self._pivot:
+            self._pivot = value
+            if value is None:
+                self.trace._add(OP_PIVOT)
+            else:
+                self.trace._add(OP_PIVOT, 0, v=value)
+
+
+    def bounds(self, left: int|None = None, right: int|None = None) -> None:
+        bounds = () if left is None else (left, right)
+        if bounds != self._bounds:
+            self._bounds = bounds
+            self.trace._add(OP_BOUNDS, *bounds)
+
+
+    def correct(self, start: int, stop: int|None = None) -> None:
+        if stop is None:
+            stop = start + 1
+        if start < stop and not self._correct.has_correct(start, stop):
+            self._correct.add_correct(start, stop)
+            self.trace._add(OP_CORRECT, start, stop)
+
+
+    def clear_correct(self) -> None:
+        self._correct.clear_correct()
+        self.trace._add(OP_CORRECT_CLEAR)
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        super().load_buffer(start, stop)
+        self.trace._add(OP_BUFFER_LOAD, start, stop)
+
+
+    def clear_buffer(self, start: int | None = None, stop: int | None = None) -> None:
+        super().clear_buffer(start, stop)
+        if start is None:
+            self.trace._add(OP_BUFFER_CLEAR)
+        else:
+            self.trace._add(OP_BUFFER_CLEAR, start, stop)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        super().write_buffer(i, value)
+        self.trace._add(OP_BUFFER_WRITE, i, v=value)
+
+
+    def info(self, key: str, value: int | None = None) -> None:
+        if key not in INFO_KEYS:
+            raise ValueError("Unknown info key '{}'".format(key))
+        if self._info.get(key) != value:
+            self._info[key] = value
+            self.trace._add(OP_INFO, INFO_KEYS.index(key), -1 if value is None else value)
+
+
+    def frame(self, k: int) -> None:
+        super().frame(k)
+        self.trace._frames.append(len(self.trace._op))
+        self.trace._k.append(k)
+
+
+
+class FrameRecorder(Recorder):
+    """
+    A recorder which doesn't store any operations, it only keeps the current state. It's used to create
+    frames on the fly, while the algorithm is running (see Sort.animate with stream=True).
+
+    Attributes:
+        structural - whether the pivot, bounds or sorted elements changed since the last created frame
+
+    Methods:
+        current - creates a frame dict from the current state
+    """
+
+
+    def __init__(self, data: Iterable[int|float]) -> None:
+        super().__init__(data)
+        self._state = _TraceState(())
+        self._state.data = self.data
+        self.structural = False
+
+
+    def compare(self, i: int|None = None, j: int|None = None) -> None:
+        indexes = tuple(x for x in (i, j) if x is not None)
+        self._state.compare = indexes if indexes else None
+
+
+    def pivot(self, value: int|float|None = None) -> None:
+        if value != self._state.pivot:
+            self._state.pivot = value
+            self.structural = True
+
+
+    def bounds(self, left: int|None = None, right: int|None = None) -> None:
+        bounds = None if left is None else (left, right)
+        if bounds != self._state.bounds:
+            self._state.bounds = bounds
+            self.structural = True
+
+
+    def correct(self, start: int, stop: int|None = None) -> None:
+        if stop is None:
+            stop = start + 1
+        if start < stop and not self._state.has_correct(start, stop):
+            self._state.add_correct(start, stop)
+            self.structural = True
+
+
+    def clear_correct(self) -> None:
+        self._state.clear_correct()
+        self.structural = True
+
+
+    def load_buffer(self, start: int, stop: int) -> None:
+        self._state.load_buffer(start, stop)
+        self.buffer = self._state.buffer
+
+
+    def clear_buffer(self, start: int | None = None, stop: int | None = None) -> None:
+        self._state.clear_buffer(start, stop)
+
+
+    def write_buffer(self, i: int, value: int|float) -> None:
+        self._state.write_buffer(i, value)
+        self.buffer = self._state.buffer
+
+
+    def info(self, key: str, value: int | None = None) -> None:
+        if value is None:
+            self._state.info.pop(key, None)
+        else:
+            self._state.info[key] = value
+
+
+    def current(self) -> Dict[str, any]:
+        """
+        Creates a frame dict from the current state. Resets the `structural` attribute, which tells
+        whether the pivot, bounds or sorted elements changed since the last created frame.
+        """
+        self._state.k = self.k
+        self.structural = False
+        return self._state.frame()
+
+
+
+def record_frames(frames: Iterable[Dict[str, any]], rec: Recorder) -> None:
+    """
+    Passes frame dicts (see Sort._sort_next) to a recorder. Every frame is compared to the previous one
+    and only the differences are passed, so the frames can share the same (mutated) data list.
+
+    Params:
+        frames - an iterable of frame dicts
+        rec - the recorder, its data must be the initial data
+    """
+    current = rec.data
+    n = len(current)
+    correct = set()
+    buffer = [None] * n
+
+    for frame in frames:
+        if not isinstance(frame, dict):
+            raise TypeError("Every frame must be a dict")
+
+        # data - předají se jen změněné prvky
+        new = frame["data"]
+        if not isinstance(new, list):
+            new = list(new)
+        if len(new) != n:
+            raise ValueError("All frames must have the same amount of data")
+
+        if new != current:
+            changed = [i for i in range(n) if current[i] != new[i]]
+            if len(changed) == 2 and current[changed[0]] == new[changed[1]] and current[changed[1]] == new[changed[0]]:
+                rec.swap(changed[0], changed[1])
+            else:
+                for i in changed:
+                    rec.write(i, new[i])
+
+        # buffer - předají se jen změněné prvky
+        new_buffer = frame.get("buffer")
+        if new_buffer is None:
+            new_buffer = [None] * n
+        elif len(new_buffer) != n:
+            raise ValueError("The buffer must have the same length as the data")
+
+        if new_buffer != buffer:
+            for i in range(n):
+                if new_buffer[i] != buffer[i]:
+                    if new_buffer[i] is None:
+                        rec.clear_buffer(i, i + 1)
+                    else:
+                        rec.write_buffer(i, new_buffer[i])
+            buffer = list(new_buffer)
+
+        rec.compare(*frame.get("compare", ()))
+        rec.bounds(*frame.get("bounds", ()))
+        rec.pivot(frame.get("pivot"))
+        for key in INFO_KEYS:
+            rec.info(key, frame.get(key))
+
+        # seřazené prvky - pokud jen přibyly, předají se jen nové
+        new_correct = set(frame.get("correct", ()))
+        if new_correct != correct:
+            if not correct <= new_correct:
+                rec.clear_correct()
+                correct = set()
+
+            for start, stop in _to_intervals(new_correct - correct):
+                rec.correct(start, stop)
+            correct = new_correct
+
+        rec.frame(frame["k"])
+
+
+def _to_intervals(indexes: Iterable[int]) -> List[Tuple[int, int]]:
+    """
+    Converts a collection of indexes to a sorted list of half-open intervals [start, stop).
+    """
+    intervals = []
+
+    for i in sorted(indexes):
+        if intervals and intervals[-1][1] == i:
+            intervals[-1][1] = i + 1
+        else:
+            intervals.append([i, i + 1])
+
+    return [(start, stop) for start, stop in intervals]
+
+
+
+def keep_frames(structural: Sequence[int], k: Sequence[int], budget: int) -> List[int]:
+    """
+    Chooses at most `budget` frames the same way as Trace.decimate.
+
+    Params:
+        structural - for every frame whether its operations changed the pivot, bounds or sorted elements
+        k - the iteration numbers of the frames
+        budget - the maximum number of frames, at least 2
+
+    Returns:
+        List[int] - the increasing indexes of the kept frames
+    """
+    count = len(k)
+    if count <= budget:
+        return list(range(count))
+
+    important = []
+    regular = []
+    for f in range(1, count - 1):
+        if structural[f]:
+            important.append(f)
+        elif k[f] != k[f+1]:
+            regular.append(f)
+
+    budget -= 2
+    if len(important) >= budget:
+        keep = _spread(important, budget)
+    else:
+        keep = important + _spread(regular, budget - len(important))
+
+    return [0] + sorted(keep) + [count - 1]
+
+
+def _spread(items: List[int], count: int) -> List[int]:
+    """
+    Chooses `count` evenly spread items (every N-th item).
+    """
+    if count <= 0:
+        return []
+    elif count >= len(items):
+        return list(items)
+
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+def _check_exact(data: List[int|float]) -> None:
+    """
+    Raises ValueError if the data contain an integer which can't be stored exactly as a float.
+    """
+    # min a max procházejí seznam v C, po prvcích se hledá jen tehdy, když mez něco překročí
+    if not data or -MAX_EXACT_INT <= min(data) and max(data) <= MAX_EXACT_INT:
+        return
+
+    for value in data:
+        if isinstance(value, int) and not -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+            raise ValueError("Integer data must be at most 2**53 in absolute value to be traced exactly, "
+                             "got {}".format(value))
+
+
+def _to_list(data: Iterable[int|float]) -> List[int|float]:
+    """
+    Copies the data to a list of Python numbers. NumPy arrays (also memory-mapped) and arrays
+    are converted in bulk by their `tolist` method.
+    """
+    if hasattr(data, "tolist"):
+        return data.tolist()
+
+    return list(data)
@@ -0,0 +1,96 @@
+"""
+Tests of the cache keys of traces.
+"""
+
+import numpy as np
+
+from sortflow import Sort, TraceCache, MergeSort
+from sortflow.cache import trace_key
+
+
+def make_custom(last_k: int) -> type:
+    # stejné jméno třídy jako po novém spuštění buňky notebooku
+    class Custom(Sort):
+        def _record(self, rec):
+            yield 0
+            yield last_k
+
+    return Custom
+
+
+def test_redefined_class_isnt_stale() -> None:
+    cache = TraceCache()
+    first, second = make_custom(1), make_custom(99)
+    assert first.__qualname__ == second.__qualname__
+
+    for cls, k in ((first, 1), (second, 99)):
+        sort = cls([3, 1, 2])
+        sort.set_cache(cache)
+        assert sort.trace()[-1]["k"] == k
+
+
+def test_redefined_code_isnt_stale() -> None:
+    cache = TraceCache()
+    source = "class Custom(Sort):\n    def _record(self, rec):\n        yield 0\n        yield {}\n"
+
+    for k in (1, 99):
+        namespace = {"Sort": Sort}
+        exec(source.format(k), namespace)
+        sort = namespace["Custom"]([3, 1, 2])
+        sort.set_cache(cache)
+        assert sort.trace()[-1]["k"] == k
+
+
+class Stepped(Sort):
+    def __init__(self, data, step: int) -> None:
+        super().__init__(data)
+        self._step = step
+
+
+    def _record(self, rec):
+        yield 0
+        yield self._step
+
+
+
+def test_private_options_are_in_key() -> None:
+    cache = TraceCache()
+    for step in (1, 5):
+        sort = Stepped([3, 1, 2], step)
+        sort.set_cache(cache)
+        assert sort.trace()[-1]["k"] == step
+
+
+def test_key_ignores_style_and_records() -> None:
+    a, b = MergeSort([3, 1, 2]), MergeSort([3, 1, 2], style={"edge_width": 2})
+    assert a._cache_key() == b._cache_key()
+    assert a._cache_key() != MergeSort([3, 1, 2], buffered=True)._cache_key()
+    assert trace_key(MergeSort, 1, [1, 2], "ascending", {}) != trace_key(Stepped, 1, [1, 2], "ascending", {})
+
+
+def test_key_keeps_large_ints_and_array_options() -> None:
+    big = 2**53
+    assert trace_key(MergeSort, 1, np.array([big, 1]), "ascending", {}) != \
+           trace_key(MergeSort, 1, np.array([big + 1, 1]), "ascending", {})
+
+    # repr dlouhého pole vynechává prostřední prvky
+    weights = np.zeros(2000)
+    changed = weights.copy()
+    changed[1000] = 1
+    assert trace_key(MergeSort, 1, [1, 2], "ascending", {"w": weights}) != \
+           trace_key(MergeSort, 1, [1, 2], "ascending", {"w": changed})
+
+
+def test_memory_size_counts_keyframes() -> None:
+    cache = TraceCache()
+    trace = MergeSort(np.arange(300)[::-1]).trace()
+    cache.put("a", trace)
+    cache.put("b", MergeSort([3, 1, 2]).trace())
+
+    trace.build_keyframes(10)
+    assert cache.get("a") is trace
+    assert cache._size == trace.nbytes() + cache._sizes["b"]
+
+    cache.max_bytes = cache._sizes["b"]
+    cache.put("b", cache.get("b"))
+    assert len(cache) == 1 and cache._size == cache._sizes["b"]
@@ -0,0 +1,59 @@
+"""
+Tests of the command line interface.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from sortflow import Sort
+from sortflow.cli import main, job_hash, MANIFEST_NAME
+
+
+class CrashingSort(Sort):
+    """
+    An algorithm killing its worker process.
+    """
+
+    def _record(self, rec):
+        os._exit(1)
+        yield 0
+
+
+
+def test_dtype_only_for_raw_files(tmp_path) -> None:
+    np.save(tmp_path / "a.npy", np.array([3.0, 1.0, 2.0]))
+    (tmp_path / "b.txt").write_text("3 1 2")
+    np.array([3, 1, 2], dtype=np.int16).tofile(tmp_path / "c.bin")
+    out = tmp_path / "out"
+
+    code = main([str(tmp_path / name) for name in ("a.npy", "b.txt", "c.bin")]
+                + ["-a", "insert", "--dtype", "int16", "-f", "png", "--output-dir", str(out)])
+
+    assert code == 0
+    for name in ("a", "b", "c"):
+        assert len(os.listdir(out / "{}_InsertSort_ascending".format(name))) > 0
+
+
+def test_crashed_worker_keeps_manifest(tmp_path, capsys) -> None:
+    data = tmp_path / "data.txt"
+    data.write_text("3 1 2")
+    out = tmp_path / "out"
+
+    code = main([str(data), "-a", "insert", "tests.test_cli:CrashingSort", "-f", "png", "-j", "2", "--output-dir", str(out)])
+
+    assert code == 1
+    assert "worker failed" in capsys.readouterr().err
+    with open(out / MANIFEST_NAME) as f:
+        assert list(json.load(f)) == ["data_InsertSort_ascending" + os.sep]
+
+
+def test_job_hash_includes_code() -> None:
+    hashes = set()
+    for k in (1, 99):
+        namespace = {"Sort": Sort}
+        exec("class Custom(Sort):\n    def _record(self, rec):\n        yield {}\n".format(k), namespace)
+        hashes.add(job_hash("data", namespace["Custom"], "ascending", None, {}))
+
+    assert len(hashes) == 2
@@ -0,0 +1,25 @@
+"""
+Tests of importing the library.
+"""
+
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(script: str) -> str:
+    # nový interpret, v tomto procesu už matplotlib načetly jiné testy
+    return subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+
+
+def test_import_doesnt_load_matplotlib() -> None:
+    script = "import sys, sortflow\nfrom sortflow import sort_algs, trace, stats, cache, records, profiling\nprint('matplotlib' in sys.modules)"
+    assert run(script).strip() == "False"
+
+
+def test_animation_is_loaded_lazily() -> None:
+    script = "import sys, sortflow\nsortflow.Animation\nprint('matplotlib' in sys.modules)"
+    assert run(script).strip() == "True"
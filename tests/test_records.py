@@ -0,0 +1,68 @@
+"""
+Tests of sorting records by key columns.
+"""
+
+import numpy as np
+import pytest
+
+from sortflow import QuickSort, MergeSort
+from sortflow.records import take
+
+
+def test_structured_array() -> None:
+    records = np.array([(3, "c"), (1, "a"), (2, "b")], dtype=[("key", "i4"), ("name", "U1")])
+    sort = MergeSort(buffered=True)
+    sort.set_records(records, "key")
+
+    assert sort.sorted_records()["name"].tolist() == ["a", "b", "c"]
+
+
+def test_rows_by_more_columns() -> None:
+    sort = QuickSort(order="descending")
+    sort.set_records([{"a": "x", "b": "2"}, {"a": "y", "b": "1"}, {"a": "x", "b": "10"}], ["a", "b"])
+
+    assert sort.sorted_records() == [{"a": "y", "b": "1"}, {"a": "x", "b": "10"}, {"a": "x", "b": "2"}]
+
+
+class Rows():
+    """
+    A minimal table like a pandas DataFrame: indexing selects columns, iloc selects rows.
+    """
+
+    def __init__(self, columns: dict) -> None:
+        self.columns = columns
+
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values())))
+
+
+    def __getitem__(self, column: str) -> list:
+        return self.columns[column]
+
+
+    @property
+    def iloc(self) -> "Rows":
+        table = self
+
+        class Positions():
+            def __getitem__(self, index: np.ndarray) -> Rows:
+                return Rows({name: [values[i] for i in index] for name, values in table.columns.items()})
+
+        return Positions()
+
+
+
+def test_take_selects_rows_of_tables() -> None:
+    table = Rows({"key": [2, 0, 1], "name": ["c", "a", "b"]})
+    sort = QuickSort()
+    sort.set_records(table, "key")
+
+    assert sort.sorted_records()["name"] == ["a", "b", "c"]
+
+
+def test_pandas_data_frame() -> None:
+    pd = pytest.importorskip("pandas")
+    frame = pd.DataFrame({"key": [2, 0, 1], "name": ["c", "a", "b"]})
+
+    assert take(frame, [1, 2, 0])["name"].tolist() == ["a", "b", "c"]
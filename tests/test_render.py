@@ -0,0 +1,131 @@
+"""
+Smoke tests rendering every algorithm of sort_algs by both animation engines (on the Agg backend).
+"""
+
+import random
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+from matplotlib.animation import AbstractMovieWriter
+from PIL import Image
+
+from sortflow import Sort, sort_algs
+from sortflow.export import export_trace
+
+
+ALGORITHMS = [cls for cls in vars(sort_algs).values() if isinstance(cls, type) and issubclass(cls, Sort) and cls is not Sort]
+
+
+class CountingWriter(AbstractMovieWriter):
+    """
+    A movie writer which only draws the frames and counts them.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(fps=5)
+        self.frames = 0
+
+
+    def setup(self, fig, outfile, dpi=None) -> None:
+        super().setup(fig, outfile, dpi)
+
+
+    def grab_frame(self, **savefig_kwargs) -> None:
+        self.fig.canvas.draw()
+        self.frames += 1
+
+
+    def finish(self) -> None:
+        pass
+
+
+
+def render(anim) -> int:
+    writer = CountingWriter()
+    try:
+        anim.save("unused", writer=writer)
+    finally:
+        plt.close("all")
+
+    return writer.frames
+
+
+@pytest.mark.parametrize("engine", ["artist", "func"])
+@pytest.mark.parametrize("cls", ALGORITHMS, ids=lambda cls: cls.__name__)
+def test_render(cls: type, engine: str) -> None:
+    rng = random.Random(1)
+    sort = cls([rng.randint(0, 20) for _ in range(30)])
+    sort.set_cache(None)
+
+    assert render(sort.animate(engine=engine, max_frames=15)) > 0
+
+
+def test_export_disjoint_correct(tmp_path) -> None:
+    # IntroSort označuje seřazené prvky v oddělených intervalech
+    sort = sort_algs.IntroSort([random.Random(2).random() for _ in range(60)])
+    sort.set_cache(None)
+    trace = sort.trace().decimate(20)
+
+    export_trace(trace, str(tmp_path) + "/", sort._animation, sort.get_title())
+    assert len(list(tmp_path.iterdir())) == len(trace)
+
+
+def test_export_parallel_matches_serial(tmp_path) -> None:
+    sort = sort_algs.QuickSort([random.Random(3).random() for _ in range(40)])
+    sort.set_cache(None)
+    trace = sort.trace().decimate(12)
+
+    serial, parallel = tmp_path / "serial", tmp_path / "parallel"
+    export_trace(trace, str(serial) + "/", sort._animation, sort.get_title(), workers=1)
+    export_trace(trace, str(parallel) + "/", sort._animation, sort.get_title(), workers=2)
+
+    names = sorted(path.name for path in serial.iterdir())
+    assert names == sorted(path.name for path in parallel.iterdir())
+    for name in names:
+        with Image.open(serial / name) as first, Image.open(parallel / name) as second:
+            assert np.array_equal(np.asarray(first), np.asarray(second))
+
+
+class GappedSort(Sort):
+    """
+    An algorithm implemented by _sort_next with a sorted set which isn't one interval.
+    """
+
+    def _sort_next(self):
+        yield {"data": list(self.data), "k": 0, "correct": [0, 2]}
+        yield {"data": sorted(self.data), "k": 1, "correct": [0, 1, 2, 3]}
+
+
+
+@pytest.mark.parametrize("engine", ["artist", "func"])
+def test_render_sort_next(engine: str) -> None:
+    sort = GappedSort([1, 3, 2, 4])
+    sort.set_cache(None)
+
+    assert render(sort.animate(engine=engine)) == 2
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_external_profile_fits_all_values(stream: bool) -> None:
+    # největší hodnota není v profilu neseřazených dat, ale po seřazení v něm je
+    data = [float(i % 10) for i in range(100)]
+    data[1] = 1000.0
+    sort = sort_algs.ExternalMergeSort(data, chunk_size=16, profile_size=10)
+    sort.set_cache(None)
+    assert max(sort._shown_data()) < 1000
+
+    anim = sort.animate(engine="func", stream=stream)
+    assert max(axes.get_ylim()[1] for axes in anim._fig.axes) >= 1000
+    plt.close(anim._fig)
+
+
+def test_external_has_no_argsort() -> None:
+    sort = sort_algs.ExternalMergeSort([3, 1, 2])
+    with pytest.raises(TypeError):
+        sort.argsort()
+    sort.set_records([{"a": 3}, {"a": 1}], "a")
+    with pytest.raises(TypeError):
+        sort.sorted_records()
@@ -0,0 +1,57 @@
+"""
+Tests of the contract of the abstract class Sort.
+"""
+
+import numpy as np
+import pytest
+
+from sortflow import Sort, BubbleSort, QuickSort, MergeSort
+
+
+class NoAlgorithm(Sort):
+    pass
+
+
+class StepSort(Sort):
+    def _sort_next(self):
+        yield {"data": sorted(self.data), "k": 0}
+
+
+
+def test_sort_isnt_instantiable() -> None:
+    with pytest.raises(TypeError):
+        Sort([1, 2])
+    with pytest.raises(TypeError):
+        NoAlgorithm([1, 2])
+
+
+def test_sort_next_of_record_algorithm() -> None:
+    sort = BubbleSort([3, 1, 2])
+    assert [frame["k"] for frame in sort._sort_next()] == [frame["k"] for frame in sort.trace()]
+
+
+@pytest.mark.parametrize("cls", [QuickSort, MergeSort])
+def test_stream_keeps_budget(cls: type) -> None:
+    sort = cls(np.random.default_rng(0).permutation(300))
+    keep, _, _ = sort._count_frames(50)
+    frames = list(sort._stream(keep))
+
+    assert len(frames) == len(keep) <= 50
+    assert [frame["k"] for frame in frames] == [frame["k"] for frame in sort.trace().decimate(50)]
+
+
+def test_stream_budget_needs_record() -> None:
+    with pytest.raises(ValueError):
+        StepSort([3, 1, 2]).animate(stream=True, max_frames=10)
+
+
+def test_text_data(tmp_path) -> None:
+    path = tmp_path / "data.txt"
+    path.write_text("3 1.5\n2\t-4e2\n")
+    sort = BubbleSort([1])
+    sort.set_data(str(path))
+    assert list(sort.data) == [3, 1.5, 2, -400]
+
+    path.write_text("3 1 x 2")
+    with pytest.raises(ValueError):
+        sort.set_data(str(path))
@@ -0,0 +1,14 @@
+"""
+Tests of the operation counters of Sort.run_stats.
+"""
+
+import random
+
+from sortflow import HeapSort, MergeSort
+
+
+def test_heap_isnt_recursion_depth() -> None:
+    data = [random.Random(3).random() for _ in range(200)]
+
+    assert HeapSort(data).run_stats()["depth"] == 1
+    assert 1 < MergeSort(data).run_stats()["depth"] < 20
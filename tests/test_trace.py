@@ -0,0 +1,66 @@
+"""
+Tests of the Trace class: random access by keyframes, selecting and decimating frames.
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from sortflow import QuickSort, MergeSort
+from sortflow.trace import Trace, MAX_EXACT_INT
+
+
+STRUCTURE = ("bounds", "pivot", "correct")
+
+
+def traced(cls: type, count: int = 80) -> Trace:
+    rng = random.Random(1)
+    sort = cls([rng.random() for _ in range(count)])
+    sort.set_cache(None)
+    return sort.trace()
+
+
+def plain(frames) -> list:
+    # IndexIntervals se neporovnávají podle obsahu
+    return [{key: repr(value) if key == "correct" else value for key, value in frame.items()} for frame in frames]
+
+
+@pytest.mark.parametrize("cls", [QuickSort, MergeSort])
+def test_keyframes_seek_and_select(cls: type) -> None:
+    trace = traced(cls)
+    frames = plain(trace)
+
+    trace.build_keyframes(16)
+    assert len(trace._key_ops) > 1
+    assert plain(trace[i] for i in range(len(trace))) == frames
+    assert plain([trace[-1]]) == frames[-1:]
+
+    indexes = list(range(3, len(trace), 7))
+    assert plain(trace.select(indexes)) == [frames[i] for i in indexes]
+    assert trace[trace.find_k(frames[20]["k"])]["k"] == frames[20]["k"]
+
+
+@pytest.mark.parametrize("cls", [QuickSort, MergeSort])
+def test_decimate_keeps_structural_frames(cls: type) -> None:
+    trace = traced(cls)
+    frames = plain(trace)
+    changes = [frame for previous, frame in zip(frames, frames[1:])
+               if any(previous.get(key) != frame.get(key) for key in STRUCTURE)]
+
+    budget = len(changes) + 10
+    assert budget < len(trace)
+    decimated = plain(trace.decimate(budget))
+
+    assert len(decimated) <= budget
+    assert decimated[0] == frames[0] and decimated[-1] == frames[-1]
+    assert all(frame in decimated for frame in changes)
+
+    # menší rozpočet než počet strukturálních snímků se stejně dodrží
+    assert len(trace.decimate(10)) <= 10
+
+
+def test_large_ints_are_rejected() -> None:
+    assert list(Trace([MAX_EXACT_INT, -MAX_EXACT_INT, 1.5e300]).initial) == [MAX_EXACT_INT, -MAX_EXACT_INT, 1.5e300]
+    with pytest.raises(ValueError):
+        Trace(np.array([1, MAX_EXACT_INT + 1]))